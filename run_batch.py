@@ -0,0 +1,225 @@
+"""
+Run the pipeline for many profiles concurrently.
+
+A profile is a data root laid out like this project: its own `config.yaml`
+(paths relative to the profile), `data/` folders and lookup JSONs. Each
+profile runs `run_pipeline.py` in its own interpreter, with the profile as
+working directory, so profiles never share configuration or module state and
+a failing profile does not affect the others. At most `--workers` profiles
+run at a time.
+
+Options after `--` are passed on to every `run_pipeline.py` run:
+
+    python run_batch.py households/* --workers 4 -- --skip-download --incremental
+    python run_batch.py --profiles nightly.txt
+
+The aggregated status and timing report is written to
+`logs/batch/batch_report_<timestamp>.json`, next to one log and one run
+report per profile.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, List
+
+from src.logger import setup_logger, setup_logging
+
+logger = setup_logger("batch")
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+PIPELINE_SCRIPT = os.path.join(REPO_ROOT, "run_pipeline.py")
+ERROR_TAIL_LINES = 20
+
+
+def read_profiles_file(path: str) -> List[str]:
+    """Profile directories listed one per line; blank lines and '#' comments are skipped."""
+    base_dir = os.path.dirname(os.path.abspath(path))
+    profiles = []
+    with open(path, "r") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                profiles.append(os.path.join(base_dir, line))
+    return profiles
+
+
+def profile_names(profiles: List[str]) -> List[str]:
+    """Unique display names: the folder name, numbered when two profiles share it."""
+    basenames = [os.path.basename(os.path.normpath(p)) for p in profiles]
+    counts = Counter(basenames)
+    seen = Counter()
+    names = []
+    for basename in basenames:
+        seen[basename] += 1
+        names.append(basename if counts[basename] == 1 else f"{basename}-{seen[basename]}")
+    return names
+
+
+def tail(path: str, lines: int = ERROR_TAIL_LINES) -> str:
+    with open(path, "r", errors="replace") as f:
+        return "".join(f.readlines()[-lines:])
+
+
+def run_profile(name: str, profile: str, pipeline_args: List[str], output_dir: str,
+                timeout: float = None) -> Dict[str, Any]:
+    """
+    Run the pipeline for one profile and collect its status and run report.
+
+    Args:
+        name: Display name of the profile
+        profile: Profile directory (working directory of the run)
+        pipeline_args: Arguments passed on to run_pipeline.py
+        output_dir: Folder of the profile's log and run report
+        timeout: Seconds before the run is killed
+
+    Returns:
+        Status record of the profile
+    """
+    log_path = os.path.join(output_dir, f"{name}.log")
+    report_path = os.path.join(output_dir, f"{name}.json")
+    result = {"profile": name, "path": os.path.abspath(profile)}
+
+    if not os.path.isfile(os.path.join(profile, "config.yaml")):
+        result.update(status="failed", returncode=None, wall_s=0.0, error="config.yaml not found")
+        return result
+
+    result["log"] = log_path
+
+    command = [sys.executable, PIPELINE_SCRIPT, "--report", os.path.abspath(report_path), *pipeline_args]
+    started = time.perf_counter()
+    with open(log_path, "w") as log:
+        try:
+            completed = subprocess.run(
+                command, cwd=profile, stdout=log, stderr=subprocess.STDOUT, timeout=timeout
+            )
+            status = "ok" if completed.returncode == 0 else "failed"
+            returncode = completed.returncode
+        except subprocess.TimeoutExpired:
+            status, returncode = "timeout", None
+    result.update(status=status, returncode=returncode, wall_s=time.perf_counter() - started)
+
+    if status != "ok":
+        result["error"] = tail(log_path)
+    if os.path.exists(report_path):
+        with open(report_path, "r") as f:
+            report = json.load(f)
+        result["cpu_s"] = report["cpu_s"]
+        result["peak_rss_mb"] = report["peak_rss_mb"]
+        result["stages"] = {
+            stage["stage"]: {key: stage[key] for key in ("wall_s", "cpu_s", "rows_in", "rows_out")}
+            for stage in report["stages"]
+        }
+    return result
+
+
+def run_batch(profiles: List[str], pipeline_args: List[str], output_dir: str,
+              workers: int = None, timeout: float = None) -> Dict[str, Any]:
+    """Run every profile in a bounded pool; returns the aggregated report."""
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+    started_at = datetime.now()
+    started = time.perf_counter()
+
+    results = {}
+    # Threads only wait on the pipeline processes; each profile runs in its own interpreter
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(run_profile, name, profile, pipeline_args, output_dir, timeout): name
+            for name, profile in zip(profile_names(profiles), profiles)
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {"profile": name, "status": "failed", "returncode": None, "wall_s": 0.0, "error": str(e)}
+            results[name] = result
+            if result["status"] == "ok":
+                logger.finish(f"{name}: ok in {result['wall_s']:.1f}s")
+            else:
+                logger.error(f"{name}: {result['status']} after {result['wall_s']:.1f}s - {result.get('log', result.get('error'))}")
+
+    ordered = [results[name] for name in profile_names(profiles)]
+    statuses = Counter(result["status"] for result in ordered)
+    wall_s = time.perf_counter() - started
+    return {
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "workers": workers,
+        "pipeline_args": pipeline_args,
+        "wall_s": wall_s,
+        "profiles_wall_s": sum(result["wall_s"] for result in ordered),
+        "succeeded": statuses.get("ok", 0),
+        "failed": len(ordered) - statuses.get("ok", 0),
+        "profiles": ordered,
+    }
+
+
+def print_summary(report: Dict[str, Any]) -> None:
+    print(f"\n{'profile':<24} {'status':<8} {'wall s':>8} {'cpu s':>8} {'peak MB':>8}")
+    for result in report["profiles"]:
+        print(
+            f"{result['profile']:<24} {result['status']:<8} {result['wall_s']:>8.1f} "
+            f"{result.get('cpu_s', 0.0):>8.1f} {result.get('peak_rss_mb', 0.0):>8.0f}"
+        )
+    speedup = report["profiles_wall_s"] / report["wall_s"] if report["wall_s"] else 0.0
+    print(
+        f"{report['succeeded']} succeeded, {report['failed']} failed; "
+        f"batch wall {report['wall_s']:.1f}s ({speedup:.1f}x over sequential runs, {report['workers']} workers)"
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Run the finance tracker pipeline for many profiles. "
+                    "Options after '--' are passed on to run_pipeline.py."
+    )
+    parser.add_argument("profile_dirs", nargs="*", help="profile directories, each with its own config.yaml")
+    parser.add_argument("--profiles", default=None, help="file listing profile directories, one per line")
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="profiles run at the same time (default: number of CPUs)"
+    )
+    parser.add_argument("--timeout", type=float, default=None, help="seconds before a profile run is killed")
+    parser.add_argument(
+        "--output-dir", default=os.path.join(REPO_ROOT, "logs", "batch"),
+        help="folder of the batch report and of the per-profile logs"
+    )
+    argv = sys.argv[1:]
+    split = argv.index("--") if "--" in argv else len(argv)
+    args = parser.parse_args(argv[:split])
+    args.pipeline_args = argv[split + 1:]
+    return args
+
+
+def main() -> None:
+    args = parse_args()
+    setup_logging()
+
+    profiles = list(args.profile_dirs)
+    if args.profiles:
+        profiles.extend(read_profiles_file(args.profiles))
+    if not profiles:
+        logger.error("No profiles given.")
+        sys.exit(2)
+
+    stamp = f"{datetime.now():%Y%m%d-%H%M%S}"
+    run_dir = os.path.join(args.output_dir, f"batch_{stamp}")
+    logger.info(f"Running {len(profiles)} profiles...")
+    report = run_batch(profiles, args.pipeline_args, run_dir, args.workers, args.timeout)
+
+    report_path = os.path.join(args.output_dir, f"batch_report_{stamp}.json")
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print_summary(report)
+    logger.info(f"Batch report written to {report_path}")
+    sys.exit(0 if report["failed"] == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
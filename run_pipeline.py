@@ -1,14 +1,22 @@
 import os
 import shutil
+import argparse
 from copy import deepcopy
 from typing import Any, Dict
 
-from src.pipeline.download import donwload_data
 from src.pipeline.clean import clean_data
 from src.pipeline.categorize import categorize_data
 from src.pipeline.reconcile import reconcile_data
 from src.utils.config import load_config
-from src.logger import setup_logger
+from src.utils.ledger import ledger_path
+from src.utils.manifest import Manifest
+from src.utils.snapshot import snapshot_path
+from src.utils.storage import (
+    CHECKPOINTS, CHECKPOINT_ALL, CHECKPOINT_FINAL, CHECKPOINT_NONE,
+    checkpoint_mode, flatten_partitions, group_partitions
+)
+from src.utils.profiling import profiler
+from src.logger import setup_logger, setup_logging
 
 logger = setup_logger(__name__)
 
@@ -18,6 +26,8 @@ def build_tmp_config(orig_config: Dict[str, Any]) -> Dict[str, Any]:
     Return a copy of orig_config where every data_* path is rewritten:
       "data/.../" → "data/tmp/.../"
     so that the pipeline writes into data/tmp/ instead of data/.
+    The build manifest moves to data/tmp/manifest.json, where it records the
+    progress of the run for --resume.
     """
     tmp_config = deepcopy(orig_config)
     for key, path in orig_config["paths"].items():
@@ -27,15 +37,48 @@ def build_tmp_config(orig_config: Dict[str, Any]) -> Dict[str, Any]:
             # New path: data/tmp/<rel>
             tmp_path = os.path.join("data", "tmp", rel)
             tmp_config["paths"][key] = os.path.normpath(tmp_path) + os.sep
+    tmp_config["paths"]["manifest"] = os.path.join(tmp_root(tmp_config), "manifest.json")
     return tmp_config
 
-def replace_tmp_with_data(config: Dict[str, Any]) -> None:
+def tmp_root(config: Dict[str, Any]) -> str:
+    """The data/tmp folder of a tmp config."""
+    return os.path.normpath(os.path.join(config["paths"]["data_raw"], os.pardir))
+
+def sync_folder(source: str, target: str) -> None:
+    """
+    Make target a copy of source: copy files that are new or differ in size or
+    modification time, and delete files source no longer has.
+    """
+    source_files = set()
+    for root, _, filenames in os.walk(source):
+        for filename in filenames:
+            rel_path = os.path.relpath(os.path.join(root, filename), source)
+            source_files.add(rel_path)
+            source_path, target_path = os.path.join(source, rel_path), os.path.join(target, rel_path)
+            source_stat = os.stat(source_path)
+            if os.path.exists(target_path):
+                target_stat = os.stat(target_path)
+                if (target_stat.st_size, target_stat.st_mtime_ns) == (source_stat.st_size, source_stat.st_mtime_ns):
+                    continue
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            shutil.copy2(source_path, target_path)
+    for root, _, filenames in os.walk(target):
+        for filename in filenames:
+            path = os.path.join(root, filename)
+            if os.path.relpath(path, target) not in source_files:
+                os.remove(path)
+                logger.info(f"Removed {path} (no longer in {source})")
+
+def replace_tmp_with_data(config: Dict[str, Any], skipped_keys=()) -> None:
     """
     For each pipeline output folder under data/tmp (00--raw, 01--cleaned,
     02--categorized, 03--reconciled), delete the corresponding folder under data/
     if it exists, then move data/tmp/<folder> → data/<folder>. Leave any other
     subfolders in data/ (e.g. lookup, dashboards) untouched. If data/tmp becomes
     empty, remove it.
+    Folders of `skipped_keys` (stages not checkpointed) are not expected under
+    data/tmp; their stale counterpart under data/ is removed.
+    Raises RuntimeError when a folder cannot be published; data/tmp is kept for --resume.
     """
     pipeline_keys = ["data_raw", "data_cleaned", "data_categorized", "data_reconciled"]
     moved_any = False
@@ -43,17 +86,21 @@ def replace_tmp_with_data(config: Dict[str, Any]) -> None:
     for key in pipeline_keys:
         tmp_path = config["paths"].get(key, "")
         if not tmp_path.startswith("data/tmp/"):
-            logger.error(f"Expected tmp path under data/tmp/: {tmp_path}")
-            return
+            raise RuntimeError(f"Expected tmp path under data/tmp/: {tmp_path}")
 
         target_path = tmp_path.replace(os.path.normpath("data/tmp/"), os.path.normpath("data/"))
         tmp_path_norm = os.path.normpath(tmp_path)
         target_path_norm = os.path.normpath(target_path)
 
+        if key in skipped_keys:
+            if os.path.exists(target_path_norm):
+                shutil.rmtree(target_path_norm)
+                logger.info(f"Removed stale folder at {target_path_norm} (not checkpointed)")
+            continue
+
         # Verify tmp folder exists and is not empty
         if not os.path.isdir(tmp_path_norm) or not os.listdir(tmp_path_norm):
-            logger.error(f"Cannot replace data: missing or empty tmp folder: {tmp_path_norm}")
-            return
+            raise RuntimeError(f"Cannot replace data: missing or empty tmp folder: {tmp_path_norm}")
 
         # If target exists already, delete it
         if os.path.exists(target_path_norm):
@@ -61,8 +108,7 @@ def replace_tmp_with_data(config: Dict[str, Any]) -> None:
                 shutil.rmtree(target_path_norm)
                 logger.info(f"Removed existing folder at {target_path_norm}")
             except Exception as e:
-                logger.error(f"Failed to remove {target_path_norm}: {e}")
-                return
+                raise RuntimeError(f"Failed to remove {target_path_norm}: {e}") from e
 
         # Ensure parent of target exists (e.g. data/)
         parent_dir = os.path.dirname(target_path_norm)
@@ -74,32 +120,215 @@ def replace_tmp_with_data(config: Dict[str, Any]) -> None:
             logger.info(f"Moved {tmp_path_norm} → {target_path_norm}")
             moved_any = True
         except Exception as e:
-            logger.error(f"Failed to move {tmp_path_norm} to {target_path_norm}: {e}")
-            return
+            raise RuntimeError(f"Failed to move {tmp_path_norm} to {target_path_norm}: {e}") from e
 
     # If we moved at least one folder, attempt to remove data/tmp/ if empty
-    tmp_root = os.path.normpath(os.path.join(config["paths"]["data_raw"], os.pardir))
-    if moved_any and os.path.isdir(tmp_root) and not os.listdir(tmp_root):
+    tmp_dir = tmp_root(config)
+    if moved_any and os.path.isdir(tmp_dir) and not os.listdir(tmp_dir):
         try:
-            os.rmdir(tmp_root)
-            logger.info(f"Removed empty tmp folder {tmp_root}")
+            os.rmdir(tmp_dir)
+            logger.info(f"Removed empty tmp folder {tmp_dir}")
         except Exception as e:
-            logger.error(f"Failed to remove {tmp_root}: {e}")
+            logger.error(f"Failed to remove {tmp_dir}: {e}")
+
+
+STAGES = ["download", "clean", "categorize", "stream", "reconcile", "publish"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the finance tracker pipeline.")
+    parser.add_argument(
+        "--jobs", type=int, default=1,
+        help="number of worker processes used to clean (bank, month) extracts"
+    )
+    parser.add_argument(
+        "--memory-budget-mb", type=float, default=None,
+        help="stream raw extracts in chunks that fit this memory budget"
+    )
+    parser.add_argument(
+        "--checkpoint", choices=CHECKPOINTS, default=None,
+        help="stage folders to persist: every stage, the final one only, or none "
+             "(default: storage.checkpoints in config.yaml)"
+    )
+    parser.add_argument(
+        "--profile-stage", choices=STAGES, default=None,
+        help="dump cProfile stats of this stage into the logs folder"
+    )
+    parser.add_argument(
+        "--report", default=None,
+        help="write the run report to this path instead of the logs folder"
+    )
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="update data/ in place, rebuilding only artifacts whose inputs changed"
+    )
+    parser.add_argument(
+        "--skip-download", action="store_true",
+        help="use the raw extracts already on disk"
+    )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="continue an interrupted run in data/tmp, skipping stages and partitions already done"
+    )
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="clean and categorize each extract as soon as it is downloaded "
+             "(source: download.source in config.yaml, or the local raw folder with --skip-download)"
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="keep running, updating data/ incrementally whenever raw extracts or lookups change"
+    )
+    parser.add_argument(
+        "--poll-interval", type=float, default=None,
+        help="seconds between scans in watch mode (default: watch.poll_interval_s in config.yaml)"
+    )
+    parser.add_argument(
+        "--debounce", type=float, default=None,
+        help="quiet seconds before a run in watch mode (default: watch.debounce_s in config.yaml)"
+    )
+    args = parser.parse_args()
+    if args.stream and (args.resume or args.incremental or args.watch):
+        parser.error("--stream runs a full rebuild; it cannot be combined with --resume, --incremental or --watch")
+    return args
 
 
 def main() -> None:
+    args        = parse_args()
     orig_config = load_config()
+    setup_logging(level=orig_config.get("logging_level", "INFO"))
+
+    logs_dir = orig_config["paths"]["logs"]
+    if args.profile_stage:
+        profiler.profile_stage(args.profile_stage, logs_dir)
+
+    try:
+        run(args, orig_config)
+    finally:
+        profiler.write_report(logs_dir, extra={"args": vars(args)}, path=args.report)
+
+
+def download_raw(args: argparse.Namespace, orig_config: Dict[str, Any], config: Dict[str, Any]) -> None:
+    """
+    Download the raw extracts into data/tmp, once per run. With --skip-download
+    they are copied from data/ instead, and resumed runs copy them again: raw
+    files changed or removed since the interrupted run must not be published.
+    """
+    from src.pipeline.incremental import manifest_path
+    manifest = Manifest.load(manifest_path(config))
+    completed = manifest.stage("run")
+    with profiler.stage("download"):
+        if args.skip_download:
+            sync_folder(orig_config["paths"]["data_raw"], config["paths"]["data_raw"])
+        elif args.resume and completed.get("download"):
+            logger.info("Raw extracts already downloaded; resuming.")
+        else:
+            # gdown and python-dotenv are only imported when downloading
+            from src.pipeline.download import donwload_data
+            logger.info("Downloading data from sheets...")
+            # Extracts unchanged since the last run are copied from data/, not downloaded
+            donwload_data(config, seed_folder=orig_config["paths"]["data_raw"])
+        completed["download"] = "done"
+        manifest.save()
+
+
+def run(args: argparse.Namespace, orig_config: Dict[str, Any]) -> None:
+    # The incremental, watch and streaming stages are imported by the modes that use them
+    from src.pipeline.incremental import run_incremental, manifest_path
+    if args.incremental or args.watch:
+        if not args.skip_download:
+            from src.pipeline.download import donwload_data
+            logger.info("Downloading data from sheets...")
+            with profiler.stage("download"):
+                donwload_data(orig_config)
+        if args.watch:
+            from src.pipeline.watch import watch
+            logger.info("Watching for new extracts (Ctrl+C to stop)...")
+            try:
+                watch(
+                    orig_config, jobs=args.jobs, memory_budget_mb=args.memory_budget_mb,
+                    poll_interval_s=args.poll_interval, debounce_s=args.debounce
+                )
+            except KeyboardInterrupt:
+                logger.info("Stopped watching.")
+            return
+        logger.info("Updating out-of-date artifacts...")
+        run_incremental(orig_config, jobs=args.jobs, memory_budget_mb=args.memory_budget_mb)
+        logger.info("All done!")
+        return
+
     config      = build_tmp_config(orig_config)
 
-    logger.info("Downloading data from sheets...")
-    donwload_data(config)
-    logger.info("Cleaning data from raw...")
-    clean_data(config)
-    logger.info("Categorizing data from cleaned...")
-    categorize_data(config)
-    logger.info("Reconciling data from categorized...")
-    reconcile_data(config)
-    replace_tmp_with_data(config)
+    checkpoint = args.checkpoint or checkpoint_mode(orig_config)
+    if checkpoint == CHECKPOINT_NONE and ledger_path(config) is None and snapshot_path(config) is None:
+        logger.warning("No ledger or snapshot configured; checkpointing the final stage.")
+        checkpoint = CHECKPOINT_FINAL
+    if args.resume and checkpoint != CHECKPOINT_ALL:
+        logger.warning("Resuming needs every stage checkpointed; checkpointing all stages.")
+        checkpoint = CHECKPOINT_ALL
+    persist_all = checkpoint == CHECKPOINT_ALL
+
+    # Leftovers of an interrupted run are reused with --resume only
+    if not args.resume and os.path.isdir(tmp_root(config)):
+        shutil.rmtree(tmp_root(config))
+
+    skipped_keys = [] if persist_all else ["data_cleaned", "data_categorized"]
+    if args.stream:
+        # Downloads, cleaning and categorization overlap; nothing is recorded for --resume
+        from src.download.sources import LocalFolderSource, make_source
+        from src.pipeline.stream import stream_data
+        if args.skip_download:
+            source = LocalFolderSource(orig_config["paths"]["data_raw"])
+        else:
+            source = make_source(orig_config)
+        logger.info("Streaming extracts through clean and categorize...")
+        with profiler.stage("stream"):
+            categorized = stream_data(
+                config, source, persist=persist_all, seed_folder=orig_config["paths"]["data_raw"]
+            )
+        logger.info("Reconciling data from categorized...")
+        with profiler.stage("reconcile"):
+            reconcile_data(config, dfs=group_partitions(categorized), persist=checkpoint != CHECKPOINT_NONE)
+    elif persist_all:
+        download_raw(args, orig_config, config)
+        # Every partition is checkpointed and recorded in data/tmp/manifest.json as it
+        # completes; a resumed run only rebuilds what is missing or out of date
+        logger.info("Cleaning, categorizing and reconciling data from raw...")
+        run_incremental(config, jobs=args.jobs, memory_budget_mb=args.memory_budget_mb)
+    else:
+        download_raw(args, orig_config, config)
+        logger.info("Cleaning data from raw...")
+        with profiler.stage("clean"):
+            cleaned = clean_data(
+                config, jobs=args.jobs, memory_budget_mb=args.memory_budget_mb, persist=False
+            )
+        logger.info("Categorizing data from cleaned...")
+        with profiler.stage("categorize"):
+            # Streaming writes the cleaned folder and returns no frames
+            cleaned_dfs = flatten_partitions(cleaned) if cleaned is not None else None
+            categorized = categorize_data(config, dfs=cleaned_dfs, persist=False)
+        logger.info("Reconciling data from categorized...")
+        with profiler.stage("reconcile"):
+            reconcile_data(config, dfs=group_partitions(categorized), persist=checkpoint != CHECKPOINT_NONE)
+        if cleaned is None:
+            skipped_keys.remove("data_cleaned")
+
+    with profiler.stage("publish"):
+        replace_tmp_with_data(config, skipped_keys)
+
+    if persist_all and not args.stream:
+        # The run's manifest describes the published folders; incremental runs start from it
+        manifest = Manifest.load(manifest_path(config))
+        manifest.data["stages"].pop("run", None)
+        manifest.path = manifest_path(orig_config)
+        manifest.save()
+    elif os.path.exists(manifest_path(orig_config)):
+        # A rebuild without checkpoints (or streamed) is not recorded; the next incremental run starts afresh
+        os.remove(manifest_path(orig_config))
+    if os.path.exists(manifest_path(config)):
+        os.remove(manifest_path(config))
+    if os.path.isdir(tmp_root(config)) and not os.listdir(tmp_root(config)):
+        os.rmdir(tmp_root(config))
     logger.info("All done!")
 
 
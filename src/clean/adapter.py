@@ -0,0 +1,138 @@
+"""
+Module for cleaning bank extracts from a declarative spec.
+Each bank declares a BankSpec; BankAdapter compiles it into columnar
+pandas/NumPy operations that produce the standard cleaned columns.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.config import load_config
+from src.utils.schema import apply_schema
+
+
+config = load_config()
+STANDARD_COLUMNS = config['data_processing']['standard_columns']
+
+
+@dataclass(frozen=True)
+class BankSpec:
+    """
+    Declarative description of a bank extract.
+
+    Attributes:
+        name: Bank name written to the `bank` column
+        column_map: Raw column name -> standard name ('date', 'value', 'description', ...)
+        positional_columns: Standard names assigned by position, used instead of column_map
+        description_columns: Raw columns joined with a space to build `description`
+        date_format: strptime format for dates not parsed by the reader
+        decimal: Decimal separator of text values
+        thousands: Thousands separator of text values
+        participant_pattern: Regex whose first group, matched on `description`, is the participant
+        text_columns: Columns whose whitespace is collapsed
+        lowercase_columns: Columns converted to lowercase
+    """
+    name: str
+    column_map: Dict[str, str] = field(default_factory=dict)
+    positional_columns: Optional[List[str]] = None
+    description_columns: Optional[List[str]] = None
+    date_format: Optional[str] = None
+    decimal: str = '.'
+    thousands: Optional[str] = None
+    participant_pattern: Optional[str] = None
+    text_columns: Tuple[str, ...] = ('description',)
+    lowercase_columns: Tuple[str, ...] = ('description', 'participant')
+
+
+class BankAdapter:
+    """Compiled cleaner for a BankSpec."""
+
+    def __init__(self, spec: BankSpec):
+        self.spec = spec
+        self._participant_re = (
+            re.compile(spec.participant_pattern) if spec.participant_pattern else None
+        )
+
+    def __call__(self, df: pd.DataFrame) -> pd.DataFrame:
+        return self.clean(df)
+
+    def clean(self, raw_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Clean a raw extract into the standard format.
+
+        Args:
+            raw_df: Raw DataFrame from the bank export
+
+        Returns:
+            DataFrame with standard columns, in standard order
+        """
+        df = self._select_columns(raw_df)
+        df['date'] = self._parse_dates(df['date'])
+
+        value = self._parse_values(df['value']).to_numpy(dtype=float)
+        df['income'] = np.where(value > 0, value, 0.0)
+        df['outcome'] = np.where(value < 0, -value, 0.0)
+        df = df.drop(columns=['value'])
+
+        for column in self.spec.text_columns:
+            df[column] = _collapse_whitespace(df[column])
+
+        if self._participant_re is not None:
+            df['participant'] = (
+                df['description']
+                .str.extract(self._participant_re, expand=False)
+                .fillna('')
+            )
+
+        for column in self.spec.lowercase_columns:
+            if column in df.columns:
+                df[column] = df[column].str.lower()
+
+        df['bank'] = self.spec.name
+        df['balance'] = 0.0
+        df['category'] = ''
+        return apply_schema(df.reindex(columns=STANDARD_COLUMNS))
+
+    def _select_columns(self, raw_df: pd.DataFrame) -> pd.DataFrame:
+        """Map raw columns to standard names, building `description` if needed."""
+        spec = self.spec
+        if spec.positional_columns is not None:
+            df = raw_df.iloc[:, :len(spec.positional_columns)].copy()
+            df.columns = spec.positional_columns
+            return df
+
+        df = raw_df[list(spec.column_map)].rename(columns=spec.column_map)
+        if spec.description_columns:
+            parts = [raw_df[col].fillna('').astype(str) for col in spec.description_columns]
+            description = parts[0]
+            for part in parts[1:]:
+                description = description + ' ' + part
+            df['description'] = description
+        return df
+
+    def _parse_dates(self, dates: pd.Series) -> pd.Series:
+        if pd.api.types.is_datetime64_any_dtype(dates):
+            return dates
+        return pd.to_datetime(dates, format=self.spec.date_format, dayfirst=True)
+
+    def _parse_values(self, values: pd.Series) -> pd.Series:
+        if pd.api.types.is_numeric_dtype(values):
+            return values.astype(float)
+        text = values.astype(str)
+        if self.spec.thousands:
+            text = text.str.replace(self.spec.thousands, '', regex=False)
+        if self.spec.decimal != '.':
+            text = text.str.replace(self.spec.decimal, '.', regex=False)
+        return pd.to_numeric(text)
+
+
+def _collapse_whitespace(text: pd.Series) -> pd.Series:
+    """Collapse whitespace runs into a single space and strip the ends."""
+    return (
+        text.fillna('').astype(str)
+        .str.replace(r'\s+', ' ', regex=True)
+        .str.strip()
+    )
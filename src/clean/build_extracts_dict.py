@@ -3,20 +3,24 @@ Module for building dictionary of bank extracts.
 Coordinates the framing of different bank extracts.
 """
 import os
-from glob import glob
 import calendar
-from copy import deepcopy
 import pandas as pd
-from typing import Dict, Tuple, List
+from typing import Dict, Iterator, Tuple, List, Optional
 
-from src.clean.nubank.frame_extracts import (
-    parse_dates_from_filename as parse_nubank_dates,
-    read_csv as read_nubank_csv
-)
-from src.clean.inter.frame_extracts import (
-    parse_dates_from_filename as parse_inter_dates,
-    read_csv as read_inter_csv
-)
+from src.clean.coverage import ExtractCoverage, CoverageIndex, build_read_plan
+from src.clean.sources import extract_filename, list_extract_locations, open_extract
+
+from src.clean.nubank import frame_extracts as nubank_frame
+from src.clean.inter import frame_extracts as inter_frame
+
+# Each reader module provides DATE_COLUMN, read_csv and read_csv_chunks
+EXTRACT_READERS = {
+    'nubank': nubank_frame,
+    'inter': inter_frame,
+}
+
+# Rough ratio between a parsed-and-cleaned chunk in memory and its raw text size
+IN_MEMORY_EXPANSION = 10
 
 def get_months_in_range(start_date: pd.Timestamp, end_date: pd.Timestamp) -> List[str]:
     """
@@ -56,85 +60,187 @@ def is_month_complete(start_date: pd.Timestamp, end_date: pd.Timestamp, year_mon
     
     return start_date <= month_start and end_date >= month_end
 
-def build_extracts_dict(extract_base_dir: str = "data/00_raw") -> Dict[str, Dict[str, pd.DataFrame]]:
+def read_extract_months(bank: str, csv_path: str, months: List[str], engine: str = 'pandas') -> Dict[str, pd.DataFrame]:
     """
-    Build dictionary of bank extracts, handling multi-month extracts.
+    Parse an extract file once and split it into the requested months.
     
     Args:
-        extract_base_dir: Directory containing bank extract files
+        bank: Bank name, used to pick the reader
+        csv_path: Path to the extract file
+        months: Year-month strings (YYYY-MM) to keep
+        engine: CSV parser, 'pandas' or 'pyarrow'
         
     Returns:
-        Dict with structure: {'bank_name': {'YYYY-MM': DataFrame}}
+        Dict with structure {'YYYY-MM': DataFrame}, without empty months
+    """
+    reader = EXTRACT_READERS[bank]
+    df = reader.read_csv(csv_path, engine=engine)
+    return dict(split_by_month(df, reader.DATE_COLUMN, months))
+
+def split_by_month(df: pd.DataFrame, date_column: str, months: List[str]) -> Iterator[Tuple[str, pd.DataFrame]]:
     """
-    all_extract_dict = {'nubank': {}, 'inter': {}}
-    extract_coverage = {'nubank': {}, 'inter': {}}
+    Split a raw frame into the requested months with one groupby on a period key.
     
-    pattern = os.path.join(extract_base_dir, '**', '*.csv')
-    extract_csv_paths = glob(pattern, recursive=True)
+    Args:
+        df: Raw extract DataFrame
+        date_column: Name of the parsed date column
+        months: Year-month strings (YYYY-MM) to keep
+        
+    Returns:
+        Iterator over ('YYYY-MM', DataFrame) pairs, without empty months
+    """
+    wanted = set(months)
+    period_key = df[date_column].dt.to_period('M')
+    for period, month_df in df.groupby(period_key, sort=True):
+        year_month = str(period)
+        if year_month in wanted and not month_df.empty:
+            yield year_month, month_df
 
-    # First pass: Find all available months from all extracts
-    for csv_path in extract_csv_paths:
-        filename = os.path.basename(csv_path)
+def estimate_chunk_rows(csv_path: str, memory_budget_mb: float, sample_bytes: int = 1 << 16) -> int:
+    """
+    Estimate how many rows fit in a memory budget, from the file's average line size.
+    
+    Args:
+        csv_path: Path to the extract file
+        memory_budget_mb: Peak memory allowed for one chunk, in megabytes
+        sample_bytes: Number of bytes sampled from the head of the file
+        
+    Returns:
+        Number of rows per chunk (at least 1)
+    """
+    with open_extract(csv_path) as f:
+        sample = f.read(sample_bytes)
+    lines = max(sample.count(b'\n'), 1)
+    bytes_per_row = max(len(sample) / lines, 1) * IN_MEMORY_EXPANSION
+    return max(int(memory_budget_mb * 1024 * 1024 / bytes_per_row), 1)
 
-        try:
-            if 'NU' in filename:
-                bank = 'nubank'
-                start_date, end_date = parse_nubank_dates(filename)
-                months = get_months_in_range(start_date, end_date)
-            elif 'Extrato' in filename:
-                bank = 'inter'
-                start_date, end_date = parse_inter_dates(filename)
-                months = get_months_in_range(start_date, end_date)
-            else:
-                continue
+def iter_extract_chunks(
+    bank: str,
+    csv_path: str,
+    months: List[str],
+    memory_budget_mb: float
+) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """
+    Stream an extract file in bounded chunks, routing each chunk to its months.
+    A month spanning several chunks is yielded once per chunk, in file order.
+    
+    Args:
+        bank: Bank name, used to pick the reader
+        csv_path: Path to the extract file
+        months: Year-month strings (YYYY-MM) to keep
+        memory_budget_mb: Peak memory allowed for one chunk, in megabytes
+        
+    Returns:
+        Iterator over ('YYYY-MM', DataFrame) pairs
+    """
+    reader = EXTRACT_READERS[bank]
+    chunksize = estimate_chunk_rows(csv_path, memory_budget_mb)
+    for chunk in reader.read_csv_chunks(csv_path, chunksize):
+        yield from split_by_month(chunk, reader.DATE_COLUMN, months)
 
-            # Record coverage for each month
-            for month in months:
-                if month not in extract_coverage[bank]:
-                    extract_coverage[bank][month] = []
-                
-                coverage_info = {
-                    'path': csv_path,
-                    'start_date': start_date,
-                    'end_date': end_date,
-                    'is_complete': is_month_complete(start_date, end_date, month)
-                }
-                extract_coverage[bank][month].append(coverage_info)
+def identify_extract(csv_path: str) -> Optional[ExtractCoverage]:
+    """
+    Identify bank and covered dates of an extract from its (inner) filename.
+    
+    Args:
+        csv_path: Location of the extract file (see src.clean.sources)
+        
+    Returns:
+        ExtractCoverage, or None if the file is not a known extract
+    """
+    filename = extract_filename(csv_path)
+    if 'NU' in filename:
+        bank = 'nubank'
+        start_date, end_date = nubank_frame.parse_dates_from_filename(filename)
+    elif 'Extrato' in filename:
+        bank = 'inter'
+        start_date, end_date = inter_frame.parse_dates_from_filename(filename)
+    else:
+        return None
+    return ExtractCoverage(bank, csv_path, start_date, end_date)
 
+def discover_extracts(extract_base_dir: str) -> List[ExtractCoverage]:
+    """
+    Find every extract file under a directory and index its coverage.
+    Plain, gzip, zstandard and zipped CSV extracts are all recognized.
+    
+    Args:
+        extract_base_dir: Directory containing bank extract files
+        
+    Returns:
+        List of ExtractCoverage, one per recognized file
+    """
+    extracts = []
+    for csv_path in list_extract_locations(extract_base_dir):
+        try:
+            extract = identify_extract(csv_path)
         except Exception as e:
-            print(f"Error processing {filename}: {str(e)}")
+            print(f"Error processing {os.path.basename(csv_path)}: {str(e)}")
             continue
+        if extract is not None:
+            extracts.append(extract)
+    return extracts
 
-    # Second pass: Choose best extract for each month and read data
-    for bank in extract_coverage:
-        for month in extract_coverage[bank]:
-            try:
-                # Prefer complete month extracts
-                month_files = extract_coverage[bank][month]
-                complete_files = [f for f in month_files if f['is_complete']]
-                
-                if complete_files:
-                    chosen_file = max(complete_files, 
-                        key=lambda x: (x['end_date'] - x['start_date']).days)
-                else:
-                    chosen_file = max(month_files, 
-                        key=lambda x: (x['end_date'] - x['start_date']).days)
-                
-                # Read only the specific month from the chosen file
-                if bank == 'nubank':
-                    df = read_nubank_csv(chosen_file['path'], month)
-                else:
-                    df = read_inter_csv(chosen_file['path'], month)
-                
-                if not df.empty:
-                    all_extract_dict[bank][month] = df
-                    
-                    if not chosen_file['is_complete']:
-                        print(f"Warning: Incomplete month {month} in {bank}")
+def plan_extract_reads(extract_base_dir: str) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Build the read plan for a raw directory, warning about incomplete months.
+    
+    Args:
+        extract_base_dir: Directory containing bank extract files
+        
+    Returns:
+        Dict with structure {'bank_name': {'csv_path': ['YYYY-MM', ...]}}
+    """
+    extracts = discover_extracts(extract_base_dir)
+    read_plan = {bank: {} for bank in EXTRACT_READERS}
+    read_plan.update(build_read_plan(extracts))
 
+    for bank in read_plan:
+        index = CoverageIndex([e for e in extracts if e.bank == bank])
+        for month in index.incomplete_months():
+            print(f"Warning: Incomplete month {month} in {bank}")
+    return read_plan
+
+def read_planned_extracts(
+    read_plan: Dict[str, Dict[str, List[str]]],
+    engine: str = 'pandas'
+) -> Dict[str, Dict[str, pd.DataFrame]]:
+    """
+    Execute a read plan, opening each planned file once.
+    
+    Args:
+        read_plan: Dict with structure {'bank_name': {'csv_path': ['YYYY-MM', ...]}}
+        engine: CSV parser, 'pandas' or 'pyarrow'
+        
+    Returns:
+        Dict with structure: {'bank_name': {'YYYY-MM': DataFrame}}
+    """
+    all_extract_dict = {bank: {} for bank in read_plan}
+    for bank, file_months in read_plan.items():
+        for csv_path, months in file_months.items():
+            try:
+                monthly_dfs = read_extract_months(bank, csv_path, months, engine=engine)
             except Exception as e:
-                print(f"Error reading {month} from {bank}: {str(e)}")
+                print(f"Error reading {os.path.basename(csv_path)} from {bank}: {str(e)}")
                 continue
+            all_extract_dict[bank].update(monthly_dfs)
+
+        all_extract_dict[bank] = dict(sorted(all_extract_dict[bank].items()))
+    return all_extract_dict
+
+def build_extracts_dict(extract_base_dir: str = "data/00_raw", engine: str = 'pandas') -> Dict[str, Dict[str, pd.DataFrame]]:
+    """
+    Build dictionary of bank extracts, handling multi-month extracts.
+    
+    Args:
+        extract_base_dir: Directory containing bank extract files
+        engine: CSV parser, 'pandas' or 'pyarrow'
+        
+    Returns:
+        Dict with structure: {'bank_name': {'YYYY-MM': DataFrame}}
+    """
+    read_plan = plan_extract_reads(extract_base_dir)
+    all_extract_dict = read_planned_extracts(read_plan, engine=engine)
 
     # Print summary of available data
     _print_extracts_summary(all_extract_dict)
@@ -0,0 +1,187 @@
+"""
+Module for planning which extract files to read.
+Indexes each file's [start_date, end_date] interval and selects a minimal
+set of files covering every month, preferring complete-month coverage.
+"""
+import calendar
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+
+def month_index(date: pd.Timestamp) -> int:
+    """Convert a date to a month ordinal (year * 12 + month - 1)."""
+    return date.year * 12 + date.month - 1
+
+
+def month_label(index: int) -> str:
+    """Convert a month ordinal back to a 'YYYY-MM' string."""
+    year, month = divmod(index, 12)
+    return f"{year}-{month + 1:02d}"
+
+
+@dataclass(frozen=True)
+class ExtractCoverage:
+    """Date interval covered by a single extract file."""
+    bank: str
+    path: str
+    start_date: pd.Timestamp
+    end_date: pd.Timestamp
+
+    @property
+    def first_month(self) -> int:
+        return month_index(self.start_date)
+
+    @property
+    def last_month(self) -> int:
+        return month_index(self.end_date)
+
+    @property
+    def first_complete_month(self) -> int:
+        """First month whose every day is inside the extract."""
+        month = self.first_month
+        return month if self.start_date.day == 1 else month + 1
+
+    @property
+    def last_complete_month(self) -> int:
+        """Last month whose every day is inside the extract."""
+        days_in_month = calendar.monthrange(self.end_date.year, self.end_date.month)[1]
+        month = self.last_month
+        return month if self.end_date.day == days_in_month else month - 1
+
+    @property
+    def length(self) -> int:
+        return (self.end_date - self.start_date).days
+
+    def touches(self, month: int) -> bool:
+        return self.first_month <= month <= self.last_month
+
+    def is_complete(self, month: int) -> bool:
+        return self.first_complete_month <= month <= self.last_complete_month
+
+
+class CoverageIndex:
+    """
+    Interval index over the extract files of one bank.
+
+    Intervals are kept sorted by start month, so covering and merging
+    are single sweeps over the files instead of expanding every file
+    into its months and re-discovering it for each one.
+    """
+
+    def __init__(self, extracts: List[ExtractCoverage]):
+        self.extracts = sorted(extracts, key=lambda e: (e.first_month, -e.length, e.path))
+
+    def months(self) -> List[int]:
+        """All months touched by at least one extract."""
+        return _union([(e.first_month, e.last_month) for e in self.extracts])
+
+    def complete_months(self) -> List[int]:
+        """All months covered completely by at least one extract."""
+        return _union([(e.first_complete_month, e.last_complete_month) for e in self.extracts])
+
+    @staticmethod
+    def _greedy_cover(
+        points: List[int],
+        intervals: List[Tuple[int, int, ExtractCoverage]]
+    ) -> List[ExtractCoverage]:
+        """
+        Minimum number of intervals covering all points.
+        Classic greedy: for the leftmost uncovered point, take the interval
+        starting at or before it that reaches furthest.
+        """
+        intervals = sorted(intervals, key=lambda x: (x[0], -x[1]))
+        chosen = []
+        covered_until = None
+        best = None
+        i = 0
+        for point in points:
+            if covered_until is not None and point <= covered_until:
+                continue
+            while i < len(intervals) and intervals[i][0] <= point:
+                if best is None or (intervals[i][1], intervals[i][2].length) > (best[1], best[2].length):
+                    best = intervals[i]
+                i += 1
+            if best is None or best[1] < point:
+                continue
+            chosen.append(best[2])
+            covered_until = best[1]
+        return chosen
+
+    def minimal_cover(self) -> List[ExtractCoverage]:
+        """
+        Select a minimum set of extracts covering every month.
+
+        A month that some extract covers completely must be read from such an
+        extract; any other month from an extract touching it. Either way each
+        extract serves a contiguous run of months (those it touches, minus a
+        partial first or last month another extract covers completely), so a
+        single greedy interval cover is optimal.
+        """
+        complete_set = set(self.complete_months())
+        intervals = []
+        for e in self.extracts:
+            first, last = e.first_month, e.last_month
+            if first in complete_set and not e.is_complete(first):
+                first += 1
+            if last in complete_set and not e.is_complete(last):
+                last -= 1
+            if first <= last:
+                intervals.append((first, last, e))
+        return self._greedy_cover(self.months(), intervals)
+
+    def plan(self) -> Dict[str, List[str]]:
+        """
+        Build a read plan for this bank.
+
+        Returns:
+            Dict with structure {'path': ['YYYY-MM', ...]}
+        """
+        chosen = self.minimal_cover()
+        read_plan: Dict[str, List[str]] = {}
+        for month in self.months():
+            extract = _best_for_month([e for e in chosen if e.touches(month)], month)
+            if extract is not None:
+                read_plan.setdefault(extract.path, []).append(month_label(month))
+        return read_plan
+
+    def incomplete_months(self) -> List[str]:
+        """Months no extract covers completely."""
+        complete_set = set(self.complete_months())
+        return [month_label(m) for m in self.months() if m not in complete_set]
+
+
+def _union(intervals: List[Tuple[int, int]]) -> List[int]:
+    """Months inside the union of closed month intervals, merged in a single sweep."""
+    months = []
+    covered_until = None
+    for start, end in sorted(i for i in intervals if i[0] <= i[1]):
+        if covered_until is not None and start <= covered_until:
+            start = covered_until + 1
+        months.extend(range(start, end + 1))
+        covered_until = end if covered_until is None else max(covered_until, end)
+    return months
+
+
+def _best_for_month(extracts: List[ExtractCoverage], month: int) -> Optional[ExtractCoverage]:
+    """Prefer complete coverage, then the longest extract."""
+    if not extracts:
+        return None
+    return max(extracts, key=lambda e: (e.is_complete(month), e.length))
+
+
+def build_read_plan(extracts: List[ExtractCoverage]) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Build an explicit read plan for a list of extracts.
+
+    Args:
+        extracts: Coverage of every discovered extract file
+
+    Returns:
+        Dict with structure {'bank_name': {'path': ['YYYY-MM', ...]}}
+    """
+    by_bank: Dict[str, List[ExtractCoverage]] = {}
+    for extract in extracts:
+        by_bank.setdefault(extract.bank, []).append(extract)
+    return {bank: CoverageIndex(bank_extracts).plan() for bank, bank_extracts in by_bank.items()}
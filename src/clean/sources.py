@@ -0,0 +1,123 @@
+"""
+Module for locating and opening raw extract files.
+Plain, gzip (.csv.gz), zstandard (.csv.zst) and zipped extracts are
+decompressed as streams, so readers never need temporary files.
+
+An extract is addressed by a location string: a file path, or
+'<archive>.zip::<member>' for a file inside a zip archive.
+"""
+import gzip
+import importlib.util
+import os
+import zipfile
+from contextlib import contextmanager
+from glob import glob
+from typing import TYPE_CHECKING, BinaryIO, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow
+
+ZIP_SEPARATOR = '::'
+EXTRACT_SUFFIXES = ('.csv', '.csv.gz', '.csv.zst')
+COMPRESSION_SUFFIXES = ('.gz', '.zst')
+
+
+def arrow_available() -> bool:
+    """Whether pyarrow is installed, checked without importing it."""
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def arrow_frame(table: 'pyarrow.Table') -> 'pd.DataFrame':
+    """
+    Convert a table read by the PyArrow CSV reader to the frame `pd.read_csv` gives:
+    missing text is NaN rather than None.
+    """
+    df = table.to_pandas()
+    for column in df.columns[df.dtypes == object]:
+        df[column] = df[column].where(df[column].notna(), float('nan'))
+    return df
+
+
+def split_location(location: str) -> Tuple[str, Optional[str]]:
+    """Split a location into (path, zip member or None)."""
+    if ZIP_SEPARATOR in location:
+        path, member = location.split(ZIP_SEPARATOR, 1)
+        return path, member
+    return location, None
+
+
+def extract_filename(location: str) -> str:
+    """Inner filename of an extract, without compression suffix."""
+    path, member = split_location(location)
+    filename = os.path.basename(member if member is not None else path)
+    for suffix in COMPRESSION_SUFFIXES:
+        if filename.lower().endswith(suffix):
+            return filename[:-len(suffix)]
+    return filename
+
+
+def _is_extract_name(name: str) -> bool:
+    return name.lower().endswith(EXTRACT_SUFFIXES)
+
+
+def list_extract_locations(base_dir: str) -> List[str]:
+    """
+    Find every extract under a directory, looking inside zip archives.
+
+    Args:
+        base_dir: Directory containing bank extract files
+
+    Returns:
+        Sorted list of locations
+    """
+    locations = []
+    for path in glob(os.path.join(base_dir, '**', '*'), recursive=True):
+        if not os.path.isfile(path):
+            continue
+        if path.lower().endswith('.zip'):
+            try:
+                with zipfile.ZipFile(path) as archive:
+                    locations.extend(
+                        f"{path}{ZIP_SEPARATOR}{member}"
+                        for member in archive.namelist()
+                        if _is_extract_name(member)
+                    )
+            except zipfile.BadZipFile as e:
+                print(f"Error processing {os.path.basename(path)}: {str(e)}")
+        elif _is_extract_name(path):
+            locations.append(path)
+    return sorted(locations)
+
+
+def _decompress(stream: BinaryIO, name: str) -> BinaryIO:
+    """Wrap a binary stream with the decompressor matching its name (in any case)."""
+    name = name.lower()
+    if name.endswith('.gz'):
+        return gzip.GzipFile(fileobj=stream, mode='rb')
+    if name.endswith('.zst'):
+        import zstandard
+        return zstandard.ZstdDecompressor().stream_reader(stream)
+    return stream
+
+
+@contextmanager
+def open_extract(location: str) -> Iterator[BinaryIO]:
+    """
+    Open an extract as a decompressed binary stream.
+
+    Args:
+        location: File path or '<archive>.zip::<member>'
+
+    Returns:
+        Context manager yielding a readable binary stream
+    """
+    path, member = split_location(location)
+    if member is not None:
+        with zipfile.ZipFile(path) as archive, archive.open(member) as raw:
+            with _decompress(raw, member) as stream:
+                yield stream
+    else:
+        with open(path, 'rb') as raw:
+            with _decompress(raw, path) as stream:
+                yield stream
@@ -23,8 +23,9 @@ class CashFlowDash(BaseDashboard):
         self.total_width = 1024
 
         # Process data
-        self.data['month'] = self.data['date'].dt.to_period('M').dt.strftime('%Y-%m')
-        self.months = sorted(self.data['month'].unique())
+        months = self.data['date'].dt.to_period('M').dt.strftime('%Y-%m')
+        self.data['month'] = pd.Categorical(months, categories=sorted(months.dropna().unique()))
+        self.months = self.data['month'].cat.categories.tolist()
 
         # Initialize components
         self._setup_controls()
@@ -162,14 +163,14 @@ class CashFlowDash(BaseDashboard):
             (self.data['date'] >= initial_date) & (self.data['date'] <= final_date)
         ]
 
-        monthly_data = self.filtered_data.groupby('month').agg(
+        monthly_data = self.filtered_data.groupby('month', observed=True).agg(
             income=('income', 'sum'),
             outcome=('outcome', 'sum'),
             ending_balance=('balance', 'last')
         ).reset_index()
         
         monthly_data['profit_loss'] = monthly_data['income'] - monthly_data['outcome']
-        monthly_data['month_label'] = pd.to_datetime(monthly_data['month']).dt.strftime('%b %Y')
+        monthly_data['month_label'] = pd.to_datetime(monthly_data['month'].astype(str)).dt.strftime('%b %Y')
         monthly_data['profit_loss_color'] = [
             'lightgreen' if x > 0 else 'lightcoral' for x in monthly_data['profit_loss']
         ]
@@ -74,7 +74,8 @@ class OutflowDash(BaseDashboard):
     
     def _prepare_data(self) -> None:
         """Prepare the data for analysis by adding required columns."""
-        self.data['month'] = self.data['date'].dt.strftime('%Y-%m')
+        months = self.data['date'].dt.to_period('M').dt.strftime('%Y-%m')
+        self.data['month'] = pd.Categorical(months, categories=sorted(months.dropna().unique()))
         
     
     def _initialize_dimensions(self) -> None:
@@ -91,7 +92,7 @@ class OutflowDash(BaseDashboard):
     def _get_sorted_dimension_values(self, dim_name: str) -> List[str]:
         """Get dimension values sorted by total outcome amount."""
         return (
-            self.data.groupby(dim_name)['outcome']
+            self.data.groupby(dim_name, observed=True)['outcome']
             .sum()
             .sort_values(ascending=False)
             .index.tolist()
@@ -108,14 +109,14 @@ class OutflowDash(BaseDashboard):
             # Calculate monthly outcomes
             temp = (
                 self.data
-                .groupby(['participant', dim, 'month'])['outcome']
+                .groupby(['participant', dim, 'month'], observed=True)['outcome']
                 .sum()
                 .reset_index(name='monthly_outcome')
             )
 
             # Calculate averages and totals
             global_stats = (
-                temp.groupby(['participant', dim])['monthly_outcome']
+                temp.groupby(['participant', dim], observed=True)['monthly_outcome']
                 .agg(['mean', 'sum'])
                 .reset_index()
             )
@@ -134,7 +135,7 @@ class OutflowDash(BaseDashboard):
         default_final_month = today.strftime('%Y-%m')
         default_initial_month = (today - pd.DateOffset(months=12)).strftime('%Y-%m')
         
-        self.months = sorted(self.data['month'].unique().tolist())
+        self.months = self.data['month'].cat.categories.tolist()
         
         # Create selection controls
         self.start_month = Select(
@@ -261,9 +262,13 @@ class OutflowDash(BaseDashboard):
     
     def _filter_data(self, start: str, end: str, dim_column: str, active_items: List[str]) -> pd.DataFrame:
         """Filter data based on date range and active dimension items."""
+        # Months are sorted categories, so the range is a slice of category codes
+        month_codes = self.data['month'].cat.codes
+        first_code = self.data['month'].cat.categories.searchsorted(start, side='left')
+        last_code = self.data['month'].cat.categories.searchsorted(end, side='right')
         return self.data[
-            (self.data['month'] >= start) &
-            (self.data['month'] <= end) &
+            (month_codes >= first_code) &
+            (month_codes < last_code) &
             (self.data[dim_column].isin(active_items))
         ].copy()
     
@@ -271,11 +276,13 @@ class OutflowDash(BaseDashboard):
         """Group data by month and dimension for stacked bar chart."""
         grouped = (
             data
-            .groupby(['month', dim_column])['outcome']
+            .groupby(['month', dim_column], observed=True)['outcome']
             .sum()
             .unstack(fill_value=0)
         )
-        return grouped.reset_index()
+        grouped.index = grouped.index.astype(str)
+        grouped.columns = grouped.columns.astype(str)
+        return grouped.rename_axis(index='month', columns=None).reset_index()
     
     def _prepare_plot_data(self, grouped: pd.DataFrame, stackers: List[str]) -> Dict[str, List[Any]]:
         """Prepare data dictionary for ColumnDataSource with tooltips."""
@@ -300,7 +307,7 @@ class OutflowDash(BaseDashboard):
         stats_df = self.participant_stats[
             self.participant_stats['dimension'] == self.current_dimension
         ].copy()
-        stats_df['key'] = stats_df['month'] + "||" + stats_df[self.current_dimension].astype(str)
+        stats_df['key'] = stats_df['month'].astype(str) + "||" + stats_df[self.current_dimension].astype(str)
 
         lookup = {}
         for row in stats_df.itertuples():
@@ -1,5 +1,4 @@
 import os
-import gdown
 import json
 import pandas as pd
 
@@ -11,21 +10,19 @@ sheet_name = os.getenv("LOOKUP_SHEET_PAGE")
 lookup_json_path = os.getenv("CATEGORY_LOOKUP_PATH")
 
 
-def download_extracts(drive_folder_id, local_folder, debug=False):
+def download_extracts(drive_folder_id, local_folder, debug=False, workers=4):
     """Download only new files from the Google Drive folder to the local folder."""
-
-    if not len(drive_folder_id) == 33:
-        print(f"folder id is not a valid google ID: {drive_folder_id}")
-        pass
+    from src.download.sources import GoogleDriveSource
+    from src.download.sync import ExtractSync
 
     print("Downloading files from drive...")
 
-    os.makedirs(local_folder, exist_ok=True)
-    folder_url = f"https://drive.google.com/drive/folders/{drive_folder_id}"
     try:
-        gdown.download_folder(folder_url, output=local_folder, quiet=not debug)
+        result = ExtractSync(GoogleDriveSource(drive_folder_id, os.getenv("DRIVE_API_KEY")), local_folder).run(workers)
     except Exception as e:
-        print(f"gdown could not download the extract csv files. Error: {e}")
+        print(f"gdown could not list the extract csv files. Error: {e}")
+        return
+    if result["failed"]:
+        print(f"gdown could not download: {', '.join(result['failed'])}")
 
     print("All extracted downloaded!")
-
@@ -0,0 +1,216 @@
+"""
+Module for listing and fetching raw extracts from where they are published.
+
+Every source lists its files as `RemoteFile`s and fetches one file at a time,
+so downloads can run concurrently and the pipeline can start on a file as
+soon as it lands:
+
+- `GoogleDriveSource`: the Drive extracts folder (`DRIVE_EXTRACTS_ID`), through gdown;
+  with `DRIVE_API_KEY` it is listed through the Drive API, with sizes and modification times
+- `LocalFolderSource`: a local or mounted folder (also a stand-in for Drive in tests)
+- `HttpFolderSource`: a folder served over HTTP as `index.json` + `files/<id>`
+  (see `src/tests/fake_drive.py`)
+
+Pick one with `download.source` in config.yaml (see `make_source`).
+"""
+import json
+import os
+import shutil
+import urllib.parse
+import urllib.request
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+from src.clean.sources import EXTRACT_SUFFIXES
+
+GDRIVE = 'gdrive'
+LOCAL = 'local'
+HTTP = 'http'
+SOURCES = (GDRIVE, LOCAL, HTTP)
+
+COPY_BLOCK_SIZE = 1 << 20
+HTTP_TIMEOUT_S = 60
+DRIVE_API_URL = 'https://www.googleapis.com/drive/v3/files'
+DRIVE_FOLDER_MIME = 'application/vnd.google-apps.folder'
+
+
+@dataclass(frozen=True)
+class RemoteFile:
+    """A file published by a source; `size` and `modified` are None when the source does not tell."""
+    id: str
+    name: str
+    size: Optional[int] = None
+    modified: Optional[str] = None
+
+
+def is_raw_extract(name: str) -> bool:
+    """Whether a remote file is a raw extract (or an archive of extracts)."""
+    return name.lower().endswith(EXTRACT_SUFFIXES + ('.zip',))
+
+
+def local_path(local_folder: str, name: str) -> str:
+    """
+    Path of a remote file inside local_folder.
+    Raises ValueError for names that resolve outside it (absolute paths, '..').
+    """
+    folder = os.path.abspath(local_folder)
+    path = os.path.abspath(os.path.join(folder, name))
+    if path == folder or os.path.commonpath([folder, path]) != folder:
+        raise ValueError(f"Remote file name resolves outside {local_folder}: {name}")
+    return os.path.join(local_folder, name)
+
+
+def fetch_to(source, remote_file: RemoteFile, local_folder: str) -> str:
+    """
+    Fetch a file into local_folder atomically: it is written under a `.part`
+    name and renamed once complete, so readers never see a partial extract.
+
+    Returns:
+        Path of the fetched file
+    """
+    path = local_path(local_folder, remote_file.name)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    part_path = f"{path}.part"
+    try:
+        source.fetch(remote_file, part_path)
+        os.replace(part_path, path)
+    finally:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+    return path
+
+
+class LocalFolderSource:
+    """Extracts in a local folder; file ids are paths relative to it."""
+
+    def __init__(self, folder: str):
+        self.folder = folder
+
+    def list_files(self) -> List[RemoteFile]:
+        files = []
+        for root, _, filenames in os.walk(self.folder):
+            for filename in filenames:
+                path = os.path.join(root, filename)
+                rel_path = os.path.relpath(path, self.folder)
+                stat = os.stat(path)
+                files.append(RemoteFile(
+                    id=rel_path,
+                    name=rel_path,
+                    size=stat.st_size,
+                    modified=datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                ))
+        return sorted(files, key=lambda f: f.name)
+
+    def fetch(self, remote_file: RemoteFile, dest_path: str) -> None:
+        shutil.copyfile(os.path.join(self.folder, remote_file.id), dest_path)
+
+
+class HttpFolderSource:
+    """
+    Extracts served over HTTP: `<base_url>/index.json` is a list of
+    {"id", "name", "size", "modified"} objects and `<base_url>/files/<id>`
+    serves each file.
+    """
+
+    def __init__(self, base_url: str, timeout: float = HTTP_TIMEOUT_S):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def list_files(self) -> List[RemoteFile]:
+        with urllib.request.urlopen(f"{self.base_url}/index.json", timeout=self.timeout) as response:
+            entries = json.load(response)
+        return [
+            RemoteFile(entry['id'], entry['name'], entry.get('size'), entry.get('modified'))
+            for entry in entries
+        ]
+
+    def fetch(self, remote_file: RemoteFile, dest_path: str) -> None:
+        url = f"{self.base_url}/files/{urllib.parse.quote(remote_file.id)}"
+        with urllib.request.urlopen(url, timeout=self.timeout) as response, open(dest_path, 'wb') as f:
+            shutil.copyfileobj(response, f, COPY_BLOCK_SIZE)
+
+
+class GoogleDriveSource:
+    """
+    The Google Drive extracts folder, fetched with gdown.
+    With an API key it is listed through the Drive API, which gives each
+    file's size and modification time; gdown listings have neither.
+    """
+
+    def __init__(self, folder_id: str, api_key: Optional[str] = None, timeout: float = HTTP_TIMEOUT_S):
+        if not folder_id or len(folder_id) != 33:
+            print(f"folder id is not a valid google ID: {folder_id}")
+        self.folder_id = folder_id
+        self.api_key = api_key
+        self.timeout = timeout
+
+    def list_files(self) -> List[RemoteFile]:
+        if self.api_key:
+            return sorted(self._list_api(self.folder_id), key=lambda f: f.name)
+
+        import gdown
+
+        folder_url = f"https://drive.google.com/drive/folders/{self.folder_id}"
+        listing = gdown.download_folder(folder_url, output='', quiet=True, skip_download=True)
+        # gdown listings carry no sizes or modification times
+        return [RemoteFile(id=entry.id, name=entry.path) for entry in listing or []]
+
+    def _list_api(self, folder_id: str, prefix: str = '') -> List[RemoteFile]:
+        """Files of a Drive folder and its subfolders, from the Drive API (v3 files.list)."""
+        files = []
+        params = {
+            'q': f"'{folder_id}' in parents and trashed = false",
+            'fields': 'nextPageToken, files(id, name, mimeType, size, modifiedTime)',
+            'pageSize': 1000,
+            'key': self.api_key,
+        }
+        while True:
+            url = f"{DRIVE_API_URL}?{urllib.parse.urlencode(params)}"
+            with urllib.request.urlopen(url, timeout=self.timeout) as response:
+                page = json.load(response)
+            for entry in page.get('files', []):
+                name = os.path.join(prefix, entry['name'])
+                if entry.get('mimeType') == DRIVE_FOLDER_MIME:
+                    files.extend(self._list_api(entry['id'], name))
+                else:
+                    size = int(entry['size']) if 'size' in entry else None
+                    files.append(RemoteFile(entry['id'], name, size, entry.get('modifiedTime')))
+            if not page.get('nextPageToken'):
+                return files
+            params['pageToken'] = page['nextPageToken']
+
+    def fetch(self, remote_file: RemoteFile, dest_path: str) -> None:
+        import gdown
+
+        if gdown.download(id=remote_file.id, output=dest_path, quiet=True) is None:
+            raise IOError(f"gdown could not download {remote_file.name}")
+
+
+def make_source(config: dict):
+    """
+    Build the source configured in `download` (config.yaml).
+
+    Args:
+        config: Project configuration; `download.source` is one of gdrive, local, http
+            and `download.location` the folder path or base URL (gdrive reads
+            DRIVE_EXTRACTS_ID from `.env` when no location is given, and DRIVE_API_KEY
+            for listings with sizes and modification times)
+
+    Returns:
+        A source with `list_files()` and `fetch(remote_file, dest_path)`
+    """
+    settings = config.get('download', {})
+    kind = settings.get('source', GDRIVE)
+    location = settings.get('location')
+    if kind == LOCAL:
+        return LocalFolderSource(location)
+    if kind == HTTP:
+        return HttpFolderSource(location)
+    if kind == GDRIVE:
+        from dotenv import load_dotenv
+        load_dotenv()
+        if location is None:
+            location = os.getenv("DRIVE_EXTRACTS_ID")
+        return GoogleDriveSource(location, api_key=os.getenv("DRIVE_API_KEY"))
+    raise ValueError(f"Unknown download source: {kind}. Options: {', '.join(SOURCES)}")
@@ -0,0 +1,214 @@
+"""
+Module for mirroring a source's extracts into the raw folder.
+
+Only new or changed files are fetched. `.download_manifest.json` in the raw
+folder records, per remote file id, the remote name, size and modification
+time, and the size and mtime of the local copy. A remote file is unchanged
+when its listing matches the entry and the local copy still matches too.
+The manifest lives in the folder it describes, so it moves with the folder
+when `data/tmp` is published.
+
+A full run downloads into an empty `data/tmp/00--raw`; unchanged files are
+copied from the published raw folder (`seed_folder`) instead of downloaded.
+Files are fetched by a bounded pool of threads, with retries and exponential
+backoff, and each one is written atomically (see `fetch_to`).
+
+Files listed without a size or modification time (Google Drive through
+gdown, without `DRIVE_API_KEY`) are fetched again on every sync: a file
+changed in place keeps its id and name, so nothing else tells it changed.
+Remote names that resolve outside the local folder are rejected.
+"""
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.download.sources import RemoteFile, fetch_to, is_raw_extract, local_path
+
+MANIFEST_NAME = '.download_manifest.json'
+MANIFEST_VERSION = 1
+
+
+def download_settings(config: dict) -> Dict[str, float]:
+    """Workers, retries, backoff and queue size of the downloader (`download` section of config.yaml)."""
+    settings = config.get('download', {})
+    return {
+        'workers': settings.get('workers', 4),
+        'retries': settings.get('retries', 3),
+        'backoff_s': settings.get('backoff_s', 1.0),
+        'queue_size': settings.get('queue_size', 4),
+    }
+
+
+def load_download_manifest(folder: str) -> Dict[str, dict]:
+    """Entries of a folder's download manifest, keyed by remote file id."""
+    path = os.path.join(folder, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        data = json.load(f)
+    return data.get('files', {}) if data.get('version') == MANIFEST_VERSION else {}
+
+
+class ExtractSync:
+    """Mirrors a source's raw extracts into a local folder."""
+
+    def __init__(self, source, local_folder: str, seed_folder: Optional[str] = None,
+                 retries: int = 3, backoff_s: float = 1.0):
+        self.source = source
+        self.local_folder = local_folder
+        self.seed_folder = seed_folder
+        self.retries = retries
+        self.backoff_s = backoff_s
+        self.entries = load_download_manifest(local_folder)
+        self.seed_entries = load_download_manifest(seed_folder) if seed_folder else {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _matches(entry: Optional[dict], remote_file: RemoteFile, path: str) -> bool:
+        """Whether path holds the version of remote_file recorded in entry."""
+        if entry is None or not os.path.exists(path):
+            return False
+        if remote_file.size is None and remote_file.modified is None:
+            # Nothing tells a file changed in place from an unchanged one
+            return False
+        stat = os.stat(path)
+        return (
+            entry['name'] == remote_file.name
+            and entry['size'] == remote_file.size
+            and entry['modified'] == remote_file.modified
+            and entry['local_size'] == stat.st_size
+            and entry['local_mtime_ns'] == stat.st_mtime_ns
+        )
+
+    def plan(self, files: List[RemoteFile]) -> Tuple[List[RemoteFile], List[RemoteFile], List[RemoteFile]]:
+        """Split files into (already local, copied from the seed folder, to fetch)."""
+        local, seeded, fetch = [], [], []
+        for remote_file in files:
+            if self._matches(self.entries.get(remote_file.id), remote_file,
+                             local_path(self.local_folder, remote_file.name)):
+                local.append(remote_file)
+            elif self.seed_folder and self._matches(self.seed_entries.get(remote_file.id), remote_file,
+                                                    local_path(self.seed_folder, remote_file.name)):
+                seeded.append(remote_file)
+            else:
+                fetch.append(remote_file)
+        return local, seeded, fetch
+
+    def _record(self, remote_file: RemoteFile, path: str) -> None:
+        stat = os.stat(path)
+        with self._lock:
+            self.entries[remote_file.id] = {
+                'name': remote_file.name,
+                'size': remote_file.size,
+                'modified': remote_file.modified,
+                'local_size': stat.st_size,
+                'local_mtime_ns': stat.st_mtime_ns,
+            }
+            self._save()
+
+    def _save(self) -> None:
+        os.makedirs(self.local_folder, exist_ok=True)
+        path = os.path.join(self.local_folder, MANIFEST_NAME)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': MANIFEST_VERSION, 'files': self.entries}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def _copy_seed(self, remote_file: RemoteFile) -> str:
+        """Copy an unchanged file from the seed folder, keeping its mtime."""
+        path = local_path(self.local_folder, remote_file.name)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        part_path = f"{path}.part"
+        shutil.copy2(local_path(self.seed_folder, remote_file.name), part_path)
+        os.replace(part_path, path)
+        return path
+
+    def fetch(self, remote_file: RemoteFile) -> str:
+        """Fetch one file, retrying with exponential backoff. Returns its local path."""
+        for attempt in range(self.retries + 1):
+            try:
+                return fetch_to(self.source, remote_file, self.local_folder)
+            except Exception as e:
+                if attempt == self.retries:
+                    raise
+                delay = self.backoff_s * 2 ** attempt
+                print(f"Retrying {remote_file.name} in {delay:.1f}s ({str(e)})")
+                time.sleep(delay)
+
+    def run(self, workers: int = 4, files: Optional[List[RemoteFile]] = None,
+            on_landed: Optional[Callable[[str], None]] = None) -> Dict[str, List[str]]:
+        """
+        Bring the local folder up to date with the source.
+
+        Args:
+            workers: Concurrent downloads
+            files: The source listing, if already fetched; synced in this order
+            on_landed: Called with each file's local path once it is in place
+
+        Returns:
+            Names of the files {'local': [...], 'seeded': [...], 'fetched': [...], 'failed': [...], 'removed': [...]}
+        """
+        if files is None:
+            files = [f for f in self.source.list_files() if is_raw_extract(f.name)]
+        result = {'local': [], 'seeded': [], 'fetched': [], 'failed': [], 'removed': []}
+        listed = files
+        files = []
+        for remote_file in listed:
+            try:
+                local_path(self.local_folder, remote_file.name)
+            except ValueError as e:
+                print(f"Skipping {remote_file.name}: {str(e)}")
+                result['failed'].append(remote_file.name)
+                continue
+            files.append(remote_file)
+
+        with self._lock:
+            previous_names = {entry['name'] for entry in self.entries.values()}
+        local, seeded, fetch = self.plan(files)
+        plan = {f: kind for kind, group in (('local', local), ('seeded', seeded), ('fetched', fetch)) for f in group}
+        print(f"Download: {len(fetch)} new or changed, {len(local) + len(seeded)} unchanged of {len(files)} files")
+
+        def sync_file(remote_file):
+            kind = plan[remote_file]
+            if kind == 'local':
+                path = local_path(self.local_folder, remote_file.name)
+            elif kind == 'seeded':
+                path = self._copy_seed(remote_file)
+            else:
+                path = self.fetch(remote_file)
+            self._record(remote_file, path)
+            if on_landed is not None:
+                on_landed(path)
+            return kind
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [(remote_file, pool.submit(sync_file, remote_file)) for remote_file in files]
+            for remote_file, future in futures:
+                try:
+                    result[future.result()].append(remote_file.name)
+                except Exception as e:
+                    print(f"Error downloading {remote_file.name}: {str(e)}")
+                    result['failed'].append(remote_file.name)
+
+        # Forget and delete files the source no longer publishes (or published under another name);
+        # an empty listing is more likely a failed one, so nothing is deleted then
+        ids = {f.id for f in files}
+        with self._lock:
+            self.entries = {file_id: e for file_id, e in self.entries.items() if file_id in ids}
+            self._save()
+        if listed:
+            for name in sorted(previous_names - {f.name for f in files}):
+                try:
+                    path = local_path(self.local_folder, name)
+                except ValueError:
+                    continue
+                if os.path.exists(path):
+                    os.remove(path)
+                    result['removed'].append(name)
+        if result['removed']:
+            print(f"Download: removed {len(result['removed'])} files no longer in the source")
+        return result
@@ -8,32 +8,48 @@
 the process will use `category_lookup.json` to automatic categorize based on word match in `description`.
 update the `category_lookup.json` manually (but only once).
 
+## In-memory hand-off
+`categorize_data` takes the cleaned frames from `clean_data` when given (`dfs`) instead of
+re-reading the cleaned folder, and returns the categorized frames; `persist=False` skips
+writing the categorized folder.
+
+## Category cache
+Descriptions repeat month after month, so the category of each description is cached in
+`paths.category_cache` (see `src.processing.category_cache`); the cache is cleared whenever the
+lookup changes.
+
 ## Machine learning
 after gathering sufficient categorized data, we can use machine learning to automate categorization process.
 """
 
 import os
-from src.processing.auto_category import load_category_lookup, categorize_dataframes
+from src.processing.auto_category import open_category_cache, categorize_dataframes
 # from src.processing.auto_type import load_type_rules, typefy_dataframes
 from src.utils.load_data import load_dataframes_from_dir, save_dataframes
+from src.utils.storage import storage_format
 
-def categorize_data(config):
-    category_lookup = load_category_lookup()
+def categorize_data(config, dfs=None, persist=True):
+    category_lookup = open_category_cache(config)
     # type_lookup = load_type_lookup()
 
     input_dir = config["paths"]["data_cleaned"]
     output_dir = config["paths"]["data_categorized"]
 
-    os.makedirs(output_dir, exist_ok=True)
-
-    dfs = load_dataframes_from_dir(input_dir)
+    fmt = storage_format(config)
+    if dfs is None:
+        dfs = load_dataframes_from_dir(input_dir, fmt)
 
     # typed_dfs = typefy_dataframes(dfs, type_lookup)
     categorized_dfs = categorize_dataframes(dfs, category_lookup)
+    category_lookup.save()
+    category_lookup.report()
 
-    save_dataframes(categorized_dfs, output_dir)
+    if persist:
+        os.makedirs(output_dir, exist_ok=True)
+        save_dataframes(categorized_dfs, output_dir, fmt)
 
     print(dfs)
+    return categorized_dfs
 
 
 if __name__ == "__main__":
@@ -5,34 +5,207 @@
 - output: `data/01--cleaned`
 
 process raw extracts and automatic clean. its currently supporting `nubank` and `inter` extracts.
+
+With `jobs > 1`, each (bank, month) is cleaned and written by a process pool.
+Results are gathered in (bank, month) order. A failing month does not abort
+the others: every month is processed, then the failures are raised together
+(the incremental pipeline passes `raise_errors=False` and keeps the previous
+output of the failed months instead).
+
+With a memory budget (`data_processing.memory_budget_mb` or `--memory-budget-mb`),
+raw extracts are streamed in chunks sized to the budget; each chunk is cleaned
+and appended to its month's partition, so no extract is ever fully loaded.
+Streaming runs in one process with the pandas chunked reader, so `jobs` and
+`csv_engine` do not apply. When a file fails partway, the partitions of its
+months are deleted rather than left half written, and the failures are raised
+once the other files are done.
+
+`clean_data` returns the cleaned frames so the next stage can take them in
+memory; with `persist=False` the cleaned folder is not written (streaming
+always writes it, and returns None).
 """
 
 import os
-from src.clean.build_extracts_dict import build_extracts_dict
+from concurrent.futures import ProcessPoolExecutor
+from src.clean.build_extracts_dict import build_extracts_dict, plan_extract_reads, iter_extract_chunks
 from src.clean.nubank.clean_extract import process_nubank_df
 from src.clean.inter.clean_extract import process_inter_df
+from src.utils.storage import storage_format, write_partition, delete_partition
+from src.utils.profiling import profiler, timed
+
+BANK_PROCESSORS = {
+    'nubank': process_nubank_df,
+    'inter': process_inter_df,
+}
+
+
+def clean_month(bank, yearmonth, monthly_df, cleaned_base_dir, fmt="csv", persist=True):
+    """Clean a single bank-month extract and write it to the cleaned folder."""
+    cleaned_df = BANK_PROCESSORS[bank](monthly_df)
+    if persist:
+        write_partition(cleaned_df, cleaned_base_dir, bank, yearmonth, fmt)
+    return cleaned_df
+
+
+def raise_clean_errors(failed):
+    """Raise once for everything that failed to clean (names of months or files)."""
+    if failed:
+        raise RuntimeError(f"Cleaning failed for {len(failed)} extracts: {', '.join(failed)}")
+
+
+def stream_clean_data(extract_base_dir, cleaned_base_dir, memory_budget_mb, fmt="csv"):
+    """
+    Clean raw extracts chunk by chunk, appending each chunk to its month's partition.
+    Returns the number of cleaned rows per bank and month.
+    """
+    read_plan = plan_extract_reads(extract_base_dir)
+    return stream_clean_plan(read_plan, cleaned_base_dir, memory_budget_mb, fmt)
+
+
+def stream_clean_plan(read_plan, cleaned_base_dir, memory_budget_mb, fmt="csv", on_cleaned=None,
+                      raise_errors=True):
+    """
+    Stream the files of a read plan ({bank: {csv_path: [months]}}) into cleaned partitions.
+    Returns the number of cleaned rows per bank and month; months of a file
+    that failed are left out.
+    `on_cleaned(bank, yearmonth)` is called once a file's months are fully written.
+    With `raise_errors`, a RuntimeError naming the failed files is raised once every file was processed.
+    """
+    row_counts = {bank: {} for bank in read_plan}
+    parts = {}
+    failed = []
+
+    for bank in sorted(read_plan):
+        if bank not in BANK_PROCESSORS:
+            continue
+        for csv_path, months in read_plan[bank].items():
+            try:
+                for yearmonth, chunk_df in iter_extract_chunks(bank, csv_path, months, memory_budget_mb):
+                    with profiler.partition("clean", bank, yearmonth, rows_in=len(chunk_df)) as metrics:
+                        cleaned_df = BANK_PROCESSORS[bank](chunk_df)
+                        part = parts.get((bank, yearmonth), 0)
+                        write_partition(cleaned_df, cleaned_base_dir, bank, yearmonth, fmt, part=part)
+                        metrics.rows_out = len(cleaned_df)
+                    parts[(bank, yearmonth)] = part + 1
+                    row_counts[bank][yearmonth] = row_counts[bank].get(yearmonth, 0) + len(cleaned_df)
+            except Exception as e:
+                print(f"Error cleaning {os.path.basename(csv_path)} from {bank}: {str(e)}")
+                failed.append(f"{bank} {os.path.basename(csv_path)}")
+                # Chunks already appended would leave half-cleaned months behind
+                for yearmonth in months:
+                    row_counts[bank].pop(yearmonth, None)
+                    parts.pop((bank, yearmonth), None)
+                    delete_partition(cleaned_base_dir, bank, yearmonth, fmt)
+                continue
+            if on_cleaned is not None:
+                for yearmonth in months:
+                    if yearmonth in row_counts[bank]:
+                        on_cleaned(bank, yearmonth)
 
-def clean_data(config):
+    if raise_errors:
+        raise_clean_errors(failed)
+    return row_counts
+
+
+def report_streaming_settings(jobs, engine):
+    """Say which settings a memory-budgeted (streamed) clean does not use."""
+    ignored = []
+    if jobs > 1:
+        ignored.append(f"jobs={jobs}")
+    if engine != "pandas":
+        ignored.append(f"csv_engine={engine}")
+    if ignored:
+        print(f"Memory budget set: cleaning streams in one process with the pandas reader; "
+              f"ignoring {', '.join(ignored)}")
+
+
+def clean_data(config, jobs=1, memory_budget_mb=None, persist=True):
     extract_base_dir=config["paths"]["data_raw"]
     cleaned_base_dir=config["paths"]["data_cleaned"]
 
-    all_extract_dict = build_extracts_dict(extract_base_dir)
+    if memory_budget_mb is None:
+        memory_budget_mb = config["data_processing"].get("memory_budget_mb")
+
+    fmt = storage_format(config)
+    engine = config["data_processing"].get("csv_engine", "pandas")
+
+    if memory_budget_mb:
+        report_streaming_settings(jobs, engine)
+        os.makedirs(cleaned_base_dir, exist_ok=True)
+        stream_clean_data(extract_base_dir, cleaned_base_dir, memory_budget_mb, fmt)
+        return None
+
+    all_extract_dict = build_extracts_dict(extract_base_dir, engine=engine)
 
-    nubank = all_extract_dict['nubank']
-    inter = all_extract_dict['inter']
+    return clean_extracts(all_extract_dict, cleaned_base_dir, fmt, jobs, persist)
 
-    os.makedirs(cleaned_base_dir, exist_ok=True)
 
-    for yearmonth, monthly_df in nubank.items():
-        nubank[yearmonth] = process_nubank_df(monthly_df)
-        nubank[yearmonth].to_csv(os.path.join(cleaned_base_dir, f"nubank_{yearmonth}.csv"), index=False)
+def clean_extracts(all_extract_dict, cleaned_base_dir, fmt="csv", jobs=1, persist=True, on_cleaned=None,
+                   raise_errors=True):
+    """
+    Clean and write every (bank, month) of an extracts dict ({bank: {YYYY-MM: DataFrame}}).
+    Returns the cleaned frames of the months that succeeded.
+    `on_cleaned(bank, yearmonth)` is called as each month succeeds.
+    With `raise_errors`, a RuntimeError naming the failed months is raised once every month was processed.
+    """
+    if persist:
+        os.makedirs(cleaned_base_dir, exist_ok=True)
 
-    for yearmonth, monthly_df in inter.items():
-        inter[yearmonth] = process_inter_df(monthly_df)
-        inter[yearmonth].to_csv(os.path.join(cleaned_base_dir, f"inter_{yearmonth}.csv"), index=False)
+    tasks = [
+        (bank, yearmonth, monthly_df)
+        for bank in sorted(all_extract_dict)
+        if bank in BANK_PROCESSORS
+        for yearmonth, monthly_df in sorted(all_extract_dict[bank].items())
+    ]
+
+    cleaned = {bank: {} for bank in all_extract_dict}
+    errors = []
+
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(timed, clean_month, bank, yearmonth, monthly_df, cleaned_base_dir, fmt, persist)
+                for bank, yearmonth, monthly_df in tasks
+            ]
+            for (bank, yearmonth, monthly_df), future in zip(tasks, futures):
+                try:
+                    cleaned_df, wall_s, cpu_s = future.result()
+                except Exception as e:
+                    errors.append((bank, yearmonth, e))
+                    continue
+                cleaned[bank][yearmonth] = cleaned_df
+                profiler.record("clean", bank, yearmonth, wall_s, cpu_s, len(monthly_df), len(cleaned_df))
+                if on_cleaned is not None:
+                    on_cleaned(bank, yearmonth)
+    else:
+        for bank, yearmonth, monthly_df in tasks:
+            try:
+                with profiler.partition("clean", bank, yearmonth, rows_in=len(monthly_df)) as metrics:
+                    cleaned_df = clean_month(bank, yearmonth, monthly_df, cleaned_base_dir, fmt, persist)
+                    metrics.rows_out = len(cleaned_df)
+            except Exception as e:
+                errors.append((bank, yearmonth, e))
+                continue
+            cleaned[bank][yearmonth] = cleaned_df
+            if on_cleaned is not None:
+                on_cleaned(bank, yearmonth)
+
+    for bank, yearmonth, e in errors:
+        print(f"Error cleaning {bank} {yearmonth}: {str(e)}")
+
+    if raise_errors:
+        raise_clean_errors([f"{bank} {yearmonth}" for bank, yearmonth, _ in errors])
+    return cleaned
 
 
 if __name__ == "__main__":
+    import argparse
     from src.utils.config import load_config
+
+    parser = argparse.ArgumentParser(description="Clean raw extracts.")
+    parser.add_argument("--jobs", type=int, default=1, help="number of worker processes")
+    parser.add_argument("--memory-budget-mb", type=float, default=None, help="stream extracts within this memory budget")
+    args = parser.parse_args()
+
     config = load_config()
-    clean_data(config)
\ No newline at end of file
+    clean_data(config, jobs=args.jobs, memory_budget_mb=args.memory_budget_mb)
@@ -7,23 +7,32 @@
 For NuBank data, go to the mobile App, Extrato and then select the months to download.
 They will send you an email with the csv.
 
-With `.env` setup, this script will download data from your Extracts GoogleDrive folder to raw
+With `.env` setup, this script will download data from your Extracts GoogleDrive folder to raw.
+Only new or changed files are fetched (see `src.download.sync`); other sources are set in `download` (config.yaml).
 
 If you want just to get started, manually download the csv inside `data/00--raw`, and you are good to go.
 """
 
-import os
-from src.download.sheets_api import download_extracts
+from src.download.sources import GDRIVE, make_source
+from src.download.sync import ExtractSync, download_settings
 
-def donwload_data(config):
-    
-    drive_folder_id = os.getenv("DRIVE_EXTRACTS_ID")
+def donwload_data(config, seed_folder=None):
+    """
+    Fetch the new or changed extracts of the configured source (`download` in config.yaml).
+    `seed_folder` is a raw folder of a previous run; unchanged files are copied from it.
+    """
     local_folder_path = config["paths"]["data_raw"]
+    source = make_source(config)
 
-    if drive_folder_id is None:
+    if config.get("download", {}).get("source", GDRIVE) == GDRIVE and source.folder_id is None:
         print("before downloading the data, configure variable DRIVE_EXTRACTS_ID inside `.env` with the ID of GoogleDrive extracts folder.")
+        return
 
-    download_extracts(drive_folder_id, local_folder_path, debug=False)
+    settings = download_settings(config)
+    sync = ExtractSync(source, local_folder_path, seed_folder, settings["retries"], settings["backoff_s"])
+    result = sync.run(settings["workers"])
+    if result["failed"]:
+        print(f"Could not download {len(result['failed'])} files: {', '.join(result['failed'])}")
 
 
 if __name__ == "__main__":
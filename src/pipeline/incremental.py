@@ -0,0 +1,377 @@
+"""
+**Incremental pipeline**
+
+Runs clean → categorize → reconcile in place on `data/`, rebuilding only
+the artifacts whose inputs changed since the last run:
+
+- clean (bank, month): the raw extract the read plan assigns to the month, and the clean code
+- categorize (bank, month): its cleaned partition, `category_lookup.json`, and the categorize code
+- reconcile (bank): its categorized partitions, its `balances.json` entries, and the reconcile code
+
+Editing `category_lookup.json` does not recategorize the whole history: the
+lookup of the last build is kept in the manifest, and only the
+rows containing a keyword the edit changed are categorized again. Partitions
+where no transaction changed category are not rewritten, and banks without a
+rewritten partition are not re-reconciled (reconcile follows the build token
+of each categorized partition, not its signature).
+
+Signatures are recorded in the build manifest (`paths.manifest`) as each
+partition (clean), bank batch (categorize) or bank (reconcile) completes, so an
+interrupted run resumes with the remaining work. Adding one monthly extract
+cleans and categorizes that month only; the bank is then re-reconciled, since
+running balances carry over from month to month.
+
+Frames built by a stage are handed to the next one in memory; partitions that
+were up to date are read from disk.
+"""
+
+import os
+import json
+from collections import defaultdict
+
+import pandas as pd
+
+from src.clean.build_extracts_dict import plan_extract_reads, read_planned_extracts
+from src.pipeline.clean import BANK_PROCESSORS, clean_extracts, report_streaming_settings, stream_clean_plan
+from src.pipeline.reconcile import reconcile_data, remove_bank_data
+from src.processing.auto_category import load_category_lookup, open_category_cache, categorize_dataframes
+from src.processing.recategorize import DescriptionIndex, changed_keywords, keyword_pattern, recategorize_frame
+from src.processing.reconcile import reconciled_outputs
+from src.utils.load_data import load_json, save_dataframes
+from src.utils.manifest import Manifest, code_version, signature
+from src.utils.profiling import profiler
+from src.utils.storage import (
+    storage_format, partition_key, parse_partition_key, partition_exists,
+    delete_partition, read_partition, flatten_partitions, group_partitions
+)
+
+# Source files (relative to `src/`) each stage's output depends on
+STAGE_SOURCES = {
+    'clean': ['clean', 'pipeline/clean.py', 'utils/schema.py', 'utils/storage.py'],
+    'categorize': [
+        'processing/auto_category.py', 'processing/keyword_matcher.py', 'processing/category_cache.py',
+        'processing/recategorize.py', 'pipeline/categorize.py', 'utils/schema.py', 'utils/storage.py'
+    ],
+    'reconcile': [
+        'processing/reconcile.py', 'pipeline/reconcile.py', 'utils/ledger.py',
+        'utils/snapshot.py', 'utils/schema.py', 'utils/storage.py'
+    ],
+}
+# Changed transactions printed after a lookup edit
+REPORTED_CHANGES = 50
+
+
+def manifest_path(config):
+    return config["paths"].get("manifest", os.path.join("data", "manifest.json"))
+
+
+def stage_versions(config):
+    """Code version of each stage, including the settings that shape its output."""
+    settings = {
+        "data_processing": config["data_processing"],
+        "storage": config.get("storage", {}),
+    }
+    return {stage: code_version(sources, settings) for stage, sources in STAGE_SOURCES.items()}
+
+
+def plan_clean(config, manifest, version):
+    """
+    Sign every (bank, month) of the read plan and collect those to rebuild.
+    Returns (signatures, dirty read plan {bank: {csv_path: [months]}}).
+    """
+    cleaned_dir = config["paths"]["data_cleaned"]
+    fmt = storage_format(config)
+    recorded = manifest.stage("clean")
+
+    read_plan = plan_extract_reads(config["paths"]["data_raw"])
+    signatures = {}
+    dirty = defaultdict(dict)
+    for bank, file_months in read_plan.items():
+        if bank not in BANK_PROCESSORS:
+            continue
+        for csv_path, months in file_months.items():
+            file_hash = manifest.file_hash(csv_path)
+            for yearmonth in months:
+                key = partition_key(bank, yearmonth)
+                signatures[key] = signature(version, file_hash, yearmonth)
+                if recorded.get(key) != signatures[key] or not partition_exists(cleaned_dir, bank, yearmonth, fmt):
+                    dirty[bank].setdefault(csv_path, []).append(yearmonth)
+
+    manifest.forget_files(path for files in read_plan.values() for path in files)
+    return signatures, dict(dirty)
+
+
+def run_clean(config, manifest, version, jobs=1, memory_budget_mb=None):
+    """
+    Clean the months whose raw input changed.
+    Returns (clean signatures, cleaned frames {'bank_YYYY-MM': DataFrame} built in this run).
+
+    Every month of the read plan has a signature. A month that failed to clean keeps
+    the signature of its last successful clean (None if it was never cleaned), so
+    later stages keep its previous output instead of deleting it.
+    """
+    cleaned_dir = config["paths"]["data_cleaned"]
+    fmt = storage_format(config)
+    recorded = manifest.stage("clean")
+
+    signatures, dirty_plan = plan_clean(config, manifest, version)
+    n_dirty = sum(len(months) for files in dirty_plan.values() for months in files.values())
+    print(f"clean: {n_dirty} of {len(signatures)} partitions out of date")
+
+    if memory_budget_mb is None:
+        memory_budget_mb = config["data_processing"].get("memory_budget_mb")
+
+    def mark_cleaned(bank, yearmonth):
+        key = partition_key(bank, yearmonth)
+        recorded[key] = signatures[key]
+        manifest.checkpoint()
+
+    engine = config["data_processing"].get("csv_engine", "pandas")
+    cleaned = {}
+    if not n_dirty:
+        pass
+    elif memory_budget_mb:
+        report_streaming_settings(jobs, engine)
+        for bank, files in dirty_plan.items():
+            for months in files.values():
+                for yearmonth in months:
+                    delete_partition(cleaned_dir, bank, yearmonth, fmt)
+        stream_clean_plan(dirty_plan, cleaned_dir, memory_budget_mb, fmt, on_cleaned=mark_cleaned,
+                          raise_errors=False)
+    else:
+        cleaned = flatten_partitions(clean_extracts(
+            read_planned_extracts(dirty_plan, engine=engine), cleaned_dir, fmt, jobs, on_cleaned=mark_cleaned,
+            raise_errors=False
+        ))
+
+    # Months no longer covered by any extract
+    for key in [key for key in recorded if key not in signatures]:
+        bank, yearmonth = parse_partition_key(key)
+        delete_partition(cleaned_dir, bank, yearmonth, fmt)
+        del recorded[key]
+
+    failed = [key for key, sig in signatures.items() if recorded.get(key) != sig]
+    if failed:
+        print(f"clean: {len(failed)} partitions failed; their previous output is kept")
+
+    manifest.save()
+    return {key: recorded.get(key) for key in signatures}, cleaned
+
+
+def recategorize_lookup_edit(config, keys, tokens, old_table, new_table, category_lookup, index):
+    """
+    Bring partitions categorized with old_table up to date with new_table: only rows
+    containing a changed keyword are categorized again, and only partitions where a
+    row changed category are returned. `index` provides each partition's descriptions
+    (at its build token in `tokens`); partitions missing from it are read and indexed.
+
+    Returns:
+        (recategorized frames {'bank_YYYY-MM': DataFrame}, changed transactions or None)
+    """
+    categorized_dir = config["paths"]["data_categorized"]
+    fmt = storage_format(config)
+
+    keywords = changed_keywords(old_table, new_table)
+    pattern = keyword_pattern(keywords)
+    recategorized, changes = {}, []
+    if not keys or pattern is None:
+        return recategorized, None
+    for key in keys:
+        bank, yearmonth = parse_partition_key(key)
+        df = None
+        descriptions = index.descriptions(key, tokens[key])
+        if descriptions is None:
+            df = read_partition(categorized_dir, bank, yearmonth, fmt)
+            index.record(key, tokens[key], df['description'])
+            descriptions = index.descriptions(key, tokens[key])
+        if not any(pattern.search(description) for description in descriptions):
+            continue
+        if df is None:
+            df = read_partition(categorized_dir, bank, yearmonth, fmt)
+        with profiler.partition("categorize", bank, yearmonth, rows_in=len(df)) as metrics:
+            df, partition_changes = recategorize_frame(df, pattern, category_lookup)
+            metrics.rows_out = len(df)
+        if len(partition_changes):
+            recategorized[key] = df
+            changes.append(partition_changes)
+
+    n_changed = sum(len(partition_changes) for partition_changes in changes)
+    print(
+        f"categorize: lookup edit changed {len(keywords)} keywords; "
+        f"{n_changed} transactions in {len(recategorized)} of {len(keys)} partitions changed category"
+    )
+    return recategorized, pd.concat(changes, ignore_index=True) if changes else None
+
+
+def run_categorize(config, manifest, version, clean_signatures, dfs=None):
+    """
+    Categorize the months whose cleaned partition or lookup changed, one bank at a time.
+    `dfs` are cleaned frames already in memory.
+
+    Months out of date only because the category lookup was edited since they were
+    built are updated with `recategorize_lookup_edit` instead, from the lookup
+    snapshot recorded in the manifest.
+
+    Returns (build tokens of the categorized partitions, categorized frames built in this run).
+    A build token changes only when its partition is rewritten.
+    """
+    cleaned_dir = config["paths"]["data_cleaned"]
+    categorized_dir = config["paths"]["data_categorized"]
+    fmt = storage_format(config)
+    recorded = manifest.stage("categorize")
+    tokens = manifest.stage("categorize_tokens")
+
+    lookup_hash = manifest.file_hash(config["lookup"]["category"])
+    # Months never cleaned successfully have nothing to categorize yet
+    signatures = {
+        key: signature(version, clean_sig, lookup_hash)
+        for key, clean_sig in clean_signatures.items() if clean_sig is not None
+    }
+    dirty = [
+        key for key, sig in sorted(signatures.items())
+        if recorded.get(key) != sig or not partition_exists(categorized_dir, *parse_partition_key(key), fmt)
+    ]
+    print(f"categorize: {len(dirty)} of {len(signatures)} partitions out of date")
+
+    dfs = dfs or {}
+    categorized = {}
+    lookup_table = load_category_lookup()
+    snapshot = manifest.snapshot("category_lookup")
+    index = DescriptionIndex(config["paths"].get("description_index"))
+    if dirty:
+        category_lookup = open_category_cache(config, lookup_table)
+
+        if snapshot is not None and snapshot["hash"] != lookup_hash:
+            lookup_edited = [
+                key for key in dirty
+                if key in tokens
+                and recorded.get(key) == signature(version, clean_signatures[key], snapshot["hash"])
+                and partition_exists(categorized_dir, *parse_partition_key(key), fmt)
+            ]
+            recategorized, changes = recategorize_lookup_edit(
+                config, lookup_edited, tokens, dict(snapshot["table"]), lookup_table, category_lookup, index
+            )
+            save_dataframes(recategorized, categorized_dir, fmt)
+            for key, df in recategorized.items():
+                tokens[key] = signatures[key]
+                index.record(key, tokens[key], df['description'])
+            for key in lookup_edited:
+                recorded[key] = signatures[key]
+            categorized.update(recategorized)
+            manifest.checkpoint()
+            if changes is not None:
+                print(changes.to_string(index=False, max_rows=REPORTED_CHANGES))
+            dirty = [key for key in dirty if recorded.get(key) != signatures[key]]
+
+        for bank, months in group_partitions(dict.fromkeys(dirty)).items():
+            bank_dfs = {}
+            for yearmonth in months:
+                key = partition_key(bank, yearmonth)
+                if key in dfs:
+                    bank_dfs[key] = dfs[key]
+                elif partition_exists(cleaned_dir, bank, yearmonth, fmt):
+                    bank_dfs[key] = read_partition(cleaned_dir, bank, yearmonth, fmt)
+                else:
+                    # Its clean failed after the partition was cleared; keep the categorized one
+                    print(f"categorize: no cleaned partition for {key}; keeping its previous output")
+            categorized_dfs = categorize_dataframes(bank_dfs, category_lookup)
+            save_dataframes(categorized_dfs, categorized_dir, fmt)
+            for key, df in categorized_dfs.items():
+                recorded[key] = signatures[key]
+                tokens[key] = signatures[key]
+                index.record(key, tokens[key], df['description'])
+            categorized.update(categorized_dfs)
+            manifest.checkpoint()
+        category_lookup.save()
+        category_lookup.report()
+
+    # Months no longer in the read plan; months that failed to clean are kept
+    for key in [key for key in recorded if key not in clean_signatures]:
+        delete_partition(categorized_dir, *parse_partition_key(key), fmt)
+        del recorded[key]
+    for key in [key for key in tokens if key not in recorded]:
+        del tokens[key]
+    # Partitions built before build tokens were recorded
+    for key in recorded:
+        tokens.setdefault(key, recorded[key])
+    index.forget(recorded)
+    index.save()
+
+    if snapshot is None or snapshot["hash"] != lookup_hash:
+        # As [category, keywords] pairs: the manifest is saved with sorted keys, and category order matters
+        manifest.record_snapshot("category_lookup", {"hash": lookup_hash, "table": list(lookup_table.items())})
+    manifest.save()
+    return {key: tokens[key] for key in signatures if key in tokens}, categorized
+
+
+def run_reconcile(config, manifest, version, categorize_tokens, dfs=None):
+    """
+    Re-reconcile the banks with any changed month or balance, one bank at a time.
+    `dfs` are categorized frames already in memory.
+    """
+    categorized_dir = config["paths"]["data_categorized"]
+    reconciled_dir = config["paths"]["data_reconciled"]
+    fmt = storage_format(config)
+    recorded = manifest.stage("reconcile")
+
+    # Each bank depends on its own entries of balances.json only
+    balances = load_json(config["lookup"]["balances"]) if os.path.exists(config["lookup"]["balances"]) else {}
+    bank_signatures = defaultdict(list)
+    for key, sig in sorted(categorize_tokens.items()):
+        bank, _ = parse_partition_key(key)
+        bank_signatures[bank].extend([key, sig])
+    signatures = {
+        bank: signature(version, json.dumps(balances.get(bank), sort_keys=True), *parts)
+        for bank, parts in bank_signatures.items()
+    }
+
+    dirty = sorted(
+        bank for bank, sig in signatures.items()
+        if recorded.get(bank) != sig or not reconciled_outputs(reconciled_dir, bank, fmt)
+    )
+    print(f"reconcile: {len(dirty)} of {len(signatures)} banks out of date")
+
+    dfs = dfs or {}
+    months_by_bank = group_partitions(dict.fromkeys(categorize_tokens))
+    for bank in dirty:
+        bank_dfs = {}
+        for yearmonth in months_by_bank[bank]:
+            key = partition_key(bank, yearmonth)
+            if key in dfs:
+                bank_dfs[yearmonth] = dfs[key]
+            elif partition_exists(categorized_dir, bank, yearmonth, fmt):
+                bank_dfs[yearmonth] = read_partition(categorized_dir, bank, yearmonth, fmt)
+        reconcile_data(config, banks=[bank], dfs={bank: bank_dfs})
+        recorded[bank] = signatures[bank]
+        manifest.checkpoint()
+
+    for bank in [bank for bank in recorded if bank not in signatures]:
+        remove_bank_data(config, bank)
+        del recorded[bank]
+
+    manifest.save()
+
+
+def run_incremental(config, jobs=1, memory_budget_mb=None):
+    manifest = Manifest.load(manifest_path(config))
+    versions = stage_versions(config)
+
+    try:
+        with profiler.stage("clean"):
+            clean_signatures, cleaned = run_clean(config, manifest, versions["clean"], jobs, memory_budget_mb)
+        with profiler.stage("categorize"):
+            categorize_tokens, categorized = run_categorize(
+                config, manifest, versions["categorize"], clean_signatures, dfs=cleaned
+            )
+        del cleaned
+        with profiler.stage("reconcile"):
+            run_reconcile(config, manifest, versions["reconcile"], categorize_tokens, dfs=categorized)
+    finally:
+        # Keep the progress of an interrupted run
+        manifest.save()
+
+
+if __name__ == "__main__":
+    from src.utils.config import load_config
+    config = load_config()
+    run_incremental(config)
@@ -9,14 +9,27 @@ reconcile mean to make sure that the balance is correct with real bank account.
 The lookup `my_balances.json` is used to input the balance data from the real bank.
 Every end of month, you can check your bank acount and add the value to the dictionary. 
 The function will add reconciliation points to make sure that your extracts match your real bank balance.
+
+Reconciled transactions are also written to the SQLite ledger store (`storage.ledger`),
+indexed for range, category and participant lookups, and to an Arrow snapshot
+(`storage.snapshot`) that the dashboards memory-map.
 """
 
 
 import os
-from src.processing.reconcile import reconcile_extracts, load_balance_dict
+from src.processing.reconcile import reconcile_extracts, load_balance_dict, remove_reconciled
+from src.utils.storage import storage_format
+from src.utils.ledger import LedgerStore, ledger_path
+from src.utils.snapshot import read_snapshot, snapshot_banks, snapshot_path, write_snapshot
 
 
-def reconcile_data(config):
+def reconcile_data(config, banks=None, dfs=None, persist=True):
+    """
+    Reconcile every bank, or only `banks`; the ledger and the snapshot keep
+    the other banks' previous data.
+    `dfs` ({bank: {YYYY-MM: DataFrame}}) are categorized frames handed over in
+    memory; with `persist=False` only the ledger and the snapshot are written.
+    """
     balances = load_balance_dict()
 
     input_dir = config["paths"]["data_categorized"]
@@ -24,7 +37,46 @@ def reconcile_data(config):
 
     os.makedirs(output_dir, exist_ok=True)
 
-    reconcile_extracts(balances, input_dir, output_dir)
+    reconciled = reconcile_extracts(
+        balances, input_dir, output_dir, fmt=storage_format(config),
+        banks=banks, dfs=dfs, persist=persist
+    )
+
+    db_path = ledger_path(config)
+    if db_path is not None:
+        ledger = LedgerStore(db_path)
+        for bank, bank_df in reconciled.items():
+            ledger.write_bank(bank, bank_df)
+        print(f"Saved ledger store: {db_path}")
+
+    arrow_path = snapshot_path(config)
+    if arrow_path is not None:
+        frames = dict(reconciled)
+        if banks is not None and os.path.exists(arrow_path):
+            for bank in snapshot_banks(arrow_path):
+                frames.setdefault(bank, read_snapshot(arrow_path, bank))
+        write_snapshot(frames, arrow_path)
+        print(f"Saved dashboard snapshot: {arrow_path}")
+
+
+def remove_bank_data(config, bank):
+    """
+    Remove a bank from every reconciled store: its reconciled output,
+    its rows of the ledger and its slice of the snapshot.
+    Used when no extract of the bank is left.
+    """
+    remove_reconciled(config["paths"]["data_reconciled"], bank, storage_format(config))
+
+    db_path = ledger_path(config)
+    if db_path is not None and os.path.exists(db_path):
+        LedgerStore(db_path).remove_bank(bank)
+
+    arrow_path = snapshot_path(config)
+    if arrow_path is not None and os.path.exists(arrow_path):
+        banks = snapshot_banks(arrow_path)
+        if bank in banks:
+            write_snapshot({b: read_snapshot(arrow_path, b) for b in banks if b != bank}, arrow_path)
+    print(f"Removed reconciled data of {bank}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,138 @@
+"""
+**Watch mode**
+
+input:  `data/00--raw` (and the category / balances lookups)
+output: `data/01--cleaned` .. `data/03--reconciled`, ledger and snapshot
+
+Polls the raw folder and the lookup JSONs, and runs the incremental pipeline
+whenever they change, so new statements reach the dashboards without a manual
+`run_pipeline.py`. Bursts of events (a copy of several extracts, a file still
+being written) are debounced: a run starts once nothing has changed for
+`debounce_s` seconds.
+
+Each run rebuilds only the affected (bank, month) partitions and banks (see
+`src.pipeline.incremental`). Results are published atomically: the snapshot
+is swapped in with a rename, the ledger is replaced per bank in a transaction
+and consolidated CSVs are renamed into place, so dashboards never read a
+half-written bank.
+"""
+
+import os
+import time
+
+from src.clean.sources import EXTRACT_SUFFIXES
+from src.pipeline.incremental import run_incremental
+from src.utils.profiling import profiler
+from src.logger import CategoryLogger
+
+logger = CategoryLogger("watch")
+
+# Archives are inspected by the clean stage; anything else (e.g. `.part` downloads) is ignored
+WATCHED_SUFFIXES = EXTRACT_SUFFIXES + ('.zip',)
+
+
+def watch_settings(config):
+    """Polling interval and debounce delay in seconds (`watch` section of config.yaml)."""
+    settings = config.get("watch", {})
+    return settings.get("poll_interval_s", 1.0), settings.get("debounce_s", 2.0)
+
+
+def scan(config, lookups=True):
+    """
+    Stat the raw extracts (and the lookups).
+
+    Returns:
+        {path: (size, mtime_ns)} of every watched file
+    """
+    state = {}
+    for root, dirs, files in os.walk(config["paths"]["data_raw"]):
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for filename in files:
+            if filename.startswith('.') or not filename.lower().endswith(WATCHED_SUFFIXES):
+                continue
+            path = os.path.join(root, filename)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:  # removed while scanning
+                continue
+            state[path] = (stat.st_size, stat.st_mtime_ns)
+
+    if lookups:
+        for path in (config["lookup"]["category"], config["lookup"]["balances"]):
+            if os.path.exists(path):
+                stat = os.stat(path)
+                state[path] = (stat.st_size, stat.st_mtime_ns)
+    return state
+
+
+def diff_states(before, after):
+    """Paths added, removed or modified between two scans."""
+    return sorted(
+        path for path in set(before) | set(after)
+        if before.get(path) != after.get(path)
+    )
+
+
+def wait_until_quiet(config, state, debounce_s, poll_interval_s, lookups=True):
+    """
+    Keep scanning until nothing has changed for `debounce_s` seconds.
+    Returns the settled state.
+    """
+    quiet_since = time.monotonic()
+    while time.monotonic() - quiet_since < debounce_s:
+        time.sleep(poll_interval_s)
+        current = scan(config, lookups)
+        if current != state:
+            state, quiet_since = current, time.monotonic()
+    return state
+
+
+def watch(config, jobs=1, memory_budget_mb=None, lookups=True,
+          poll_interval_s=None, debounce_s=None, max_runs=None):
+    """
+    Run the incremental pipeline once, then again after every settled change.
+
+    Args:
+        config: Project configuration
+        jobs: Worker processes of the clean stage
+        memory_budget_mb: Stream raw extracts within this budget
+        lookups: Also watch the category and balances lookups
+        poll_interval_s: Seconds between scans (default: config)
+        debounce_s: Quiet seconds required before a run (default: config)
+        max_runs: Stop after this many runs (default: watch until interrupted)
+    """
+    default_poll, default_debounce = watch_settings(config)
+    poll_interval_s = default_poll if poll_interval_s is None else poll_interval_s
+    debounce_s = default_debounce if debounce_s is None else debounce_s
+
+    state = scan(config, lookups)
+    runs = 0
+    while True:
+        profiler.reset()
+        started = time.monotonic()
+        try:
+            run_incremental(config, jobs=jobs, memory_budget_mb=memory_budget_mb)
+            logger.finish(f"Published in {time.monotonic() - started:.1f}s")
+        except Exception as e:
+            # Partitions that failed are not recorded in the manifest; the next change retries them
+            logger.error(f"Incremental run failed: {e}")
+        runs += 1
+        if max_runs is not None and runs >= max_runs:
+            return
+
+        logger.info(f"Watching {config['paths']['data_raw']} (poll {poll_interval_s}s, debounce {debounce_s}s)")
+        while True:
+            time.sleep(poll_interval_s)
+            current = scan(config, lookups)
+            if current != state:
+                break
+        current = wait_until_quiet(config, current, debounce_s, poll_interval_s, lookups)
+        changed = diff_states(state, current)
+        state = current
+        logger.start(f"{len(changed)} file(s) changed: {', '.join(os.path.basename(p) for p in changed)}")
+
+
+if __name__ == "__main__":
+    from src.utils.config import load_config
+    config = load_config()
+    watch(config)
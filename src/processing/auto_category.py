@@ -1,6 +1,11 @@
 import os
 
+from src.processing.category_cache import CategoryCache, DEFAULT_MAX_ENTRIES
+from src.processing.keyword_matcher import KeywordMatcher
 from src.utils.load_data import load_json, frame_csv
+from src.utils.schema import apply_schema
+from src.utils.storage import parse_partition_key
+from src.utils.profiling import profiler
 from src.utils.config import load_config
 config = load_config()
 
@@ -14,14 +19,45 @@ def load_categories():
 def load_category_lookup():
     return load_json(CATEGORY_LOOKUP)
 
+def compile_category_lookup(lookup_table):
+    """
+    Compile a category lookup table once, to categorize many descriptions.
+    A compiled table (or a CategoryCache) is returned as is.
+    """
+    if isinstance(lookup_table, (KeywordMatcher, CategoryCache)):
+        return lookup_table
+    return KeywordMatcher(lookup_table, default=DEFAULT_CATEGORY)
+
+def open_category_cache(config, lookup_table=None):
+    """
+    Persistent description -> category cache of a lookup table (the category lookup by default),
+    stored at `paths.category_cache`; without that path the cache lives for this run only.
+    Call `save()` once done.
+    """
+    if lookup_table is None:
+        lookup_table = load_category_lookup()
+    return CategoryCache(
+        lookup_table,
+        default=DEFAULT_CATEGORY,
+        path=config["paths"].get("category_cache"),
+        max_entries=config["data_processing"].get("category_cache_entries", DEFAULT_MAX_ENTRIES),
+    )
+
+def categorize_descriptions(descriptions, lookup_table):
+    """Category of each description in a column; each distinct description is matched once."""
+    matcher = compile_category_lookup(lookup_table)
+    if isinstance(matcher, CategoryCache):
+        return matcher.categorize(descriptions)
+    categories = {description: matcher.match(description) for description in descriptions.unique()}
+    return descriptions.map(categories)
+
 def desc2category(description, lookup_table):
-    for cat, keywords in lookup_table.items():
-        filtered_keywords = [kw for kw in keywords if kw]
-        if not filtered_keywords:
-            continue
-        if any(keyword.lower() in description.lower() for keyword in filtered_keywords):
-            return cat
-    return DEFAULT_CATEGORY
+    """
+    First category (in lookup order) with a keyword in description, else DEFAULT_CATEGORY.
+    A plain lookup table is compiled on every call; to categorize many descriptions,
+    pass the result of `compile_category_lookup` instead.
+    """
+    return compile_category_lookup(lookup_table).match(description)
 
 def desc2type(description, lookup_table):
     for type, keywords in lookup_table.items():
@@ -35,17 +71,19 @@ def desc2type(description, lookup_table):
 def categorize_dataframes(dataframes_dict, lookup_table, show_stats=True):
     categorized_dfs = {}
     stats = {}
-    
+    matcher = compile_category_lookup(lookup_table)
+
     for filename, df in dataframes_dict.items():
-        categorized_df = df.copy()
-        categorized_df['category'] = categorized_df['description'].apply(
-            lambda x: desc2category(x, lookup_table)
-        )
-        
-        default_count = (categorized_df['category'] == DEFAULT_CATEGORY).sum()
-        total_count = categorized_df.shape[0]
-        
-        categorized_dfs[filename] = categorized_df
+        bank, year_month = parse_partition_key(filename)
+        with profiler.partition("categorize", bank, year_month, rows_in=len(df)) as metrics:
+            categorized_df = df.copy()
+            categorized_df['category'] = categorize_descriptions(categorized_df['description'], matcher)
+
+            default_count = (categorized_df['category'] == DEFAULT_CATEGORY).sum()
+            total_count = categorized_df.shape[0]
+
+            categorized_dfs[filename] = apply_schema(categorized_df)
+            metrics.rows_out = total_count
         stats[filename] = {
             'default_count': default_count,
             'total_count': total_count
@@ -63,6 +101,7 @@ def categorize_dataframes(dataframes_dict, lookup_table, show_stats=True):
 
 def categorize_from_lookup(input_dir, output_dir, lookup_table):
     os.makedirs(output_dir, exist_ok=True)
+    matcher = compile_category_lookup(lookup_table)
 
     print("="*50)
     print(f"csv file            : proportion of rows categorized as '{DEFAULT_CATEGORY}")
@@ -72,7 +111,7 @@ def categorize_from_lookup(input_dir, output_dir, lookup_table):
             file_path = os.path.join(input_dir, csv_file)
             df = frame_csv(file_path)
 
-            df['category'] = df['description'].apply(lambda x: desc2category(x, lookup_table))
+            df['category'] = categorize_descriptions(df['description'], matcher)
             default_count = (df['category'] == DEFAULT_CATEGORY).sum()
             total_count = df.shape[0]
 
@@ -0,0 +1,135 @@
+"""
+Module for the persistent description -> category cache.
+
+Bank descriptions repeat month after month (the same merchants, the same Pix
+counterparts), so most rows can be categorized with a dictionary hit instead
+of a keyword scan. `CategoryCache` memoizes the category of each lowercased
+description (matching ignores case), keeps at most `max_entries` of them
+(least recently used first out) and is saved as JSON between runs.
+
+Every entry depends on the lookup table, so the cache records a fingerprint
+of the table, the default category and the matcher code; a cache saved with
+another fingerprint is discarded on load.
+"""
+import json
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from src.processing.keyword_matcher import KeywordMatcher
+from src.utils.manifest import code_version, signature
+
+CACHE_VERSION = 1
+DEFAULT_MAX_ENTRIES = 100_000
+
+
+def lookup_fingerprint(lookup_table: Dict[str, List[str]], default: Optional[str]) -> str:
+    """Fingerprint of the categories a lookup table gives; category order matters, so it is kept."""
+    return signature(
+        json.dumps(lookup_table, ensure_ascii=False),
+        str(default),
+        code_version(['processing/keyword_matcher.py']),
+    )
+
+
+class CategoryCache:
+    """LRU memo of a lookup table's category for each description, persisted as JSON."""
+
+    def __init__(self, lookup_table: Dict[str, List[str]], default: Optional[str] = None,
+                 path: Optional[str] = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Args:
+            lookup_table: Categories and their keywords, in priority order
+            default: Category of descriptions without any keyword
+            path: JSON file the cache is loaded from and saved to; None keeps it in memory
+            max_entries: Descriptions kept; the least recently used are evicted
+        """
+        self.matcher = KeywordMatcher(lookup_table, default)
+        self.fingerprint = lookup_fingerprint(lookup_table, default)
+        self.path = path
+        self.max_entries = max_entries
+        self.entries: 'OrderedDict[str, str]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.rows = 0
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable category cache {self.path}: {str(e)}")
+            return
+        if data.get('version') != CACHE_VERSION or data.get('fingerprint') != self.fingerprint:
+            print("Category lookup changed: category cache cleared")
+            self._dirty = True
+            return
+        # Saved least recently used first
+        self.entries = OrderedDict(data.get('entries', [])[-self.max_entries:])
+
+    def match(self, description: str) -> str:
+        """Category of description, from the cache when it is there."""
+        key = description.lower()
+        category = self.entries.get(key)
+        if category is not None:
+            self.hits += 1
+            # Recency alone is not worth a rewrite; it is saved with the next new entry
+            self.entries.move_to_end(key)
+            return category
+        self.misses += 1
+        category = self.matcher.match(key)
+        self.entries[key] = category
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        self._dirty = True
+        return category
+
+    def categorize(self, descriptions: pd.Series) -> pd.Series:
+        """Category of each description in a column; each distinct description is looked up once."""
+        self.rows += len(descriptions)
+        categories = {description: self.match(description) for description in descriptions.unique()}
+        return descriptions.map(categories)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Lookups of distinct descriptions (hits, misses) and rows categorized.
+        `row_hit_rate` is the share of rows categorized without a keyword scan.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'rows': self.rows,
+            'row_hit_rate': max(self.rows - self.misses, 0) / self.rows if self.rows else 0.0,
+            'entries': len(self.entries),
+        }
+
+    def report(self) -> None:
+        stats = self.stats()
+        rows = f", {stats['row_hit_rate']:.1%} of {stats['rows']} rows without a keyword scan" if stats['rows'] else ""
+        print(
+            f"Category cache: {stats['hit_rate']:.1%} of {stats['hits'] + stats['misses']} lookups hit"
+            f"{rows} ({stats['entries']} entries)"
+        )
+
+    def save(self) -> None:
+        """Write the cache atomically, if it has a path and gained entries or was reset."""
+        if not self.path or not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': CACHE_VERSION,
+                'fingerprint': self.fingerprint,
+                'entries': list(self.entries.items()),
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
@@ -0,0 +1,82 @@
+"""
+Module for matching descriptions against the keywords of a lookup table.
+
+A lookup table maps each category to its keywords; a description belongs to
+the first category (in table order) with a keyword contained in it, ignoring
+case. Checking every keyword of every category costs
+O(rows x keywords x length), so `KeywordMatcher` compiles all keywords once
+into an Aho-Corasick automaton and finds, in a single pass over each
+description, the lowest category index among the keywords it contains.
+"""
+from typing import Dict, List, Optional
+
+# Category index of automaton states where no keyword ends
+NO_MATCH = float('inf')
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over the keywords of a {category: [keyword, ...]} table."""
+
+    def __init__(self, lookup_table: Dict[str, List[str]], default: Optional[str] = None):
+        """
+        Args:
+            lookup_table: Categories and their keywords, in priority order; empty keywords are ignored
+            default: Returned by `match` when no keyword occurs in the description
+        """
+        self.categories = list(lookup_table.keys())
+        self.default = default
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Lowest category index of the keywords ending at each state, through its fail links too
+        self._best: List[float] = [NO_MATCH]
+        for index, keywords in enumerate(lookup_table.values()):
+            for keyword in keywords:
+                if keyword:
+                    self._add(keyword.lower(), index)
+        self._link()
+
+    def _add(self, keyword: str, index: int) -> None:
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._best.append(NO_MATCH)
+            state = next_state
+        self._best[state] = min(self._best[state], index)
+
+    def _link(self) -> None:
+        """Set fail links breadth-first, merging each state's best index with its fail state's."""
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[next_state] = fail
+                self._best[next_state] = min(self._best[next_state], self._best[fail])
+                queue.append(next_state)
+
+    def match_index(self, description: str) -> Optional[int]:
+        """Index of the first category with a keyword in description, or None."""
+        goto, fail, best = self._goto, self._fail, self._best
+        state = 0
+        found = NO_MATCH
+        for char in description.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if best[state] < found:
+                found = best[state]
+                if found == 0:
+                    break
+        return None if found == NO_MATCH else int(found)
+
+    def match(self, description: str) -> Optional[str]:
+        """First category with a keyword in description, or the default."""
+        index = self.match_index(description)
+        return self.default if index is None else self.categories[index]
@@ -1,6 +1,3 @@
-from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.naive_bayes import MultinomialNB
-from sklearn.metrics import accuracy_score
 import pickle
 
 
@@ -20,6 +17,9 @@ import pickle
 #         return X, y
 
 #     def train(self):
+#         from sklearn.feature_extraction.text import CountVectorizer
+#         from sklearn.naive_bayes import MultinomialNB
+#         from sklearn.metrics import accuracy_score
 #         X, y = self.build_X_y()
 #         non_default_indices = y != DEFAULT_CATEGORY
 #         X_train, y_train = X[non_default_indices], y[non_default_indices]
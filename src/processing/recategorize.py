@@ -0,0 +1,156 @@
+"""
+Module for re-categorizing only what a lookup edit changes.
+
+A description gets the category of the first lookup category (in table
+order) with a keyword it contains. Its category can only change when one of
+those keywords changed: added, removed, now first found under another
+category, or under a category whose rank among the categories of both tables
+moved. `changed_keywords` diffs two lookup tables into those keywords, so
+descriptions without any of them keep their category.
+
+`DescriptionIndex` keeps the distinct descriptions of each categorized
+partition, persisted as JSON. Matching the changed keywords against it finds
+the partitions (and descriptions) they occur in without reading any
+partition; only the matching rows of those partitions are categorized again
+(`recategorize_frame`).
+"""
+import json
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Pattern, Set, Tuple
+
+import pandas as pd
+
+from src.utils.schema import column_dtype
+
+INDEX_VERSION = 1
+# Columns shown for each transaction whose category changed
+CHANGE_COLUMNS = ['date', 'bank', 'description', 'income', 'outcome']
+
+
+def first_categories(lookup_table: Dict[str, List[str]]) -> Dict[str, str]:
+    """First category (in table order) of each lowercased keyword."""
+    categories = {}
+    for category, keywords in lookup_table.items():
+        for keyword in keywords:
+            if keyword:
+                categories.setdefault(keyword.lower(), category)
+    return categories
+
+
+def changed_keywords(old_table: Dict[str, List[str]], new_table: Dict[str, List[str]]) -> Set[str]:
+    """
+    Lowercased keywords whose matches may change category between two lookup tables.
+
+    Args:
+        old_table: Lookup the current categories were computed with
+        new_table: Edited lookup
+
+    Returns:
+        Keywords added, removed or moved to another category, and the keywords of
+        categories whose order relative to the other shared categories changed
+    """
+    old_first = first_categories(old_table)
+    new_first = first_categories(new_table)
+    shared = [category for category in old_table if category in new_table]
+    new_rank = {category: rank for rank, category in enumerate(c for c in new_table if c in old_table)}
+    moved = {category for rank, category in enumerate(shared) if new_rank[category] != rank}
+
+    changed = {kw for kw in old_first.keys() | new_first.keys() if old_first.get(kw) != new_first.get(kw)}
+    changed.update(kw for kw, category in old_first.items() if category in moved)
+    changed.update(kw for kw, category in new_first.items() if category in moved)
+    return changed
+
+
+def keyword_pattern(keywords: Iterable[str]) -> Optional[Pattern]:
+    """Regex matching lowercased text that contains any of the keywords, or None without keywords."""
+    keywords = sorted(set(keywords), key=len, reverse=True)
+    if not keywords:
+        return None
+    return re.compile('|'.join(re.escape(keyword) for keyword in keywords))
+
+
+def recategorize_frame(df: pd.DataFrame, pattern: Pattern, matcher) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Categorize again the rows of a categorized frame whose description matches pattern.
+
+    Args:
+        df: Categorized partition
+        pattern: From `keyword_pattern` of the changed keywords
+        matcher: Compiled lookup (KeywordMatcher or CategoryCache) with `match(description)`
+
+    Returns:
+        (frame with the new categories, changed transactions with `old_category` and `new_category`)
+    """
+    descriptions = df['description']
+    new_categories = {
+        description: matcher.match(description)
+        for description in descriptions.dropna().unique() if pattern.search(description.lower())
+    }
+    affected = descriptions.isin(list(new_categories))
+    recategorized = descriptions[affected].map(new_categories)
+    old_categories = df['category'].astype(object)
+    changed = recategorized.index[recategorized != old_categories[affected]]
+
+    columns = [column for column in CHANGE_COLUMNS if column in df.columns]
+    changes = df.loc[changed, columns].copy()
+    changes['old_category'] = old_categories[changed]
+    changes['new_category'] = recategorized[changed]
+    if len(changed):
+        old_categories[changed] = recategorized[changed]
+        df = df.copy()
+        df['category'] = old_categories.astype(column_dtype('category'))
+    return df, changes
+
+
+class DescriptionIndex:
+    """Distinct lowercased descriptions of each categorized partition, tagged with the partition's build token."""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: JSON file the index is loaded from and saved to; None keeps it in memory
+        """
+        self.path = path
+        self.partitions: Dict[str, dict] = {}
+        self._dirty = False
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable description index {path}: {str(e)}")
+                return
+            if data.get('version') == INDEX_VERSION:
+                self.partitions = data.get('partitions', {})
+
+    def descriptions(self, key: str, token: str) -> Optional[List[str]]:
+        """Descriptions of a partition, or None if it was not indexed at this token."""
+        entry = self.partitions.get(key)
+        return entry['descriptions'] if entry and entry['token'] == token else None
+
+    def record(self, key: str, token: str, descriptions: pd.Series) -> None:
+        self.partitions[key] = {
+            'token': token,
+            'descriptions': sorted(descriptions.dropna().str.lower().unique()),
+        }
+        self._dirty = True
+
+    def forget(self, keep: Iterable[str]) -> None:
+        """Drop partitions that no longer exist."""
+        keep = set(keep)
+        stale = [key for key in self.partitions if key not in keep]
+        for key in stale:
+            del self.partitions[key]
+        self._dirty = self._dirty or bool(stale)
+
+    def save(self) -> None:
+        """Write the index atomically, if it has a path and changed."""
+        if not self.path or not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'partitions': self.partitions}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
@@ -1,8 +1,12 @@
 import os
 import json
+import shutil
+from glob import glob
 import pandas as pd
-from src.utils.load_data import frame_csv
 from src.utils.load_data import get_bank_files
+from src.utils.schema import apply_schema
+from src.utils.storage import CSV, PARQUET, read_partition, write_partition
+from src.utils.profiling import profiler
 
 from src.utils.config import load_config
 config = load_config()
@@ -57,14 +61,42 @@ def get_date_range_str(dates):
     return f"{sorted_dates[0]}_{sorted_dates[-1]}"
 
 
-def reconcile_extracts(balances, input_dir, output_dir):
+def reconciled_outputs(output_dir, bank, fmt=CSV):
+    """Paths of a bank's reconciled output, whatever months it covers."""
+    if fmt == PARQUET:
+        return glob(os.path.join(output_dir, f"bank={bank}"))
+    return glob(os.path.join(output_dir, f"{bank}_*.csv"))
+
+
+def remove_reconciled(output_dir, bank, fmt=CSV):
+    """Remove a bank's previous reconciled output."""
+    for path in reconciled_outputs(output_dir, bank, fmt):
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+
+
+def reconcile_extracts(balances, input_dir, output_dir, fmt=CSV, banks=None, dfs=None, persist=True):
     """
     Main reconciliation function.
     Processes each bank's extracts chronologically, adding initial balance
     and reconciliation entries as needed.
+    CSV output is one consolidated file per bank; parquet output keeps
+    the (bank, year-month) partitions.
+    `banks` restricts the run to some banks; their previous output is replaced.
+    `dfs` ({bank: {YYYY-MM: DataFrame}}) are categorized frames used instead of
+    reading input_dir; with `persist=False` nothing is written to output_dir.
+    Returns the consolidated reconciled DataFrame of each bank.
     """
     os.makedirs(output_dir, exist_ok=True)
-    bank_files = get_bank_files(input_dir)
+    if dfs is None:
+        bank_files = get_bank_files(input_dir, fmt)
+    else:
+        bank_files = {bank: sorted(months) for bank, months in dfs.items() if months}
+    if banks is not None:
+        bank_files = {bank: months for bank, months in bank_files.items() if bank in banks}
+    reconciled = {}
     
     for bank in bank_files:
         print(f"\nProcessing bank: {bank}")
@@ -77,57 +109,77 @@ def reconcile_extracts(balances, input_dir, output_dir):
         monthly_dfs = []
         
         for i, year_month in enumerate(bank_files[bank]):
-            input_path = os.path.join(input_dir, f"{bank}_{year_month}.csv")
-            output_path = os.path.join(output_dir, f"{bank}_{year_month}.csv")
-            
             print(f"Processing {year_month}")
-            df = frame_csv(input_path)
+            if dfs is None:
+                df = read_partition(input_dir, bank, year_month, fmt)
+            else:
+                df = dfs[bank][year_month].copy()
+
+            with profiler.partition("reconcile", bank, year_month, rows_in=len(df)) as metrics:
+                # For first month, add initial balance entry
+                if i == 0:
+                    initial_entry = create_adjustment_entry(
+                        date=df.iloc[0]['date'],
+                        bank=bank,
+                        current_balance=0.0,  # Starting from zero
+                        target_balance=initial_balance,
+                        is_initial=True
+                    )
+                    df = pd.concat([initial_entry, df], ignore_index=True)
             
-            # For first month, add initial balance entry
-            if i == 0:
-                initial_entry = create_adjustment_entry(
-                    date=df.iloc[0]['date'],
+                # Calculate running balances
+                df = process_monthly_extract(df, previous_balance)
+                current_balance = df['balance'].iloc[-1]
+            
+                # Add reconciliation entry (always)
+                target_balance = bank_balances.get(year_month)
+                reconciliation = create_adjustment_entry(
+                    date=df.iloc[-1]['date'],
                     bank=bank,
-                    current_balance=0.0,  # Starting from zero
-                    target_balance=initial_balance,
-                    is_initial=True
+                    current_balance=current_balance,
+                    target_balance=target_balance,
+                    is_initial=False
                 )
-                df = pd.concat([initial_entry, df], ignore_index=True)
-            
-            # Calculate running balances
-            df = process_monthly_extract(df, previous_balance)
-            current_balance = df['balance'].iloc[-1]
             
-            # Add reconciliation entry (always)
-            target_balance = bank_balances.get(year_month)
-            reconciliation = create_adjustment_entry(
-                date=df.iloc[-1]['date'],
-                bank=bank,
-                current_balance=current_balance,
-                target_balance=target_balance,
-                is_initial=False
-            )
-            
-            # Add reconciliation entry and update balances
-            df = pd.concat([df, reconciliation], ignore_index=True)
+                # Add reconciliation entry and update balances
+                df = pd.concat([df, reconciliation], ignore_index=True)
                        
-            if target_balance is not None:
-                previous_balance = target_balance
-                print(f"Reconciled to target balance: {target_balance:.2f}")
-            else:
-                previous_balance = current_balance
-                print(f"No target balance available. Maintained at: {current_balance:.2f}")
-
-            monthly_dfs.append(df)
-
-        bank_df = pd.concat(monthly_dfs, ignore_index=True)
+                if target_balance is not None:
+                    previous_balance = target_balance
+                    print(f"Reconciled to target balance: {target_balance:.2f}")
+                else:
+                    previous_balance = current_balance
+                    print(f"No target balance available. Maintained at: {current_balance:.2f}")
+
+                metrics.rows_out = len(df)
+                monthly_dfs.append(df)
+
+        bank_df = apply_schema(pd.concat(monthly_dfs, ignore_index=True))
+        reconciled[bank] = bank_df
+        if not persist:
+            continue
+
+        if fmt != CSV:
+            remove_reconciled(output_dir, bank, fmt)
+            for year_month, df in zip(bank_files[bank], monthly_dfs):
+                write_partition(apply_schema(df), output_dir, bank, year_month, fmt)
+            print(f"Saved {len(monthly_dfs)} partitions for {bank} in {output_dir}")
+            continue
 
         date_range = get_date_range_str(bank_files[bank])
         output_path = os.path.join(output_dir, f"{bank}_{date_range}.csv")
 
-        bank_df.to_csv(output_path, index=False)
+        # Swap the new file in before dropping the old one, so readers always find the bank
+        tmp_path = f"{output_path}.tmp"
+        bank_df.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, output_path)
+        for path in reconciled_outputs(output_dir, bank, fmt):
+            if path != output_path:
+                os.remove(path)
         print(f"Saved consolidated file: {output_path}")
 
+    return reconciled
+
 
 # ---------
 
@@ -0,0 +1,208 @@
+"""
+Pipeline benchmark.
+
+Generates synthetic raw extracts (see `toy_dataset`) at several scales and
+times `clean_data`, `categorize_data` and `reconcile_data` on them, without
+downloading. Each scale runs in its own workspace laid out like the project
+(`config.yaml`, `data/00--raw`, `data/lookup`), so the stages run unchanged.
+
+Results are stored in `logs/benchmarks/benchmark_<timestamp>.json`; pass
+`--compare` to check them against an earlier result file.
+
+Run with:
+    python -m src.tests.benchmark_pipeline --scales 10000 100000 1000000
+    python -m src.tests.benchmark_pipeline --compare logs/benchmarks/benchmark_<timestamp>.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+
+import yaml
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+STAGES = ["clean", "categorize", "reconcile"]
+BANKS = ["nubank", "inter"]
+
+
+def setup_workspace(workspace, n_transactions, months, seed):
+    """Write config, lookups and raw extracts for one scale."""
+    from src.tests.toy_dataset import category_lookup, write_raw_extracts
+
+    with open(os.path.join(REPO_ROOT, "config.yaml"), "r") as f:
+        config = yaml.safe_load(f)
+    config["lookup"] = {
+        "type": "./data/lookup/type_lookup.json",
+        "category": "./data/lookup/category_lookup.json",
+        "balances": "./data/lookup/balances.json",
+    }
+    config["paths"]["logs"] = "./logs/"
+    # Every repeat categorizes from scratch instead of hitting the previous run's cache
+    config["paths"]["category_cache"] = None
+    with open(os.path.join(workspace, "config.yaml"), "w") as f:
+        yaml.safe_dump(config, f, sort_keys=False)
+
+    lookup_dir = os.path.join(workspace, "data", "lookup")
+    os.makedirs(lookup_dir, exist_ok=True)
+    with open(os.path.join(lookup_dir, "category_lookup.json"), "w") as f:
+        json.dump(category_lookup(), f, indent=4)
+    with open(os.path.join(lookup_dir, "balances.json"), "w") as f:
+        json.dump({bank: {"initial": 0.0} for bank in BANKS}, f, indent=4)
+    with open(os.path.join(lookup_dir, "type_lookup.json"), "w") as f:
+        json.dump({}, f)
+
+    per_month = max(n_transactions // (months * len(BANKS)), 1)
+    raw_dir = os.path.join(workspace, config["paths"]["data_raw"])
+    for i, bank in enumerate(BANKS):
+        write_raw_extracts(raw_dir, bank, datetime(2020, 1, 1), months, per_month, seed=seed + i, months_per_file=3)
+    return config
+
+
+def run_stages(config, jobs):
+    """Run clean → categorize → reconcile with in-memory hand-off; returns stage metrics."""
+    from src.pipeline.clean import clean_data
+    from src.pipeline.categorize import categorize_data
+    from src.pipeline.reconcile import reconcile_data
+    from src.utils.profiling import profiler
+    from src.utils.storage import flatten_partitions, group_partitions
+
+    profiler.reset()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        with profiler.stage("clean"):
+            cleaned = clean_data(config, jobs=jobs)
+        with profiler.stage("categorize"):
+            categorized = categorize_data(config, dfs=flatten_partitions(cleaned))
+        with profiler.stage("reconcile"):
+            reconcile_data(config, dfs=group_partitions(categorized))
+
+    results = {}
+    for metrics in profiler.stages:
+        results[metrics.stage] = {
+            "wall_s": metrics.wall_s,
+            "cpu_s": metrics.cpu_s,
+            "rows_in": metrics.rows_in,
+            "rows_out": metrics.rows_out,
+            "rows_per_s": metrics.rows_per_s,
+            "peak_rss_mb": metrics.peak_rss_mb,
+        }
+    return results
+
+
+def benchmark_scale(n_transactions, months, seed, repeat, jobs, keep_dir=None):
+    """Benchmark one scale; the best (lowest wall time) of `repeat` runs is kept per stage."""
+    workspace = keep_dir or tempfile.mkdtemp(prefix=f"finance-bench-{n_transactions}-")
+    os.makedirs(workspace, exist_ok=True)
+    cwd = os.getcwd()
+    try:
+        config = setup_workspace(workspace, n_transactions, months, seed)
+        # Stage modules read config.yaml and lookup paths relative to the working directory
+        os.chdir(workspace)
+        best = {}
+        for _ in range(repeat):
+            for stage, metrics in run_stages(config, jobs).items():
+                if stage not in best or metrics["wall_s"] < best[stage]["wall_s"]:
+                    best[stage] = metrics
+        return best
+    finally:
+        os.chdir(cwd)
+        if keep_dir is None:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline, threshold):
+    """
+    Print the change of every stage metric against a baseline result.
+    Returns the list of (scale, stage, ratio) whose wall time regressed beyond threshold.
+    """
+    regressions = []
+    print(f"\n{'scale':>10} {'stage':<11} {'baseline s':>11} {'current s':>10} {'change':>8}")
+    for scale, stages in current["scales"].items():
+        for stage, metrics in stages.items():
+            previous = baseline.get("scales", {}).get(scale, {}).get(stage)
+            if not previous:
+                continue
+            ratio = metrics["wall_s"] / previous["wall_s"] if previous["wall_s"] else float("inf")
+            flag = "  REGRESSION" if ratio > 1 + threshold else ""
+            print(f"{scale:>10} {stage:<11} {previous['wall_s']:>11.3f} {metrics['wall_s']:>10.3f} {ratio - 1:>+8.1%}{flag}")
+            if flag:
+                regressions.append((scale, stage, ratio))
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline stages on synthetic extracts.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="number of transactions of each run")
+    parser.add_argument("--months", type=int, default=24, help="months of history")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic data")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per scale; the fastest is kept")
+    parser.add_argument("--jobs", type=int, default=1, help="worker processes of the clean stage")
+    parser.add_argument("--output-dir", default=os.path.join(REPO_ROOT, "logs", "benchmarks"),
+                        help="folder of the result files")
+    parser.add_argument("--compare", default=None, help="earlier result file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative wall-time increase reported as a regression")
+    parser.add_argument("--keep-workspace", default=None,
+                        help="generate the data into this folder and keep it (single scale)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    sys.path.insert(0, REPO_ROOT)
+    os.chdir(REPO_ROOT)
+
+    import numpy as np
+    import pandas as pd
+
+    result = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "months": args.months,
+        "seed": args.seed,
+        "jobs": args.jobs,
+        "scales": {},
+    }
+    for n_transactions in args.scales:
+        print(f"Benchmarking {n_transactions:,} transactions...")
+        stages = benchmark_scale(n_transactions, args.months, args.seed, args.repeat, args.jobs, args.keep_workspace)
+        result["scales"][str(n_transactions)] = stages
+        for stage in STAGES:
+            metrics = stages[stage]
+            print(f"  {stage:<11} {metrics['wall_s']:>8.3f}s  {metrics['rows_per_s']:>12,.0f} rows/s  "
+                  f"peak RSS {metrics['peak_rss_mb']:,.0f} MB")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    path = os.path.join(args.output_dir, f"benchmark_{datetime.now():%Y%m%d-%H%M%S}.json")
+    with open(path, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"Results written to {path}")
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        regressions = compare(result, baseline, args.threshold)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Import-time budget check.
+
+Imports each entry point in a fresh interpreter with `python -X importtime`,
+after preloading the third-party libraries it legitimately needs (pandas,
+bokeh, ...). What remains is the cost of this project's own modules and of
+anything they pull in beyond those libraries, which must stay within budget.
+Optional heavy dependencies (scikit-learn, gdown, python-dotenv) must not be
+imported at all.
+
+Exits with status 1 when a budget is exceeded or a deferred dependency is imported.
+
+`test_import_time.py` runs these checks under pytest; from the command line:
+    python -m src.tests.check_import_time
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PRELOADED = [
+    "numpy", "pandas", "pyarrow", "yaml",
+    "bokeh.io", "bokeh.layouts", "bokeh.models", "bokeh.palettes", "bokeh.plotting", "bokeh.transform",
+]
+
+# Milliseconds allowed on top of the preloaded libraries
+IMPORT_BUDGETS_MS = {
+    "run_pipeline": 150,
+    "src.utils.load_data": 50,
+    "src.dashboard.outflow_dash": 50,
+    "src.dashboard.cashflow_dash": 50,
+}
+
+DEFERRED = ("sklearn", "gdown", "dotenv")
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def measure(module):
+    """
+    Import `module` after the preloaded libraries in a fresh interpreter.
+    Returns (cumulative import time of the module in ms, names of every imported module).
+    """
+    code = f"import {', '.join(PRELOADED)}; import {module}"
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+
+    cumulative_us, imported = 0, []
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        imported.append(match.group(4))
+        if match.group(4) == module and not match.group(3).strip(" "):
+            cumulative_us = int(match.group(2))
+    return cumulative_us / 1000, imported
+
+
+def check(module, budget_ms, runs):
+    """Median import time over `runs` runs; returns a list of failure messages."""
+    times, imported = [], []
+    for _ in range(runs):
+        elapsed_ms, imported = measure(module)
+        times.append(elapsed_ms)
+    elapsed_ms = statistics.median(times)
+
+    failures = []
+    deferred = sorted({name for name in imported if name.split(".")[0] in DEFERRED})
+    if deferred:
+        failures.append(f"{module} imports deferred dependencies: {', '.join(deferred)}")
+    if elapsed_ms > budget_ms:
+        failures.append(f"{module} takes {elapsed_ms:.0f} ms to import (budget {budget_ms:.0f} ms)")
+
+    status = "FAIL" if failures else "ok"
+    print(f"{module:<32} {elapsed_ms:>7.0f} ms  (budget {budget_ms:>5.0f} ms)  {status}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the import time of the entry points.")
+    parser.add_argument("--runs", type=int, default=3, help="imports per module; the median is compared")
+    parser.add_argument("--budget-scale", type=float, default=1.0,
+                        help="multiply every budget (e.g. 2 on slow CI machines)")
+    args = parser.parse_args()
+
+    failures = []
+    for module, budget_ms in IMPORT_BUDGETS_MS.items():
+        failures.extend(check(module, budget_ms * args.budget_scale, args.runs))
+
+    for failure in failures:
+        print(failure)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Local stand-in for the Drive extracts folder.
+
+Serves a folder over HTTP in the layout read by `HttpFolderSource`:
+`/index.json` lists the files and `/files/<id>` serves each one. A per-request
+delay and a bandwidth cap make downloads slow enough to measure how well the
+streaming pipeline overlaps them with compute.
+
+Run with:
+    python -m src.tests.fake_drive data/00--raw --delay 0.5 --bandwidth-kbps 200
+then set `download.source: "http"` and `download.location: "http://127.0.0.1:8765"`.
+"""
+import argparse
+import json
+import os
+import threading
+import time
+import urllib.parse
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHUNK_SIZE = 16 * 1024
+
+
+def folder_index(folder):
+    """index.json entries of every file under folder; ids are relative paths."""
+    entries = []
+    for root, _, filenames in os.walk(folder):
+        for filename in sorted(filenames):
+            path = os.path.join(root, filename)
+            rel_path = os.path.relpath(path, folder)
+            stat = os.stat(path)
+            entries.append({
+                "id": rel_path,
+                "name": rel_path,
+                "size": stat.st_size,
+                "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+            })
+    return sorted(entries, key=lambda e: e["name"])
+
+
+def make_handler(folder, delay_s=0.0, bytes_per_s=None):
+    class FolderHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            time.sleep(delay_s)
+            path = urllib.parse.unquote(urllib.parse.urlparse(self.path).path)
+            if path == "/index.json":
+                body = json.dumps(folder_index(folder)).encode()
+                self._send(200, body, "application/json")
+            elif path.startswith("/files/"):
+                file_path = os.path.normpath(os.path.join(folder, path[len("/files/"):]))
+                if not file_path.startswith(os.path.normpath(folder)) or not os.path.isfile(file_path):
+                    self._send(404, b"not found", "text/plain")
+                    return
+                with open(file_path, "rb") as f:
+                    self._send(200, f.read(), "application/octet-stream")
+            else:
+                self._send(404, b"not found", "text/plain")
+
+        def _send(self, status, body, content_type):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            for start in range(0, len(body), CHUNK_SIZE):
+                chunk = body[start:start + CHUNK_SIZE]
+                self.wfile.write(chunk)
+                if bytes_per_s:
+                    time.sleep(len(chunk) / bytes_per_s)
+
+    return FolderHandler
+
+
+@contextmanager
+def serve_folder(folder, delay_s=0.0, bytes_per_s=None, port=0):
+    """Serve folder in a background thread; yields the base URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(folder, delay_s, bytes_per_s))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a folder of extracts like the Drive folder.")
+    parser.add_argument("folder", help="folder with the extract files")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds of latency per request")
+    parser.add_argument("--bandwidth-kbps", type=float, default=None, help="cap of each download, in KB/s")
+    args = parser.parse_args()
+
+    bytes_per_s = args.bandwidth_kbps * 1024 if args.bandwidth_kbps else None
+    with serve_folder(args.folder, args.delay, bytes_per_s, args.port) as url:
+        print(f"Serving {args.folder} at {url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from src.clean.inter.clean_extract import process_inter_df
+from src.clean.nubank.clean_extract import process_nubank_df
+from src.tests.toy_dataset import brazilian_amounts, generate_raw_extract
+from src.utils.config import load_config
+from src.utils.schema import apply_schema
+
+STANDARD_COLUMNS = load_config()['data_processing']['standard_columns']
+
+
+# The per-bank cleaners the adapter replaced, step by step as they were written
+
+def _split_values(df):
+    df['income'] = df['value'].apply(lambda x: x if x > 0 else 0)
+    df['outcome'] = df['value'].apply(lambda x: -x if x < 0 else 0)
+    return df.drop(columns=['value'])
+
+
+def _lowercase_text(df, exclude_columns):
+    string_columns = df.select_dtypes(include='object').columns
+    columns_to_process = [col for col in string_columns if col not in exclude_columns]
+    df[columns_to_process] = df[columns_to_process].apply(lambda x: x.str.lower())
+    return df
+
+
+def _standard_fields(df, bank):
+    df['bank'] = bank
+    df['balance'] = 0.0
+    df['category'] = ''
+    return df.reindex(columns=STANDARD_COLUMNS)
+
+
+def reference_nubank(monthly_df):
+    df = monthly_df.copy()
+    df.columns = ["date", "value", "original_id", "description"]
+    df['date'] = pd.to_datetime(df['date'], dayfirst=True)
+    df['value'] = df['value'].astype(float)
+    df = _split_values(df)
+    df['description'] = df['description'].apply(lambda desc: ' '.join(desc.split()).strip())
+
+    def get_participant(desc):
+        parts = desc.split(" - ")
+        return parts[1].lower() if len(parts) > 1 else ""
+    df['participant'] = df['description'].apply(get_participant)
+    return _standard_fields(_lowercase_text(df, exclude_columns=['original_id']), 'nubank')
+
+
+def reference_inter(monthly_df):
+    df = monthly_df.copy()
+    df['full_description'] = df['Histórico'] + ' ' + df["Descrição"]
+    df = df.rename(columns={
+        'Data Lançamento': 'date', 'Valor': 'value', 'full_description': 'description', 'Descrição': 'participant'
+    })
+    df['date'] = pd.to_datetime(df['date'])
+    df['value'] = df['value'].str.replace('.', '').str.replace(',', '.').astype(float)
+    df = _split_values(df)
+    for column in ['description', 'participant']:
+        df[column] = df[column].apply(lambda desc: ' '.join(str(desc).split()).strip())
+    return _standard_fields(_lowercase_text(df, exclude_columns=['original_id']), 'inter')
+
+
+NUBANK_DESCRIPTIONS = [
+    "Compra no débito - Uber",                           # participant at the end
+    "Transferência recebida pelo Pix - FULANO DE TAL - 000.000.000-00 - BANCO",
+    "Pagamento de fatura",                                # no participant
+    "  Pix  enviado -   Alice\t- Conta ",                 # whitespace inside the separators
+    "Estorno - - Bob",                                    # empty field between separators
+    "Compra -Padaria - Carla -",                          # separators without spaces
+]
+INTER_ROWS = [
+    ("Pix recebido", "Fulano  de Tal", "1.360,96"),
+    ("Compra no debito", "  MERCADO\tBOM PRECO ", "-10,00"),
+    ("Pagamento", "", "-1.234.567,89"),
+]
+
+
+def test_nubank_matches_the_replaced_cleaner():
+    raw = generate_raw_extract("nubank", datetime(2020, 1, 1), months=2, transactions_per_month=50, seed=0)
+    edge = pd.DataFrame({
+        "Data": pd.Timestamp("2020-03-02"),
+        "Valor": [float(i) - 2.5 for i in range(len(NUBANK_DESCRIPTIONS))],
+        "Identificador": [f"ID-{i}" for i in range(len(NUBANK_DESCRIPTIONS))],
+        "Descrição": NUBANK_DESCRIPTIONS,
+    })
+    raw = pd.concat([raw, edge], ignore_index=True)
+
+    cleaned = process_nubank_df(raw)
+    pd.testing.assert_frame_equal(cleaned, apply_schema(reference_nubank(raw)))
+    assert cleaned["participant"].tolist()[-len(NUBANK_DESCRIPTIONS):] == [
+        "uber", "fulano de tal", "unknown", "alice", "- bob", "carla -",
+    ]
+
+
+@pytest.mark.parametrize("values_as_text", [True, False])
+def test_inter_matches_the_replaced_cleaner(values_as_text):
+    """Values read as Brazilian text or already parsed by the reader clean the same."""
+    raw = generate_raw_extract("inter", datetime(2020, 1, 1), months=2, transactions_per_month=50, seed=0)
+    raw = raw.assign(Valor=brazilian_amounts(raw["Valor"]), Saldo=brazilian_amounts(raw["Saldo"]))
+    edge = pd.DataFrame(INTER_ROWS, columns=["Histórico", "Descrição", "Valor"]).assign(
+        **{"Data Lançamento": pd.Timestamp("2020-03-02"), "Saldo": "0,00"}
+    )
+    raw = pd.concat([raw, edge[raw.columns]], ignore_index=True)
+
+    expected = apply_schema(reference_inter(raw))
+    if not values_as_text:
+        raw = raw.assign(Valor=raw["Valor"].str.replace(".", "").str.replace(",", ".").astype(float))
+    cleaned = process_inter_df(raw)
+
+    pd.testing.assert_frame_equal(cleaned, expected)
+    assert cleaned["outcome"].tolist()[-2:] == [10.0, 1234567.89]
+    assert cleaned["description"].tolist()[-2:] == ["compra no debito mercado bom preco", "pagamento"]
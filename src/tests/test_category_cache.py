@@ -0,0 +1,73 @@
+import json
+
+import pandas as pd
+
+from src.processing.category_cache import CategoryCache
+
+LOOKUP = {"food": ["ifood", "mercado"], "transport": ["uber"]}
+
+
+def test_lookup_change_clears_the_cache(tmp_path):
+    path = str(tmp_path / "cache.json")
+    cache = CategoryCache(LOOKUP, default="other", path=path)
+    assert cache.match("Uber *Trip") == "transport"
+    cache.save()
+
+    # "uber" moves to a category listed first
+    changed = {"rides": ["uber"], **LOOKUP}
+    cache = CategoryCache(changed, default="other", path=path)
+    assert cache.entries == {}
+    assert cache.match("Uber *Trip") == "rides"
+    assert cache.stats()["misses"] == 1
+    cache.save()
+
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f)["entries"] == [["uber *trip", "rides"]]
+    assert CategoryCache(changed, default="other", path=path).entries == {"uber *trip": "rides"}
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    path = str(tmp_path / "cache.json")
+    cache = CategoryCache(LOOKUP, default="other", path=path, max_entries=2)
+    for description in ["ifood", "uber", "ifood", "mercado"]:
+        cache.match(description)
+
+    assert list(cache.entries) == ["ifood", "mercado"]
+    cache.save()
+    reloaded = CategoryCache(LOOKUP, default="other", path=path, max_entries=1)
+    assert list(reloaded.entries) == ["mercado"]
+
+
+def test_hits_do_not_rewrite_the_cache(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = CategoryCache(LOOKUP, default="other", path=str(path))
+    cache.match("ifood")
+    cache.save()
+    saved = json.loads(path.read_text(encoding="utf-8"))
+    path.write_text(json.dumps({**saved, "marker": True}), encoding="utf-8")
+
+    cache = CategoryCache(LOOKUP, default="other", path=str(path))
+    assert cache.match("IFOOD") == "food"
+    cache.save()
+    assert json.loads(path.read_text(encoding="utf-8"))["marker"]
+
+    assert cache.match("uber") == "transport"
+    cache.save()
+    assert "marker" not in json.loads(path.read_text(encoding="utf-8"))
+
+
+def test_hit_rate_counts():
+    cache = CategoryCache(LOOKUP, default="other")
+    descriptions = pd.Series(["ifood", "IFOOD", "ifood", "pix"])
+
+    categories = cache.categorize(descriptions)
+    assert categories.tolist() == ["food", "food", "food", "other"]
+    assert cache.stats() == {
+        "hits": 1, "misses": 2, "hit_rate": 1 / 3, "rows": 4, "row_hit_rate": 0.5, "entries": 2,
+    }
+
+    cache.categorize(descriptions)
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["rows"]) == (4, 2, 8)
+    assert stats["hit_rate"] == 4 / 6
+    assert stats["row_hit_rate"] == 6 / 8
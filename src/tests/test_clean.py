@@ -0,0 +1,84 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from src.clean.build_extracts_dict import build_extracts_dict, plan_extract_reads
+from src.pipeline import clean
+from src.tests.toy_dataset import write_raw_extracts
+from src.utils.storage import list_partitions
+
+
+def write_extracts(raw_dir, months=2, transactions_per_month=30):
+    for seed, bank in enumerate(["nubank", "inter"]):
+        write_raw_extracts(str(raw_dir), bank, datetime(2020, 1, 1), months, transactions_per_month,
+                           seed=seed, months_per_file=months)
+
+
+def test_stream_clean_drops_months_of_a_failed_file(tmp_path, monkeypatch):
+    """A file failing partway leaves none of its months' chunks behind; other files are kept."""
+    raw_dir, cleaned_dir = tmp_path / "raw", tmp_path / "cleaned"
+    write_extracts(raw_dir)
+    read_plan = plan_extract_reads(str(raw_dir))
+
+    process_nubank_df = clean.BANK_PROCESSORS["nubank"]
+    calls = []
+
+    def fails_on_third_chunk(chunk_df):
+        calls.append(len(chunk_df))
+        if len(calls) == 3:
+            raise ValueError("bad row")
+        return process_nubank_df(chunk_df)
+
+    monkeypatch.setitem(clean.BANK_PROCESSORS, "nubank", fails_on_third_chunk)
+    cleaned_months = []
+    row_counts = clean.stream_clean_plan(
+        read_plan, str(cleaned_dir), memory_budget_mb=0.002,
+        on_cleaned=lambda bank, yearmonth: cleaned_months.append((bank, yearmonth)), raise_errors=False
+    )
+
+    assert len(calls) == 3
+    assert row_counts["nubank"] == {}
+    assert list_partitions(str(cleaned_dir)) == {"inter": ["2020-01", "2020-02"]}
+    assert cleaned_months == [("inter", "2020-01"), ("inter", "2020-02")]
+
+    calls.clear()
+    with pytest.raises(RuntimeError, match="nubank NU_"):
+        clean.stream_clean_plan(read_plan, str(cleaned_dir), memory_budget_mb=0.002)
+    assert list_partitions(str(cleaned_dir)) == {"inter": ["2020-01", "2020-02"]}
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_failed_month_does_not_stop_the_others(tmp_path, jobs):
+    """Months are cleaned in (bank, month) order; a failing month is raised after the others are written."""
+    raw_dir, cleaned_dir = tmp_path / "raw", tmp_path / "cleaned"
+    write_extracts(raw_dir, months=3)
+    extracts = build_extracts_dict(str(raw_dir))
+    expected = {bank: {month: clean.BANK_PROCESSORS[bank](df) for month, df in months.items()}
+                for bank, months in extracts.items()}
+    # Works in worker processes too, unlike patching the cleaner
+    extracts["inter"]["2020-02"] = extracts["inter"]["2020-02"].drop(columns=["Valor"])
+
+    cleaned_months = []
+    with pytest.raises(RuntimeError, match="1 extracts: inter 2020-02"):
+        clean.clean_extracts(extracts, str(cleaned_dir), jobs=jobs,
+                             on_cleaned=lambda bank, yearmonth: cleaned_months.append((bank, yearmonth)))
+
+    assert cleaned_months == [("inter", "2020-01"), ("inter", "2020-03"),
+                              ("nubank", "2020-01"), ("nubank", "2020-02"), ("nubank", "2020-03")]
+    assert list_partitions(str(cleaned_dir)) == {"inter": ["2020-01", "2020-03"],
+                                                 "nubank": ["2020-01", "2020-02", "2020-03"]}
+
+    cleaned = clean.clean_extracts(extracts, str(cleaned_dir), jobs=jobs, persist=False, raise_errors=False)
+    assert list(cleaned["nubank"]) == ["2020-01", "2020-02", "2020-03"]
+    assert list(cleaned["inter"]) == ["2020-01", "2020-03"]
+    for bank, months in cleaned.items():
+        for month, df in months.items():
+            pd.testing.assert_frame_equal(df, expected[bank][month])
+
+
+def test_streaming_reports_ignored_settings(capsys):
+    clean.report_streaming_settings(jobs=4, engine="pyarrow")
+    assert "ignoring jobs=4, csv_engine=pyarrow" in capsys.readouterr().out
+    clean.report_streaming_settings(jobs=1, engine="pandas")
+    assert capsys.readouterr().out == ""
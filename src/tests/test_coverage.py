@@ -0,0 +1,108 @@
+import itertools
+import random
+
+import pandas as pd
+import pytest
+
+from src.clean.coverage import CoverageIndex, ExtractCoverage, month_index, month_label
+
+
+def extract(name, start, end):
+    return ExtractCoverage("nubank", name, pd.Timestamp(start), pd.Timestamp(end))
+
+
+def covers(extracts, months, complete):
+    return all(any(e.is_complete(m) if complete else e.touches(m) for e in extracts) for m in months)
+
+
+def covers_all(extracts, months, complete_months):
+    """Every month is touched, and every month some file covers completely is covered completely."""
+    return covers(extracts, months, complete=False) and covers(extracts, complete_months, complete=True)
+
+
+def test_overlapping_exports_are_not_read():
+    """A yearly export is read once; monthly exports it already covers are skipped."""
+    yearly = extract("year", "2020-01-01", "2020-12-31")
+    monthly = [extract(f"m{month}", f"2020-{month:02d}-01", f"2020-{month:02d}-28") for month in (2, 5)]
+    march = extract("march", "2020-03-01", "2020-03-31")
+    index = CoverageIndex(monthly + [march, yearly])
+
+    assert index.minimal_cover() == [yearly]
+    assert index.plan() == {"year": [f"2020-{month:02d}" for month in range(1, 13)]}
+
+
+def test_complete_coverage_is_preferred():
+    """A month is read from a file holding all of it, even when a longer file touches it."""
+    long_partial = extract("long", "2020-02-10", "2020-06-10")
+    february = extract("feb", "2020-02-01", "2020-02-29")
+    index = CoverageIndex([long_partial, february])
+
+    assert index.complete_months() == [month_index(pd.Timestamp(m)) for m in ["2020-02", "2020-03", "2020-04", "2020-05"]]
+    assert index.incomplete_months() == ["2020-06"]
+    assert index.plan() == {"feb": ["2020-02"], "long": ["2020-03", "2020-04", "2020-05", "2020-06"]}
+
+
+def test_file_kept_for_a_partial_month_serves_complete_months_too():
+    """Five overlapping exports need two files: the one read for January also holds February to April."""
+    extracts = [
+        extract("f0", "2020-01-21", "2020-05-28"),
+        extract("f1", "2020-04-21", "2020-08-29"),
+        extract("f2", "2020-03-01", "2020-07-31"),
+        extract("f3", "2020-02-01", "2020-05-31"),
+        extract("f4", "2020-03-10", "2020-06-30"),
+    ]
+    index = CoverageIndex(extracts)
+
+    assert sorted(e.path for e in index.minimal_cover()) == ["f0", "f1"]
+    assert index.plan() == {
+        "f0": ["2020-01", "2020-02", "2020-03", "2020-04"],
+        "f1": ["2020-05", "2020-06", "2020-07", "2020-08"],
+    }
+
+
+def test_partial_months_reuse_selected_files():
+    """Months nobody covers completely are read from an already selected file when one touches them."""
+    main = extract("main", "2020-01-10", "2020-04-30")
+    head = extract("head", "2020-01-05", "2020-01-20")
+    index = CoverageIndex([head, main])
+
+    assert index.minimal_cover() == [main]
+    assert index.plan() == {"main": ["2020-01", "2020-02", "2020-03", "2020-04"]}
+
+
+def random_extracts(rng):
+    extracts = []
+    for i in range(rng.randint(1, 7)):
+        start = pd.Timestamp(2020, rng.randint(1, 8), 1) + pd.Timedelta(days=rng.choice([0, 0, 9, 20]))
+        end = start + pd.Timedelta(days=rng.randint(5, 150))
+        if rng.random() < 0.5:
+            end = end + pd.offsets.MonthEnd(0)
+        extracts.append(extract(f"f{i}", start, end))
+    return extracts
+
+
+def minimum_cover_size(extracts, months, complete_months):
+    """Brute force: fewest files satisfying `covers_all`."""
+    for size in range(len(extracts) + 1):
+        if any(covers_all(subset, months, complete_months) for subset in itertools.combinations(extracts, size)):
+            return size
+
+
+@pytest.mark.parametrize("seed", range(150))
+def test_minimal_cover_properties(seed):
+    extracts = random_extracts(random.Random(seed))
+    index = CoverageIndex(extracts)
+    chosen = index.minimal_cover()
+    complete_months = index.complete_months()
+
+    # Every month is read, from a complete file whenever one exists
+    assert covers_all(chosen, index.months(), complete_months)
+    plan = index.plan()
+    planned = {month: path for path, months in plan.items() for month in months}
+    assert sorted(planned) == [month_label(m) for m in index.months()]
+    by_path = {e.path: e for e in extracts}
+    for month in complete_months:
+        assert by_path[planned[month_label(month)]].is_complete(month)
+
+    # No smaller set of files reads every month, from a complete file whenever one exists
+    assert len(chosen) == minimum_cover_size(extracts, index.months(), complete_months)
@@ -0,0 +1,62 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from src.clean.inter import frame_extracts as inter_frame
+from src.clean.nubank import frame_extracts as nubank_frame
+from src.tests.toy_dataset import write_raw_extracts
+
+READERS = {"nubank": nubank_frame, "inter": inter_frame}
+
+# Empty text fields and amounts above a thousand
+INTER_EDGE_CASES = (
+    "Extrato Conta Corrente\nConta ;000000\nPeríodo ;\n"
+    "Data Lançamento;Histórico;Descrição;Valor;Saldo\n"
+    "02/01/2020;Pix recebido;;1.360,96;1.360,96\n"
+    "03/01/2020;;Loja;-10,00;1.350,96\n"
+)
+NUBANK_EDGE_CASES = (
+    "Data,Valor,Identificador,Descrição\n"
+    "02/01/2020,-1360.96,a1,\n"
+    "03/01/2020,10.00,,Pix\n"
+)
+
+
+def toy_extract(tmp_path, bank):
+    [path] = write_raw_extracts(str(tmp_path), bank, datetime(2020, 1, 1), months=2,
+                                transactions_per_month=40, seed=3, months_per_file=2)
+    return path
+
+
+def edge_case_extract(tmp_path, bank):
+    if bank == "inter":
+        path = tmp_path / "Extrato-01-01-2020-a-31-01-2020.csv"
+        path.write_text(INTER_EDGE_CASES, encoding="utf-8")
+    else:
+        path = tmp_path / "NU_0000_01JAN2020_31JAN2020.csv"
+        path.write_text(NUBANK_EDGE_CASES, encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("bank", ["nubank", "inter"])
+@pytest.mark.parametrize("make_extract", [toy_extract, edge_case_extract])
+def test_engines_read_the_same_frame(tmp_path, bank, make_extract):
+    """The pandas and pyarrow readers give identical dtypes and values."""
+    reader = READERS[bank]
+    path = make_extract(tmp_path, bank)
+
+    with_pandas = reader.read_csv(path, engine="pandas")
+    pd.testing.assert_frame_equal(reader.read_csv(path, engine="pyarrow"), with_pandas)
+    assert with_pandas["Valor"].dtype == "float64"
+    pd.testing.assert_frame_equal(
+        pd.concat(reader.read_csv_chunks(path, chunksize=7), ignore_index=True), with_pandas
+    )
+
+
+def test_inter_thousands_separator(tmp_path):
+    path = edge_case_extract(tmp_path, "inter")
+    for engine in ["pandas", "pyarrow"]:
+        df = inter_frame.read_csv(path, engine=engine)
+        assert df["Valor"].tolist() == [1360.96, -10.0]
+        assert df["Saldo"].tolist() == [1360.96, 1350.96]
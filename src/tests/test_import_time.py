@@ -0,0 +1,22 @@
+import os
+
+import pytest
+
+from src.tests.check_import_time import DEFERRED, IMPORT_BUDGETS_MS, check, measure
+
+# Multiplies every budget, e.g. IMPORT_BUDGET_SCALE=2 on slow CI machines
+BUDGET_SCALE = float(os.environ.get("IMPORT_BUDGET_SCALE", "1"))
+
+# Stages run_pipeline imports only in the modes that use them
+RUN_PIPELINE_DEFERRED = ("src.pipeline.incremental", "src.pipeline.stream", "src.pipeline.watch", "src.download")
+
+
+@pytest.mark.parametrize("module, budget_ms", IMPORT_BUDGETS_MS.items())
+def test_import_time_within_budget(module, budget_ms):
+    assert check(module, budget_ms * BUDGET_SCALE, runs=1) == []
+
+
+def test_run_pipeline_defers_mode_specific_stages():
+    _, imported = measure("run_pipeline")
+    assert not [name for name in imported if name.startswith(RUN_PIPELINE_DEFERRED)]
+    assert not [name for name in imported if name.split(".")[0] in DEFERRED]
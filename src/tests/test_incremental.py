@@ -0,0 +1,94 @@
+import glob
+import os
+from datetime import datetime
+
+import pytest
+
+from src.tests.benchmark_pipeline import setup_workspace
+
+N_TRANSACTIONS = 400
+MONTHS = 6
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """A two-bank workspace; returns its config."""
+    config = setup_workspace(str(tmp_path), n_transactions=N_TRANSACTIONS, months=MONTHS, seed=0)
+    # Stage modules read config.yaml and lookup paths relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    return config
+
+
+def rewrite_inter_extracts(config, seed):
+    """Replace the Inter extracts with other transactions under the same file names."""
+    from src.tests.toy_dataset import write_raw_extracts
+
+    per_month = N_TRANSACTIONS // (MONTHS * 2)
+    write_raw_extracts(config["paths"]["data_raw"], "inter", datetime(2020, 1, 1), MONTHS, per_month,
+                       seed=seed, months_per_file=3)
+
+
+def test_removed_bank_leaves_every_store(workspace):
+    """A bank without any raw extract left is dropped from the outputs, the ledger and the snapshot."""
+    from src.pipeline.incremental import run_incremental
+    from src.processing.reconcile import reconciled_outputs
+    from src.utils.ledger import LedgerStore, ledger_path
+    from src.utils.snapshot import snapshot_banks, snapshot_path
+    from src.utils.storage import storage_format
+
+    config = workspace
+    reconciled_dir = config["paths"]["data_reconciled"]
+    fmt = storage_format(config)
+
+    run_incremental(config)
+    assert reconciled_outputs(reconciled_dir, "inter", fmt)
+    assert "inter" in LedgerStore(ledger_path(config)).banks()
+    assert "inter" in snapshot_banks(snapshot_path(config))
+
+    for path in glob.glob(os.path.join(config["paths"]["data_raw"], "Extrato-*.csv")):
+        os.remove(path)
+    run_incremental(config)
+
+    assert not reconciled_outputs(reconciled_dir, "inter", fmt)
+    ledger = LedgerStore(ledger_path(config))
+    assert ledger.banks() == ["nubank"]
+    assert ledger.query(bank="inter").empty
+    assert snapshot_banks(snapshot_path(config)) == ["nubank"]
+
+
+@pytest.mark.parametrize("memory_budget_mb", [None, 1])
+def test_failed_clean_keeps_published_history(workspace, monkeypatch, memory_budget_mb):
+    """Months that fail to clean keep their previous outputs downstream until a clean succeeds."""
+    import src.pipeline.clean as clean
+    from src.pipeline.incremental import run_incremental
+    from src.utils.ledger import LedgerStore, ledger_path
+    from src.utils.snapshot import read_snapshot, snapshot_path
+    from src.utils.storage import partition_exists, storage_format
+
+    config = workspace
+    categorized_dir = config["paths"]["data_categorized"]
+    fmt = storage_format(config)
+
+    run_incremental(config, memory_budget_mb=memory_budget_mb)
+    ledger = LedgerStore(ledger_path(config))
+    before = ledger.query(bank="inter")
+    assert len(before)
+
+    def failing_clean(monthly_df):
+        raise ValueError("transient parse error")
+
+    # Every month of the bank changes and fails to clean (in clean_month, or in the streamed chunks)
+    rewrite_inter_extracts(config, seed=99)
+    with monkeypatch.context() as patch:
+        patch.setitem(clean.BANK_PROCESSORS, "inter", failing_clean)
+        run_incremental(config, memory_budget_mb=memory_budget_mb)
+
+    for month in range(1, MONTHS + 1):
+        assert partition_exists(categorized_dir, "inter", f"2020-{month:02d}", fmt)
+    assert ledger.query(bank="inter").equals(before)
+    assert len(read_snapshot(snapshot_path(config), "inter")) == len(before)
+
+    # The next successful clean replaces them
+    run_incremental(config, memory_budget_mb=memory_budget_mb)
+    after = ledger.query(bank="inter")
+    assert len(after) and not after.equals(before)
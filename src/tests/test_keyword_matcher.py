@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+from src.processing.keyword_matcher import KeywordMatcher
+
+DEFAULT = "default"
+# A small alphabet makes keywords overlap, nest and share prefixes and suffixes
+ALPHABET = "abAB "
+
+
+def baseline_match(description, lookup_table):
+    """The keyword loop KeywordMatcher replaces: first category with a keyword in description."""
+    for category, keywords in lookup_table.items():
+        filtered_keywords = [kw for kw in keywords if kw]
+        if not filtered_keywords:
+            continue
+        if any(keyword.lower() in description.lower() for keyword in filtered_keywords):
+            return category
+    return DEFAULT
+
+
+def random_text(rng, max_length):
+    return "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, max_length)))
+
+
+def random_lookup(rng):
+    """Categories with random keywords; some are empty or repeated in another category."""
+    lookup_table = {}
+    pool = []
+    for index in range(rng.randint(1, 6)):
+        keywords = []
+        for _ in range(rng.randint(0, 4)):
+            if pool and rng.random() < 0.2:
+                keywords.append(rng.choice(pool))
+            else:
+                keywords.append(random_text(rng, 4))
+        pool.extend(keywords)
+        lookup_table[f"category {index}"] = keywords
+    return lookup_table
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_matches_the_keyword_loop(seed):
+    rng = random.Random(seed)
+    lookup_table = random_lookup(rng)
+    matcher = KeywordMatcher(lookup_table, default=DEFAULT)
+    for _ in range(50):
+        description = random_text(rng, 12)
+        assert matcher.match(description) == baseline_match(description, lookup_table), (lookup_table, description)
+
+
+@pytest.mark.parametrize("description, expected", [
+    ("PAGAMENTO UBER EATS", "delivery"),     # overlapping keywords: the first category wins
+    ("uber trip", "transport"),
+    ("posto shell", "fuel"),                 # keyword at the end (suffix)
+    ("shellfish market", "fuel"),            # keyword at the start (prefix)
+    ("ifood pedido", "delivery"),            # same keyword in two categories
+    ("Mercado Livre", "shopping"),           # case differences
+    ("", DEFAULT),
+    ("transferência", DEFAULT),              # only empty keywords could match
+])
+def test_edge_cases(description, expected):
+    lookup_table = {
+        "empty": ["", ""],
+        "delivery": ["uber eats", "ifood"],
+        "transport": ["uber", "99"],
+        "fuel": ["shell"],
+        "restaurants": ["ifood"],
+        "shopping": ["MERCADO livre"],
+    }
+    assert KeywordMatcher(lookup_table, default=DEFAULT).match(description) == expected
+    assert baseline_match(description, lookup_table) == expected
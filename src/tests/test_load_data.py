@@ -0,0 +1,41 @@
+import os
+
+import pandas as pd
+import pytest
+import yaml
+
+from src.tests.benchmark_pipeline import setup_workspace
+
+
+@pytest.fixture(params=["csv", "parquet"])
+def reconciled_workspace(tmp_path, monkeypatch, request):
+    """A workspace built by an incremental run in the given storage format; returns its config."""
+    config = setup_workspace(str(tmp_path), n_transactions=300, months=4, seed=0)
+    config["storage"]["format"] = request.param
+    with open(tmp_path / "config.yaml", "w") as f:
+        yaml.safe_dump(config, f, sort_keys=False)
+    monkeypatch.chdir(tmp_path)
+
+    from src.pipeline.incremental import run_incremental
+    run_incremental(config)
+    return config
+
+
+def test_filters_on_columns_left_out_of_the_projection(reconciled_workspace):
+    """Without a ledger store, filtered loads read the filter columns and drop them afterwards."""
+    from src.utils.ledger import LedgerStore, ledger_path
+    from src.utils.load_data import load_dashboard_data
+
+    config = reconciled_workspace
+    columns = ["description", "income", "outcome"]
+    filters = {"start": "2020-02-01", "end": "2020-03-31", "category": ["transport", "supplies"]}
+    ledger = LedgerStore(ledger_path(config))
+    expected = {bank: ledger.query(bank=bank, columns=columns, **filters) for bank in config["banks"]}
+    os.remove(ledger_path(config))
+
+    data = load_dashboard_data(columns=columns, **filters)
+
+    for bank, df in data.items():
+        assert list(df.columns) == columns
+        assert len(df) > 0
+        pd.testing.assert_frame_equal(df.reset_index(drop=True), expected[bank])
@@ -0,0 +1,52 @@
+import threading
+
+from src.utils.profiling import RssSampler, RunProfiler, rss_mb
+
+
+class FakeRss:
+    """RSS reader returning `mb`; `sampled` is set once a sample has seen `wait_for`."""
+
+    def __init__(self, mb):
+        self.mb = mb
+        self.wait_for = None
+        self.sampled = threading.Event()
+
+    def __call__(self):
+        mb = self.mb
+        if mb == self.wait_for:
+            self.sampled.set()
+        return mb
+
+    def hold(self, mb):
+        """Report mb until the sampler thread has read it."""
+        self.wait_for, self.mb = mb, mb
+        assert self.sampled.wait(timeout=5)
+        self.sampled.clear()
+
+
+def test_peak_rss_is_per_stage():
+    """A stage that peaks reports its peak; a later lighter stage does not inherit it."""
+    rss = FakeRss(100.0)
+    profiler = RunProfiler(rss_reader=rss)
+    with profiler.stage("heavy"):
+        rss.hold(400.0)
+        rss.mb = 100.0
+    with profiler.stage("light"):
+        rss.hold(110.0)
+
+    heavy, light = profiler.stages
+    assert heavy.peak_rss_mb == 400.0
+    assert light.peak_rss_mb == 110.0
+
+
+def test_sampler_keeps_the_highest_sample():
+    samples = iter([50.0, 80.0])
+    sampler = RssSampler(interval_s=60, reader=lambda: next(samples)).start()
+    assert sampler.stop() == 80.0
+
+
+def test_rss_mb_sees_an_allocation():
+    before = rss_mb()
+    block = b"x" * (32 * 2**20)
+    assert rss_mb() - before > 16
+    del block
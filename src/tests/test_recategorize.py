@@ -0,0 +1,113 @@
+import random
+from copy import deepcopy
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.processing.keyword_matcher import KeywordMatcher
+from src.processing.recategorize import changed_keywords, keyword_pattern, recategorize_frame
+from src.tests.benchmark_pipeline import setup_workspace
+from src.tests.toy_dataset import category_lookup
+
+KEYS = ["nubank_2020-01", "nubank_2020-02", "inter_2020-01"]
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    setup_workspace(str(tmp_path), n_transactions=40, months=1, seed=0)
+    # auto_category reads config.yaml and lookup paths relative to the working directory
+    monkeypatch.chdir(tmp_path)
+
+
+def cleaned_frames(seed, rows=200):
+    """Cleaned-like partitions whose descriptions name zero, one or two merchants."""
+    rng = np.random.default_rng(seed)
+    keywords = [keyword for keywords in category_lookup().values() for keyword in keywords]
+    frames = {}
+    for key in KEYS:
+        descriptions = []
+        for _ in range(rows):
+            names = list(rng.choice(keywords, size=rng.integers(0, 3)))
+            descriptions.append(" ".join(["Pix"] + [name.upper() if rng.random() < 0.3 else name for name in names]))
+        frames[key] = pd.DataFrame({
+            "date": pd.Timestamp(key.split("_")[1] + "-01"),
+            "bank": key.split("_")[0],
+            "income": 0.0,
+            "outcome": rng.uniform(1, 100, rows).round(2),
+            "description": descriptions,
+        })
+    return frames
+
+
+def add_category(table):
+    # Overlaps with "transport" and with "sales"
+    return {"rides": ["uber", "livre"], **table, "pets": ["petz"]}
+
+
+def remove_category(table):
+    table = {category: keywords for category, keywords in table.items() if category != "transport"}
+    table["eating-out"] = [keyword for keyword in table["eating-out"] if keyword != "ifood"]
+    return table
+
+
+def move_keyword(table):
+    table["e-commerce"].remove("amazon")
+    table["supplies"].append("amazon")
+    table["housing"].append("mercado")
+    return table
+
+
+def reorder_categories(table):
+    categories = list(table)
+    categories[0], categories[-1] = categories[-1], categories[0]
+    categories.insert(2, categories.pop(categories.index("sales")))
+    return {category: table[category] for category in categories}
+
+
+def random_edit(seed):
+    def edit(table):
+        rng = random.Random(seed)
+        categories = list(table)
+        rng.shuffle(categories)
+        table = {category: table[category] for category in categories[rng.randint(1, 4):]}
+        keywords = [keyword for keywords in category_lookup().values() for keyword in keywords]
+        for _ in range(5):
+            table[rng.choice(list(table))].append(rng.choice(keywords))
+        table[f"new-{seed}"] = [rng.choice(keywords).split()[0]]
+        return table
+    return edit
+
+
+@pytest.mark.parametrize("edit", [add_category, remove_category, move_keyword, reorder_categories]
+                         + [random_edit(seed) for seed in range(5)])
+def test_recategorize_matches_categorizing_from_scratch(workspace, edit):
+    """Recategorizing the rows with a changed keyword gives what the new lookup gives on everything."""
+    from src.processing.auto_category import DEFAULT_CATEGORY, categorize_dataframes
+
+    old_table = category_lookup()
+    new_table = edit(deepcopy(old_table))
+    frames = cleaned_frames(seed=1)
+    old = categorize_dataframes(frames, old_table, show_stats=False)
+    expected = categorize_dataframes(frames, new_table, show_stats=False)
+
+    pattern = keyword_pattern(changed_keywords(old_table, new_table))
+    matcher = KeywordMatcher(new_table, default=DEFAULT_CATEGORY)
+    n_changed = 0
+    for key in KEYS:
+        df, changes = recategorize_frame(old[key], pattern, matcher)
+        pd.testing.assert_frame_equal(df, expected[key])
+
+        old_categories = old[key]["category"].astype(object)
+        new_categories = expected[key]["category"].astype(object)
+        differs = old_categories != new_categories
+        assert changes.index.tolist() == old[key].index[differs].tolist()
+        assert changes["old_category"].tolist() == old_categories[differs].tolist()
+        assert changes["new_category"].tolist() == new_categories[differs].tolist()
+        n_changed += len(changes)
+    assert n_changed > 0
+
+
+def test_unchanged_lookup_has_no_changed_keywords():
+    assert changed_keywords(category_lookup(), category_lookup()) == set()
+    assert keyword_pattern(set()) is None
@@ -0,0 +1,86 @@
+import os
+import sys
+
+import pytest
+
+from src.tests.benchmark_pipeline import setup_workspace
+
+STAGE_KEYS = ["data_cleaned", "data_categorized", "data_reconciled"]
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """A two-bank workspace; returns its config."""
+    config = setup_workspace(str(tmp_path), n_transactions=400, months=6, seed=0)
+    # Stage modules read config.yaml and lookup paths relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    return config
+
+
+def run_pipeline(monkeypatch, *args):
+    import run_pipeline
+    monkeypatch.setattr(sys, "argv", ["run_pipeline.py", "--skip-download", *args])
+    run_pipeline.main()
+
+
+def published_files(config):
+    """Contents of every published stage file; the ledger database is left out (not byte-stable)."""
+    files = {}
+    for key in STAGE_KEYS:
+        stage_dir = config["paths"][key]
+        for root, _, names in os.walk(stage_dir):
+            for name in names:
+                if not name.startswith("ledger.sqlite"):
+                    path = os.path.join(root, name)
+                    with open(path, "rb") as f:
+                        files[os.path.relpath(path, stage_dir), key] = f.read()
+    return files
+
+
+def test_resume_after_a_failed_reconcile(workspace, monkeypatch):
+    """A run failing in reconcile publishes nothing; --resume redoes only the failed bank."""
+    from src.pipeline import clean, incremental
+
+    config = workspace
+    failing = {"nubank"}
+    cleaned_rows, categorized, reconciled = [], [], []
+
+    def counted(calls, fn, count):
+        def wrapper(*args, **kwargs):
+            calls.append(count(*args, **kwargs))
+            return fn(*args, **kwargs)
+        return wrapper
+
+    reconcile_data = incremental.reconcile_data
+
+    def reconcile_unless_failing(config, banks=None, **kwargs):
+        if failing.intersection(banks):
+            raise RuntimeError("reconcile failed")
+        return reconcile_data(config, banks=banks, **kwargs)
+
+    monkeypatch.setattr(incremental, "reconcile_data",
+                        counted(reconciled, reconcile_unless_failing, lambda config, banks=None, **kwargs: banks))
+    monkeypatch.setattr(incremental, "categorize_dataframes",
+                        counted(categorized, incremental.categorize_dataframes, lambda dfs, *args, **kwargs: sorted(dfs)))
+    for bank, process in list(clean.BANK_PROCESSORS.items()):
+        monkeypatch.setitem(clean.BANK_PROCESSORS, bank, counted(cleaned_rows, process, len))
+
+    with pytest.raises(RuntimeError, match="reconcile failed"):
+        run_pipeline(monkeypatch)
+    assert reconciled == [["inter"], ["nubank"]]
+    assert cleaned_rows and categorized
+    assert not any(os.path.exists(config["paths"][key]) for key in STAGE_KEYS)
+
+    failing.clear()
+    cleaned_rows.clear(), categorized.clear(), reconciled.clear()
+    run_pipeline(monkeypatch, "--resume")
+
+    assert cleaned_rows == [] and categorized == []
+    assert reconciled == [["nubank"]]
+    assert not os.path.exists(os.path.join("data", "tmp"))
+    resumed = published_files(config)
+
+    # A full run from scratch publishes the same files
+    run_pipeline(monkeypatch)
+    assert reconciled[1:] == [["inter"], ["nubank"]]
+    assert published_files(config) == resumed
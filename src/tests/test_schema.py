@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+from src.utils.load_data import frame_csv
+from src.utils.schema import SCHEMA, TEXT_DTYPE, apply_schema, build_schema, fill_missing
+
+STAGE_CSV = (
+    "date,bank,income,outcome,balance,type,category,participant,description,original_id\n"
+    "2024-01-02,nubank,10.5,0.0,10.5,income,salary,alice,NA,id-1\n"
+    "2024-01-03,nubank,,3.0,7.5,,,,,\n"
+    "2024-01-04 10:30:00,inter,0.0,1.25,6.25,outcome,food,null,null,NaN\n"
+)
+
+
+def test_schema_dtypes():
+    assert build_schema(["date", "income", "bank", "participant", "description", "notes"]) == {
+        "income": "float64", "bank": "category", "participant": "category",
+        "description": TEXT_DTYPE, "notes": TEXT_DTYPE,
+    }
+
+
+def test_stage_csv_na_handling(tmp_path):
+    """Empty numbers are NaN, empty text stays '', and NA-like words are kept as text."""
+    path = tmp_path / "nubank_2024-01.csv"
+    path.write_text(STAGE_CSV, encoding="utf-8")
+    df = frame_csv(str(path))
+
+    assert df["date"].dtype == "datetime64[ns]"
+    assert all(df[col].dtype == dtype for col, dtype in SCHEMA.items())
+    assert df["date"].tolist() == [pd.Timestamp("2024-01-02"), pd.Timestamp("2024-01-03"),
+                                   pd.Timestamp("2024-01-04 10:30")]
+    assert np.isnan(df.loc[1, "income"])
+    assert df.loc[1, ["type", "category", "description", "original_id"]].tolist() == ["", "", "", ""]
+    assert df["participant"].tolist() == ["alice", "unknown", "null"]
+    assert df["description"].tolist() == ["NA", "", "null"]
+    assert df["original_id"].tolist() == ["id-1", "", "NaN"]
+
+
+def test_apply_schema_matches_a_csv_round_trip(tmp_path):
+    """A frame built in memory, missing values included, gets what reading it back from CSV gives."""
+    df = pd.DataFrame({
+        "date": pd.to_datetime(["2024-01-02", "2024-01-03", "2024-01-04"]),
+        "bank": ["nubank", "nubank", "inter"],
+        "income": [10.5, np.nan, 0.0],
+        "outcome": [0.0, 3.0, 1.25],
+        "balance": [10.5, 7.5, 6.25],
+        "type": ["income", None, "outcome"],
+        "category": ["salary", np.nan, ""],
+        "participant": ["alice", None, ""],
+        "description": ["pix", None, np.nan],
+        "original_id": ["id-1", "", None],
+    })
+    path = tmp_path / "frame.csv"
+    df.to_csv(path, index=False)
+
+    typed = apply_schema(df)
+    pd.testing.assert_frame_equal(typed, frame_csv(str(path)))
+    assert typed["participant"].tolist() == ["alice", "unknown", "unknown"]
+    pd.testing.assert_frame_equal(apply_schema(typed), typed)
+
+
+def test_apply_schema_restores_categoricals_after_concat():
+    first = apply_schema(pd.DataFrame({"bank": ["nubank"], "category": ["food"], "description": ["a"]}))
+    second = apply_schema(pd.DataFrame({"bank": ["inter"], "category": ["salary"], "description": ["b"]}))
+    combined = pd.concat([first, second], ignore_index=True)
+    assert combined["bank"].dtype == object
+
+    restored = apply_schema(combined)
+    assert isinstance(restored["bank"].dtype, pd.CategoricalDtype)
+    assert list(restored["category"].cat.categories) == ["food", "salary"]
+    assert restored["description"].dtype == TEXT_DTYPE
+
+
+def test_fill_missing_adds_the_fill_category():
+    df = pd.DataFrame({"participant": pd.Categorical(["alice", None])})
+    assert fill_missing(df)["participant"].tolist() == ["alice", "unknown"]
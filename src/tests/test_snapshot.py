@@ -0,0 +1,27 @@
+import pandas as pd
+
+from src.tests.test_storage import make_partition
+from src.utils.schema import TEXT_DTYPE, apply_schema
+from src.utils.snapshot import read_snapshot, snapshot_banks, write_snapshot
+
+
+def test_read_snapshot_has_schema_dtypes(tmp_path):
+    """A bank read from the snapshot equals its frame with schema dtypes, as a stage CSV reads back."""
+    path = str(tmp_path / "ledger.arrow")
+    frames = {"nubank": make_partition("nubank", "2024-01", 5), "inter": make_partition("inter", "2024-01", 3)}
+    frames["inter"]["category"] = "transport"
+    write_snapshot(frames, path)
+
+    assert snapshot_banks(path) == ["nubank", "inter"]
+    for bank, df in frames.items():
+        snapshot_df = read_snapshot(path, bank)
+        pd.testing.assert_frame_equal(snapshot_df, apply_schema(df))
+        assert snapshot_df["description"].dtype == TEXT_DTYPE
+
+    pd.testing.assert_frame_equal(
+        read_snapshot(path, "inter", columns=["category", "description"]),
+        apply_schema(frames["inter"])[["category", "description"]]
+    )
+    pd.testing.assert_frame_equal(
+        read_snapshot(path), apply_schema(pd.concat(list(frames.values()), ignore_index=True))
+    )
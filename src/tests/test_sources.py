@@ -0,0 +1,49 @@
+import gzip
+import zipfile
+from datetime import datetime
+
+import pandas as pd
+
+from src.clean.build_extracts_dict import build_extracts_dict
+from src.clean.sources import extract_filename, list_extract_locations, open_extract
+from src.tests.toy_dataset import write_raw_extracts
+
+
+def test_uppercase_compression_suffix(tmp_path):
+    """`X.CSV.GZ` is listed, decompressed and named like `X.CSV`."""
+    plain_dir, gz_dir = tmp_path / "plain", tmp_path / "gz"
+    gz_dir.mkdir()
+    [path] = write_raw_extracts(str(plain_dir), "nubank", datetime(2020, 1, 1), months=2,
+                                transactions_per_month=20, seed=0, months_per_file=2)
+    with open(path, "rb") as f:
+        content = f.read()
+    name = extract_filename(path).upper()
+    gz_path = gz_dir / f"{name}.GZ"
+    gz_path.write_bytes(gzip.compress(content))
+
+    assert list_extract_locations(str(gz_dir)) == [str(gz_path)]
+    assert extract_filename(str(gz_path)) == name
+    with open_extract(str(gz_path)) as stream:
+        assert stream.read() == content
+
+    plain, compressed = build_extracts_dict(str(plain_dir)), build_extracts_dict(str(gz_dir))
+    assert list(compressed["nubank"]) == list(plain["nubank"]) == ["2020-01", "2020-02"]
+    for month, df in plain["nubank"].items():
+        pd.testing.assert_frame_equal(compressed["nubank"][month], df)
+
+
+def test_zipped_member_suffix_case(tmp_path):
+    """Members of a zip archive are decompressed whatever the case of their suffix."""
+    [path] = write_raw_extracts(str(tmp_path / "plain"), "inter", datetime(2020, 1, 1), months=1,
+                                transactions_per_month=20, seed=0)
+    with open(path, "rb") as f:
+        content = f.read()
+    zip_dir = tmp_path / "zip"
+    zip_dir.mkdir()
+    with zipfile.ZipFile(zip_dir / "extracts.zip", "w") as archive:
+        archive.writestr(f"{extract_filename(path)}.Gz", gzip.compress(content))
+
+    [location] = list_extract_locations(str(zip_dir))
+    assert extract_filename(location) == extract_filename(path)
+    with open_extract(location) as stream:
+        assert stream.read() == content
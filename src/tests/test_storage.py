@@ -0,0 +1,79 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src.utils.schema import apply_schema
+from src.utils.storage import (
+    CSV, PARQUET, parse_partition_key, partition_key, partition_path,
+    read_partition, read_partitions, write_partition
+)
+
+
+def make_partition(bank, year_month, n, offset=0):
+    """A small cleaned-like frame with the standard columns."""
+    days = pd.date_range(f"{year_month}-01", periods=n, freq="D")
+    return apply_schema(pd.DataFrame({
+        "date": days,
+        "bank": bank,
+        "income": [float(i + offset) if i % 2 else 0.0 for i in range(n)],
+        "outcome": [0.0 if i % 2 else float(i + offset) for i in range(n)],
+        "balance": 0.0,
+        "type": ["income" if i % 2 else "outcome" for i in range(n)],
+        "category": ["salary" if i % 2 else "food" for i in range(n)],
+        "participant": ["alice" if i % 3 else None for i in range(n)],
+        "description": [f"transaction {i + offset}" for i in range(n)],
+        "original_id": "",
+    }))
+
+
+@pytest.mark.parametrize("key, expected", [
+    ("nubank_2024-01", ("nubank", "2024-01")),
+    ("inter_2023-12.csv", ("inter", "2023-12")),
+])
+def test_parse_partition_key(key, expected):
+    assert parse_partition_key(key) == expected
+    assert partition_key(*expected) == key.replace(".csv", "")
+
+
+@pytest.mark.parametrize("fmt", [CSV, PARQUET])
+def test_partition_round_trip(tmp_path, fmt):
+    """Parts written to a partition are read back in order, with schema dtypes."""
+    first, second = make_partition("nubank", "2024-01", 5), make_partition("nubank", "2024-01", 3, offset=5)
+    write_partition(first, str(tmp_path), "nubank", "2024-01", fmt)
+    write_partition(second, str(tmp_path), "nubank", "2024-01", fmt, part=1)
+    write_partition(make_partition("inter", "2024-01", 4), str(tmp_path), "inter", "2024-01", fmt)
+
+    expected = apply_schema(pd.concat([first, second], ignore_index=True))
+    pd.testing.assert_frame_equal(read_partition(str(tmp_path), "nubank", "2024-01", fmt), expected)
+    pd.testing.assert_frame_equal(
+        read_partition(str(tmp_path), "nubank", "2024-01", fmt, columns=["bank", "description"]),
+        expected[["bank", "description"]]
+    )
+
+
+def test_read_partition_matches_dataset_read(tmp_path):
+    """Reading one parquet partition gives what filtering the whole stage dataset gives."""
+    for bank in ["nubank", "inter"]:
+        for month in ["2024-01", "2024-02"]:
+            write_partition(make_partition(bank, month, 4), str(tmp_path), bank, month, PARQUET)
+
+    for bank in ["nubank", "inter"]:
+        for month in ["2024-01", "2024-02"]:
+            filters = [("bank", "=", bank), ("year_month", "=", month)]
+            pd.testing.assert_frame_equal(
+                read_partition(str(tmp_path), bank, month, PARQUET),
+                read_partitions(str(tmp_path), filters=filters)
+            )
+
+
+def test_read_partition_reads_its_own_files_only(tmp_path):
+    """Other partitions of the stage are not opened."""
+    write_partition(make_partition("nubank", "2024-01", 4), str(tmp_path), "nubank", "2024-01", PARQUET)
+    other = partition_path(str(tmp_path), "inter", "2024-01", PARQUET)
+    os.makedirs(other)
+    with open(os.path.join(other, "part-00000.parquet"), "wb") as f:
+        f.write(b"not parquet")
+
+    assert len(read_partition(str(tmp_path), "nubank", "2024-01", PARQUET)) == 4
+    assert read_partition(str(tmp_path), "nubank", "2024-02", PARQUET).empty
@@ -0,0 +1,59 @@
+import gzip
+import os
+import shutil
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from src.tests.benchmark_pipeline import setup_workspace
+from src.tests.fake_drive import serve_folder
+from src.tests.toy_dataset import write_raw_extracts
+
+
+@pytest.fixture
+def remote_folder(tmp_path, monkeypatch):
+    """A workspace whose raw extracts sit in a served folder instead of data/00--raw; returns (config, folder)."""
+    config = setup_workspace(str(tmp_path), n_transactions=400, months=6, seed=0)
+    monkeypatch.chdir(tmp_path)
+    remote = tmp_path / "remote"
+    shutil.move(config["paths"]["data_raw"], remote)
+
+    # An export the plan skips, one in a subfolder and one compressed
+    write_raw_extracts(str(remote), "nubank", datetime(2020, 2, 1), months=1, transactions_per_month=20, seed=7)
+    write_raw_extracts(str(remote / "2020"), "inter", datetime(2020, 7, 1), months=1,
+                       transactions_per_month=20, seed=8)
+    [path] = write_raw_extracts(str(remote), "nubank", datetime(2020, 7, 1), months=1,
+                                transactions_per_month=20, seed=9)
+    with open(path, "rb") as f:
+        (remote / f"{os.path.basename(path)}.gz").write_bytes(gzip.compress(f.read()))
+    os.remove(path)
+    return config, str(remote)
+
+
+def test_streamed_sync_matches_download_then_process(remote_folder):
+    """Streaming a served folder gives the frames of downloading it first and then cleaning and categorizing."""
+    from src.download.sources import HttpFolderSource
+    from src.pipeline.categorize import categorize_data
+    from src.pipeline.clean import clean_data
+    from src.pipeline.stream import stream_data
+    from src.utils.storage import flatten_partitions
+
+    config, remote = remote_folder
+    with serve_folder(remote, delay_s=0.01) as url:
+        streamed = stream_data(config, HttpFolderSource(url), workers=3, queue_size=1, persist=False)
+
+    raw_dir = config["paths"]["data_raw"]
+    remote_files = sorted(os.path.relpath(os.path.join(root, name), remote)
+                          for root, _, names in os.walk(remote) for name in names)
+    local_files = sorted(os.path.relpath(os.path.join(root, name), raw_dir)
+                         for root, _, names in os.walk(raw_dir) for name in names
+                         if name.endswith((".csv", ".gz")))
+    assert local_files == remote_files
+
+    cleaned = clean_data(config, persist=False)
+    expected = categorize_data(config, dfs=flatten_partitions(cleaned), persist=False)
+    assert sorted(streamed) == sorted(expected)
+    assert "nubank_2020-07" in streamed and "inter_2020-07" in streamed
+    for key, df in expected.items():
+        pd.testing.assert_frame_equal(streamed[key], df)
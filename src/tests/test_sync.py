@@ -0,0 +1,137 @@
+import json
+import os
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.download.sources import HttpFolderSource, LocalFolderSource, RemoteFile
+from src.download.sync import ExtractSync
+from src.tests.fake_drive import serve_folder
+
+EXTRACTS = ["NU_0000_01JAN2020_31MAR2020.csv", "Extrato-01-01-2020-a-31-03-2020.csv"]
+
+
+def test_sync_removes_files_dropped_by_the_source(tmp_path):
+    """A file removed from the source is deleted locally on the next sync."""
+    remote, local = tmp_path / "remote", tmp_path / "local"
+    remote.mkdir()
+    for name in EXTRACTS:
+        (remote / name).write_text(f"{name}\n")
+
+    with serve_folder(str(remote)) as url:
+        result = ExtractSync(HttpFolderSource(url), str(local)).run(workers=2)
+        assert sorted(result["fetched"]) == sorted(EXTRACTS)
+
+        os.remove(remote / EXTRACTS[0])
+        result = ExtractSync(HttpFolderSource(url), str(local)).run(workers=2)
+
+    assert result["removed"] == [EXTRACTS[0]]
+    assert result["local"] == [EXTRACTS[1]]
+    assert not (local / EXTRACTS[0]).exists()
+    assert (local / EXTRACTS[1]).exists()
+
+
+class NoMetadataSource(LocalFolderSource):
+    """A folder listed like gdown lists Drive: ids and names only."""
+
+    def list_files(self):
+        return [RemoteFile(f.id, f.name) for f in super().list_files()]
+
+
+def test_sync_refetches_files_without_metadata(tmp_path):
+    """Without sizes or modification times, a file changed in place is fetched again."""
+    remote, local = tmp_path / "remote", tmp_path / "local"
+    remote.mkdir()
+    (remote / EXTRACTS[0]).write_text("first\n")
+
+    ExtractSync(NoMetadataSource(str(remote)), str(local)).run(workers=1)
+    (remote / EXTRACTS[0]).write_text("changed in place\n")
+    result = ExtractSync(NoMetadataSource(str(remote)), str(local)).run(workers=1)
+
+    assert result["fetched"] == [EXTRACTS[0]]
+    assert (local / EXTRACTS[0]).read_text() == "changed in place\n"
+
+
+class ListedSource:
+    """A source listing the given RemoteFiles; every fetch writes the file's id."""
+
+    def __init__(self, files):
+        self.files = files
+
+    def list_files(self):
+        return self.files
+
+    def fetch(self, remote_file, dest_path):
+        with open(dest_path, "w") as f:
+            f.write(remote_file.id)
+
+
+def test_sync_rejects_names_outside_the_local_folder(tmp_path):
+    local = tmp_path / "raw" / "local"
+    outside = [
+        RemoteFile("up", "../../escaped.csv", 1, "2024-01-01"),
+        RemoteFile("abs", str(tmp_path / "absolute.csv"), 1, "2024-01-01"),
+    ]
+    inside = RemoteFile("ok", os.path.join("sub", EXTRACTS[0]), 1, "2024-01-01")
+
+    result = ExtractSync(ListedSource(outside + [inside]), str(local)).run(workers=2)
+
+    assert sorted(result["failed"]) == sorted(f.name for f in outside)
+    assert result["fetched"] == [inside.name]
+    assert (local / "sub" / EXTRACTS[0]).read_text() == "ok"
+    assert not (tmp_path / "escaped.csv").exists()
+    assert not (tmp_path / "absolute.csv").exists()
+
+
+def drive_api_handler(pages):
+    """Serves Drive API files.list pages: {(folder id, page token): response}."""
+    class DriveApiHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            params = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+            folder_id = params["q"][0].split("'")[1]
+            body = json.dumps(pages[(folder_id, params.get("pageToken", [None])[0])]).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return DriveApiHandler
+
+
+def test_drive_api_listing_has_metadata(monkeypatch):
+    """With an API key, Drive is listed page by page and into subfolders, with sizes and times."""
+    import src.download.sources as sources
+
+    pages = {
+        ("root", None): {"files": [
+            {"id": "a", "name": EXTRACTS[0], "mimeType": "text/csv", "size": "10",
+             "modifiedTime": "2024-01-01T00:00:00.000Z"},
+            {"id": "sub", "name": "2023", "mimeType": sources.DRIVE_FOLDER_MIME},
+        ], "nextPageToken": "next"},
+        ("root", "next"): {"files": [
+            {"id": "b", "name": EXTRACTS[1], "mimeType": "text/csv", "size": "20",
+             "modifiedTime": "2024-01-02T00:00:00.000Z"},
+        ]},
+        ("sub", None): {"files": [
+            {"id": "c", "name": "old.csv", "mimeType": "text/csv", "size": "30",
+             "modifiedTime": "2023-01-01T00:00:00.000Z"},
+        ]},
+    }
+    server = ThreadingHTTPServer(("127.0.0.1", 0), drive_api_handler(pages))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        monkeypatch.setattr(sources, "DRIVE_API_URL", f"http://127.0.0.1:{server.server_address[1]}/files")
+        files = sources.GoogleDriveSource("root", api_key="key").list_files()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert files == sorted([
+        RemoteFile("a", EXTRACTS[0], 10, "2024-01-01T00:00:00.000Z"),
+        RemoteFile("b", EXTRACTS[1], 20, "2024-01-02T00:00:00.000Z"),
+        RemoteFile("c", os.path.join("2023", "old.csv"), 30, "2023-01-01T00:00:00.000Z"),
+    ], key=lambda f: f.name)
@@ -0,0 +1,25 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.tests.toy_dataset import brazilian_amounts, generate_raw_extract, raw_filename, write_raw_extract
+
+
+@pytest.mark.parametrize("engine", ["pandas", "pyarrow"])
+def test_inter_extract_round_trip(tmp_path, engine):
+    """Amounts written like the Inter export ('3.506,30') are read and cleaned back unchanged."""
+    from src.clean.inter.clean_extract import process_inter_df
+    from src.clean.inter.frame_extracts import read_csv
+
+    df = generate_raw_extract("inter", datetime(2020, 1, 1), months=2, transactions_per_month=50, seed=1)
+    assert (df["Valor"].abs() >= 1000).any()
+    path = tmp_path / raw_filename("inter", datetime(2020, 1, 1), datetime(2020, 2, 29))
+    write_raw_extract(df, "inter", path)
+
+    text = path.read_text(encoding="utf-8")
+    assert all(f";{value};{balance}\n" in text
+               for value, balance in zip(brazilian_amounts(df["Valor"]), brazilian_amounts(df["Saldo"])))
+
+    cleaned = process_inter_df(read_csv(str(path), engine=engine))
+    np.testing.assert_allclose(cleaned["income"] - cleaned["outcome"], df["Valor"])
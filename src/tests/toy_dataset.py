@@ -1,9 +1,9 @@
 
 
+import os
 import numpy as np
 import pandas as pd
-import random
-from datetime import datetime, timedelta
+from datetime import datetime
 
 categories = {
     'fixed_high': ['housing', 'taxes'],
@@ -13,84 +13,243 @@ categories = {
     'other': ['other', 'home-maintenance', 'e-commerce', 'subscription']
 }
 
-def random_date(start, end):
-    """Generate a random date between two dates."""
-    delta = end - start
-    random_days = random.randint(0, delta.days)
-    return start + timedelta(days=random_days)
-
-def random_string():
-    """Generate a random string for original_id."""
-    return ''.join(random.choices('abcdef' + '0123456789', k=36))
-
-def generate_transactions(start_date, months=20, transactions_per_month=70):
-    dates = []
-    banks = []
-    incomes = []
-    outcomes = []
-    balances = []
-    categories_list = []
-    descriptions = []
-    participant = []
-    original_ids = []
-    
-    balance = 0.0
-    current_date = start_date
-
-    possible_participants = ["Alice", "Bob", "Charlie", "Dana", "Eve"]
-    
-    for month in range(months):
-        for _ in range(transactions_per_month):
-            bank = random.choice(['nubank'])
-            
-            category_type = random.choices(['fixed_high', 'variable_fixed', 'variable_low', 'income', 'other'], [0.1, 0.2, 0.5, 0.15, 0.05])[0]
-            category = random.choice(categories[category_type])
-            
-            if category_type == 'income':
-                income = round(random.uniform(1000, 5000), 2)
-                outcome = 0.0
-            else:
-                income = 0.0
-                if category_type == 'fixed_high':
-                    outcome = round(random.uniform(1000, 3000), 2)
-                elif category_type == 'variable_fixed':
-                    outcome = round(random.uniform(200, 1000), 2)
-                else:  # variable_low and other
-                    outcome = round(random.uniform(10, 500), 2)
-            
-            balance += (income - outcome)
-            
-            month_start = current_date.replace(day=1)
-            next_month = (month_start.replace(day=28) + timedelta(days=4)).replace(day=1)
-            transaction_date = random_date(month_start, next_month - timedelta(days=1))
-            
-            dates.append(transaction_date.strftime('%Y-%m-%d'))
-            banks.append(bank)
-            incomes.append(income)
-            outcomes.append(outcome)
-            balances.append(balance)
-            categories_list.append(category)
-            descriptions.append(f"Sample description for {category}")
-            participant.append(random.choice(possible_participants))
-            original_ids.append(random_string())
-        
-        current_date = next_month
-    
+category_types = ['fixed_high', 'variable_fixed', 'variable_low', 'income', 'other']
+category_type_weights = [0.1, 0.2, 0.5, 0.15, 0.05]
+
+# (low, high) amount of each category type
+amount_ranges = {
+    'fixed_high': (1000, 3000),
+    'variable_fixed': (200, 1000),
+    'variable_low': (10, 500),
+    'income': (1000, 5000),
+    'other': (10, 500),
+}
+
+# Merchant names written in raw descriptions; every category has its own keywords
+merchants = {
+    'housing': ['imobiliaria lar', 'condominio central'],
+    'taxes': ['receita federal', 'prefeitura iptu'],
+    'supplies': ['mercado bom preco', 'atacadao'],
+    'utilities': ['enel energia', 'sabesp', 'vivo fibra'],
+    'eating-out': ['padaria pao quente', 'restaurante sabor', 'ifood'],
+    'transport': ['uber', '99app', 'posto shell'],
+    'snack': ['cafeteria grao', 'doceria doce'],
+    'fun-money': ['cinemark', 'steam games'],
+    'healthcare': ['drogasil', 'clinica vida'],
+    'clothing': ['renner', 'riachuelo'],
+    'personal-enrichment': ['livraria cultura', 'udemy'],
+    'account-transfer': ['transferencia propria'],
+    'monthly-income': ['salario empresa'],
+    'allowance': ['mesada familia'],
+    'sales': ['venda mercado livre'],
+    'investment-return': ['rendimento cdb'],
+    'savings': ['resgate poupanca'],
+    'other': ['diversos'],
+    'home-maintenance': ['leroy merlin', 'eletricista jose'],
+    'e-commerce': ['amazon', 'shopee'],
+    'subscription': ['netflix', 'spotify'],
+}
+
+possible_participants = ["Alice", "Bob", "Charlie", "Dana", "Eve"]
+
+PT_MONTHS = ["JAN", "FEV", "MAR", "ABR", "MAI", "JUN", "JUL", "AGO", "SET", "OUT", "NOV", "DEZ"]
+HEX_DIGITS = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+
+
+def category_lookup():
+    """Category lookup (category_lookup.json layout) matching the generated merchants."""
+    return {category: list(names) for category, names in merchants.items()}
+
+
+def _sample_categories(rng, n):
+    """Draw category types and categories; returns (type names, category names) arrays."""
+    type_idx = rng.choice(len(category_types), size=n, p=category_type_weights)
+    type_names = np.array(category_types)[type_idx]
+    category_names = np.empty(n, dtype=object)
+    for i, category_type in enumerate(category_types):
+        mask = type_idx == i
+        options = np.array(categories[category_type], dtype=object)
+        category_names[mask] = options[rng.integers(0, len(options), mask.sum())]
+    return type_names, category_names
+
+
+def _sample_amounts(rng, type_names):
+    """Draw a positive amount per row from its category type's range."""
+    low = np.empty(len(type_names))
+    high = np.empty(len(type_names))
+    for category_type, (lo, hi) in amount_ranges.items():
+        mask = type_names == category_type
+        low[mask], high[mask] = lo, hi
+    return np.round(rng.uniform(low, high), 2)
+
+
+def _sample_dates(rng, start_date, months, transactions_per_month):
+    """Draw a random day within each month, transactions_per_month rows per month."""
+    month_starts = pd.date_range(pd.Timestamp(start_date).replace(day=1), periods=months, freq='MS')
+    month_idx = np.repeat(np.arange(months), transactions_per_month)
+    days = (rng.random(len(month_idx)) * month_starts.days_in_month.to_numpy()[month_idx]).astype(int)
+    return month_starts.to_numpy()[month_idx] + days.astype('timedelta64[D]')
+
+
+def _sample_ids(rng, n, length=36):
+    """Random hex ids, built from one block of random bytes."""
+    digits = HEX_DIGITS[rng.integers(0, 16, size=(n, length), dtype=np.uint8)]
+    return pd.Series(digits.view(f'S{length}').ravel()).str.decode('ascii')
+
+
+def generate_transactions(start_date, months=20, transactions_per_month=70, seed=None, banks=('nubank',)):
+    """
+    Generate clean ledger rows (reconciled layout), vectorized with NumPy.
+
+    Args:
+        start_date: First month of the data
+        months: Number of months
+        transactions_per_month: Rows per month
+        seed: Seed of the random generator, for reproducible data
+        banks: Banks rows are drawn from
+
+    Returns:
+        DataFrame with date, bank, income, outcome, balance, category, description, participant, original_id
+    """
+    rng = np.random.default_rng(seed)
+    n = months * transactions_per_month
+
+    type_names, category_names = _sample_categories(rng, n)
+    amounts = _sample_amounts(rng, type_names)
+    is_income = type_names == 'income'
+    incomes = np.where(is_income, amounts, 0.0)
+    outcomes = np.where(is_income, 0.0, amounts)
+
     df = pd.DataFrame({
-        'date': dates,
-        'bank': banks,
+        'date': _sample_dates(rng, start_date, months, transactions_per_month),
+        'bank': np.array(banks, dtype=object)[rng.integers(0, len(banks), n)],
         'income': incomes,
         'outcome': outcomes,
-        'balance': balances,
-        'category': categories_list,
-        'description': descriptions,
-        'participant': participant,
-        'original_id': original_ids
+        'balance': np.cumsum(incomes - outcomes),
+        'category': category_names,
+        'description': 'Sample description for ' + pd.Series(category_names, dtype=object),
+        'participant': np.array(possible_participants, dtype=object)[rng.integers(0, len(possible_participants), n)],
+        'original_id': _sample_ids(rng, n),
     })
-    df['date'] = pd.to_datetime(df['date'], format='%Y-%m-%d')
-    
     return df
 
+
+def generate_raw_extract(bank, start_date, months=1, transactions_per_month=70, seed=None):
+    """
+    Generate rows in a bank's raw export layout, sorted by date.
+
+    Args:
+        bank: 'nubank' or 'inter'
+        start_date: First month of the extract
+        months: Number of months covered
+        transactions_per_month: Rows per month
+        seed: Seed of the random generator (or a numpy Generator)
+
+    Returns:
+        DataFrame with the bank's raw columns; dates are Timestamps, amounts are signed floats
+    """
+    rng = np.random.default_rng(seed)
+    n = months * transactions_per_month
+
+    type_names, category_names = _sample_categories(rng, n)
+    amounts = _sample_amounts(rng, type_names)
+    is_income = type_names == 'income'
+    values = np.where(is_income, amounts, -amounts)
+
+    merchant = np.empty(n, dtype=object)
+    for category, names in merchants.items():
+        mask = category_names == category
+        merchant[mask] = np.array(names, dtype=object)[rng.integers(0, len(names), mask.sum())]
+    merchant = pd.Series(merchant, dtype=object).str.title()
+    participant = pd.Series(possible_participants, dtype=object)[
+        rng.integers(0, len(possible_participants), n)
+    ].reset_index(drop=True)
+
+    dates = _sample_dates(rng, start_date, months, transactions_per_month)
+    order = np.argsort(dates, kind='stable')
+
+    if bank == 'nubank':
+        prefix = pd.Series(np.where(is_income, 'Transferência recebida pelo Pix', 'Compra no débito'), dtype=object)
+        df = pd.DataFrame({
+            'Data': dates,
+            'Valor': values,
+            'Identificador': _sample_ids(rng, n),
+            'Descrição': prefix + ' - ' + merchant + ' - ' + participant,
+        })
+    elif bank == 'inter':
+        history = pd.Series(np.where(is_income, 'Pix recebido', 'Compra no debito'), dtype=object)
+        df = pd.DataFrame({
+            'Data Lançamento': dates,
+            'Histórico': history,
+            'Descrição': merchant + ' ' + participant,
+            'Valor': values,
+            'Saldo': np.round(np.cumsum(values[order]), 2)[np.argsort(order)],
+        })
+    else:
+        raise ValueError(f"Unknown bank: {bank}")
+    return df.iloc[order].reset_index(drop=True)
+
+
+def _month_span(start_date, months):
+    first = pd.Timestamp(start_date).replace(day=1)
+    last = first + pd.offsets.MonthEnd(months)
+    return first, last
+
+
+def raw_filename(bank, start, end, index=0):
+    """Export filename of a bank extract covering [start, end]."""
+    if bank == 'nubank':
+        def nu_date(date):
+            return f"{date.day:02d}{PT_MONTHS[date.month - 1]}{date.year}"
+        return f"NU_{index:04d}_{nu_date(start)}_{nu_date(end)}.csv"
+    if bank == 'inter':
+        return f"Extrato-{start:%d-%m-%Y}-a-{end:%d-%m-%Y}.csv"
+    raise ValueError(f"Unknown bank: {bank}")
+
+
+def brazilian_amounts(values):
+    """Amounts as Brazilian-formatted strings: '.' thousands separator and ',' decimals ('-3.506,30')."""
+    return pd.Series(values).map('{:,.2f}'.format).str.translate(str.maketrans(',.', '.,'))
+
+
+def write_raw_extract(df, bank, path):
+    """
+    Write raw rows in the bank's export layout.
+    Inter: 3 preamble lines, ';' separated, amounts like '3.506,30'.
+    """
+    if bank == 'nubank':
+        df.to_csv(path, index=False, date_format='%d/%m/%Y', float_format='%.2f')
+    elif bank == 'inter':
+        df = df.assign(**{column: brazilian_amounts(df[column]) for column in ['Valor', 'Saldo']})
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("Extrato Conta Corrente\nConta ;000000\nPeríodo ;\n")
+            df.to_csv(f, index=False, sep=';', date_format='%d/%m/%Y')
+    else:
+        raise ValueError(f"Unknown bank: {bank}")
+
+
+def write_raw_extracts(raw_dir, bank, start_date, months=12, transactions_per_month=70, seed=None, months_per_file=1):
+    """
+    Write a bank's history as raw export files, one file per `months_per_file` months.
+    Each file is generated on its own, so memory stays bounded by one file.
+
+    Returns:
+        List of written paths
+    """
+    os.makedirs(raw_dir, exist_ok=True)
+    seeds = np.random.SeedSequence(seed).spawn((months + months_per_file - 1) // months_per_file)
+    paths = []
+    first_month = pd.Timestamp(start_date).replace(day=1)
+    for index, offset in enumerate(range(0, months, months_per_file)):
+        span = min(months_per_file, months - offset)
+        file_start = first_month + pd.DateOffset(months=offset)
+        start, end = _month_span(file_start, span)
+        df = generate_raw_extract(bank, file_start, span, transactions_per_month, np.random.default_rng(seeds[index]))
+        path = os.path.join(raw_dir, raw_filename(bank, start, end, index))
+        write_raw_extract(df, bank, path)
+        paths.append(path)
+    return paths
+
+
 start_date = datetime(2023, 1, 1)
 df = generate_transactions(start_date)
-
@@ -1,6 +1,28 @@
+import os
+from copy import deepcopy
+
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# Parsed config files, by absolute path: (mtime, config)
+_configs = {}
+
+
 def load_config(config_path="config.yaml"):
-    with open(config_path, "r") as file:
-        config = yaml.safe_load(file)
-    return config
\ No newline at end of file
+    """
+    Load the YAML config, parsing each file once per process.
+    A file is parsed again only when it changes; every call returns its own
+    copy, so callers can modify it freely.
+    """
+    path = os.path.abspath(config_path)
+    mtime = os.stat(path).st_mtime_ns
+    cached = _configs.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path, "r") as file:
+            cached = (mtime, yaml.load(file, Loader=SafeLoader))
+        _configs[path] = cached
+    return deepcopy(cached[1])
@@ -0,0 +1,156 @@
+"""
+Embedded SQLite ledger store.
+
+The reconcile stage writes every reconciled transaction into a single
+SQLite file inside the reconciled folder, indexed on (bank, date),
+category, participant and original_id, so dashboards and notebooks can
+fetch just the slice they need:
+
+    from src.utils.ledger import query_ledger
+    query_ledger(bank="nubank", start="2024-01-01", end="2024-03-31", category="eating-out")
+"""
+import os
+import sqlite3
+from contextlib import closing
+from typing import Iterable, List, Optional, Union
+
+import pandas as pd
+
+from src.utils.config import load_config
+from src.utils.schema import STANDARD_COLUMNS, apply_schema
+
+TABLE = 'ledger'
+DATE_FORMAT = '%Y-%m-%d'
+REAL_COLUMNS = ('income', 'outcome', 'balance')
+
+INDEXES = {
+    'idx_ledger_bank_date': ('bank', 'date'),
+    'idx_ledger_category': ('category',),
+    'idx_ledger_participant': ('participant',),
+    'idx_ledger_original_id': ('original_id',),
+}
+
+
+def ledger_path(config: Optional[dict] = None) -> Optional[str]:
+    """Path of the ledger file inside the reconciled folder, or None if disabled."""
+    config = load_config() if config is None else config
+    filename = config.get('storage', {}).get('ledger')
+    if not filename:
+        return None
+    return os.path.join(config['paths']['data_reconciled'], filename)
+
+
+def _as_list(value: Union[str, Iterable[str], None]) -> Optional[List[str]]:
+    if value is None:
+        return None
+    return [value] if isinstance(value, str) else list(value)
+
+
+class LedgerStore:
+    """Reconciled transactions of every bank in one indexed SQLite table."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path)
+
+    def create(self) -> None:
+        """Create the ledger table and its indexes if missing."""
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        columns = ', '.join(
+            f"{col} {'REAL' if col in REAL_COLUMNS else 'TEXT'}" for col in STANDARD_COLUMNS
+        )
+        with closing(self._connect()) as conn, conn:
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {TABLE} (row_order INTEGER, {columns})")
+            for name, index_columns in INDEXES.items():
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {TABLE} ({', '.join(index_columns)})")
+
+    def write_bank(self, bank: str, df: pd.DataFrame) -> None:
+        """Replace every row of a bank with the given reconciled frame, in one transaction."""
+        self.create()
+        rows = df.reindex(columns=STANDARD_COLUMNS).copy()
+        rows['date'] = pd.to_datetime(rows['date']).dt.strftime(DATE_FORMAT)
+        for col in STANDARD_COLUMNS:
+            if col not in REAL_COLUMNS and col != 'date':
+                rows[col] = rows[col].astype(object).where(rows[col].notna(), None)
+        rows.insert(0, 'row_order', range(len(rows)))
+
+        placeholders = ', '.join('?' for _ in rows.columns)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(f"DELETE FROM {TABLE} WHERE bank = ?", (bank,))
+            conn.executemany(
+                f"INSERT INTO {TABLE} ({', '.join(rows.columns)}) VALUES ({placeholders})",
+                rows.itertuples(index=False, name=None)
+            )
+
+    def remove_bank(self, bank: str) -> None:
+        """Delete every row of a bank."""
+        self.create()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(f"DELETE FROM {TABLE} WHERE bank = ?", (bank,))
+
+    def banks(self) -> List[str]:
+        """Banks present in the ledger."""
+        with closing(self._connect()) as conn, conn:
+            return [row[0] for row in conn.execute(f"SELECT DISTINCT bank FROM {TABLE} ORDER BY bank")]
+
+    def query(
+        self,
+        bank: Union[str, Iterable[str], None] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        category: Union[str, Iterable[str], None] = None,
+        participant: Union[str, Iterable[str], None] = None,
+        original_id: Union[str, Iterable[str], None] = None,
+        columns: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Fetch a slice of the ledger.
+
+        Args:
+            bank: Bank name(s)
+            start: First date included ('YYYY-MM-DD')
+            end: Last date included ('YYYY-MM-DD')
+            category: Category name(s)
+            participant: Participant name(s)
+            original_id: Bank transaction id(s)
+            columns: Columns to return; all standard columns by default
+
+        Returns:
+            DataFrame with schema dtypes, in reconciliation order
+        """
+        clauses, params = [], []
+        for col, values in (
+            ('bank', _as_list(bank)),
+            ('category', _as_list(category)),
+            ('participant', _as_list(participant)),
+            ('original_id', _as_list(original_id)),
+        ):
+            if values is not None:
+                clauses.append(f"{col} IN ({', '.join('?' for _ in values)})")
+                params.extend(values)
+        if start is not None:
+            clauses.append("date >= ?")
+            params.append(pd.Timestamp(start).strftime(DATE_FORMAT))
+        if end is not None:
+            clauses.append("date <= ?")
+            params.append(pd.Timestamp(end).strftime(DATE_FORMAT))
+
+        selected = [col for col in (columns or STANDARD_COLUMNS) if col in STANDARD_COLUMNS]
+        sql = f"SELECT {', '.join(selected)} FROM {TABLE}"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY bank, row_order"
+
+        with closing(self._connect()) as conn, conn:
+            df = pd.read_sql_query(sql, conn, params=params)
+        return apply_schema(df)
+
+
+def query_ledger(config: Optional[dict] = None, **filters) -> pd.DataFrame:
+    """Query the configured ledger store; see `LedgerStore.query` for filters."""
+    path = ledger_path(config)
+    if path is None or not os.path.exists(path):
+        raise FileNotFoundError(f"No ledger store found at {path}. Run the reconcile stage first.")
+    return LedgerStore(path).query(**filters)
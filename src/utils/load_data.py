@@ -1,27 +1,26 @@
 import os
 import json
 import pandas as pd
-from collections import defaultdict
 
 from src.utils.config import load_config
+from src.utils.ledger import LedgerStore, ledger_path
+from src.utils.snapshot import read_snapshot, snapshot_path
+from src.utils.schema import fill_missing, read_csv_kwargs
+from src.utils.storage import (
+    PARQUET, list_partitions, partition_key, parse_partition_key,
+    read_partition, read_partitions, storage_format, write_partition
+)
 
 # Universal
 
 def frame_csv(csv_path):
     """
-    open csv file into dataframe
+    open csv file into dataframe.
+    dtypes, date format and NA handling come from the schema registry,
+    so every column is parsed once, straight into its final type.
     """
-    df = pd.read_csv(csv_path)
-    df['date'] = pd.to_datetime(df['date'])
-    df['income'] = df['income'].astype(float)
-    df['outcome'] = df['outcome'].astype(float)
-    df['bank'] = df['bank'].astype(str)
-    df['category'] = df['category'].astype(str)
-    df['type'] = df['type'].astype(str)
-    df['description'] = df['description'].astype(str)
-    df['original_id'] = df['original_id'].astype(str)
-    df['participant'] = df['participant'].astype(str).fillna('unknown')
-    return df
+    df = pd.read_csv(csv_path, **read_csv_kwargs())
+    return fill_missing(df)
 
 
 def load_json(path):
@@ -32,91 +31,129 @@ def load_json(path):
 
 def frame_dir(dir_path="data/03--reconciled"):
     """open dir into single dataframe"""
-    full_df = pd.DataFrame()
-    for file_name in os.listdir(dir_path):
-        if file_name.endswith(".csv"):
-            file_path = os.path.join(dir_path, file_name)
-            df = frame_csv(file_path)
-            df['date'] = pd.to_datetime(df['date'], errors='coerce')
-            full_df = pd.concat([full_df, df], ignore_index=True)
-    return full_df
+    if list_partitions(dir_path, PARQUET):
+        return read_partitions(dir_path)
+    dfs = [
+        frame_csv(os.path.join(dir_path, file_name))
+        for file_name in sorted(os.listdir(dir_path))
+        if file_name.endswith(".csv")
+    ]
+    if not dfs:
+        return pd.DataFrame()
+    return pd.concat(dfs, ignore_index=True)
 
 
 # Categorize specific
 
-def load_dataframes_from_dir(input_dir):
+def load_dataframes_from_dir(input_dir, fmt=None):
+    """load every (bank, year-month) partition of a stage folder, keyed by `bank_YYYY-MM`"""
+    fmt = fmt or storage_format()
     dataframes = {}
-    for csv_file in os.listdir(input_dir):
-        if csv_file.endswith(".csv"):
-            file_path = os.path.join(input_dir, csv_file)
-            dataframes[csv_file] = frame_csv(file_path)
+    for bank, year_months in list_partitions(input_dir, fmt).items():
+        for year_month in year_months:
+            dataframes[partition_key(bank, year_month)] = read_partition(input_dir, bank, year_month, fmt)
     return dataframes
 
-def save_dataframes(dataframes_dict, output_dir):
+def save_dataframes(dataframes_dict, output_dir, fmt=None):
+    """save dataframes keyed by `bank_YYYY-MM` as partitions of a stage folder"""
+    fmt = fmt or storage_format()
     os.makedirs(output_dir, exist_ok=True)
-    for filename, df in dataframes_dict.items():
-        output_file_path = os.path.join(output_dir, filename)
-        df.to_csv(output_file_path, index=False)
+    for key, df in dataframes_dict.items():
+        bank, year_month = parse_partition_key(key)
+        write_partition(df, output_dir, bank, year_month, fmt)
 
 
 # Reconcile specific
 
-def get_bank_files(dir_path):
+def get_bank_files(dir_path, fmt=None):
     """
     Collect all bank files and organize them by bank and year-month.
     Returns a dictionary with banks as keys and sorted lists of year-months as values.
     """
-    bank_files = defaultdict(list)
-    
-    for filename in os.listdir(dir_path):
-        if not filename.endswith('.csv'):
-            continue            
-        # Assuming filename format: bank_YYYY-MM.csv
-        bank, year_month = filename.replace('.csv', '').split('_')
-        bank_files[bank].append(year_month)
-    
-    return {bank: sorted(year_months) for bank, year_months in bank_files.items()}
+    return list_partitions(dir_path, fmt or storage_format())
 
 
 def load_reconciled_data():
-    config = load_config()
-    reconciled_path = config["paths"]["data_reconciled"]
-    banks = config["banks"]
-
-    data = {bank: None for bank in banks}
-    files = os.listdir(reconciled_path)
-    for bank in banks:
-        bank_file = next((f for f in files if f.startswith(bank) and f.endswith(".csv")), None)
-        if bank_file:
-            file_path = os.path.join(reconciled_path, bank_file)
-            try:
-                data[bank] = frame_csv(file_path)
-                print(f"Successfully loaded data for {bank}: {len(data[bank])} rows")
-            except Exception as e:
-                print(f"Error loading data for {bank} {str(e)}")
-        else:
-            print(f"No reconciled file found for {bank}")
-    return data
+    return load_dashboard_data()
 
 
 # Dashboard specific
 
-def load_dashboard_data():
+# column each ledger-style filter reads
+FILTER_COLUMNS = {
+    'start': 'date', 'end': 'date', 'category': 'category',
+    'participant': 'participant', 'original_id': 'original_id',
+}
+
+
+def filter_frame(df, start=None, end=None, category=None, participant=None, original_id=None):
+    """apply ledger-style filters to an in-memory frame"""
+    if df is None:
+        return None
+    mask = pd.Series(True, index=df.index)
+    if start is not None:
+        mask &= df['date'] >= pd.Timestamp(start)
+    if end is not None:
+        mask &= df['date'] <= pd.Timestamp(end)
+    for col, values in (('category', category), ('participant', participant), ('original_id', original_id)):
+        if values is not None:
+            mask &= df[col].isin([values] if isinstance(values, str) else list(values))
+    return df[mask]
+
+
+def load_bank_data(reconciled_path, bank, fmt, columns=None):
+    """load one bank's reconciled data, or None if there is none"""
+    if fmt == PARQUET:
+        df = read_partitions(reconciled_path, columns=columns, filters=[('bank', '=', bank)])
+        return df if not df.empty else None
+
+    files = os.listdir(reconciled_path)
+    bank_file = next((f for f in files if f.startswith(bank) and f.endswith(".csv")), None)
+    if bank_file is None:
+        return None
+    df = frame_csv(os.path.join(reconciled_path, bank_file))
+    return df if columns is None else df[columns]
+
+
+def load_dashboard_data(columns=None, **filters):
+    """
+    load reconciled data of every bank.
+    full loads memory-map the Arrow snapshot when it exists; filtered loads
+    fetch only the requested slice from the ledger store
+    (filters: start, end, category, participant, original_id; see LedgerStore.query).
+    """
     config = load_config()
     reconciled_path = config["paths"]["data_reconciled"]
     banks = config["banks"]
+    fmt = storage_format(config)
+    db_path = ledger_path(config)
+    ledger = LedgerStore(db_path) if db_path and os.path.exists(db_path) else None
+    arrow_path = snapshot_path(config)
+    if filters or not (arrow_path and os.path.exists(arrow_path)):
+        arrow_path = None
+
     data = {bank: None for bank in banks}
-    files = os.listdir(reconciled_path)
     for bank in banks:
-        bank_file = next((f for f in files if f.startswith(bank) and f.endswith(".csv")), None)
-        if bank_file:
-            file_path = os.path.join(reconciled_path, bank_file)
-            try:
-                data[bank] = frame_csv(file_path)
-                print(f"Successfully loaded data for {bank}: {len(data[bank])} rows")
-            except Exception as e:
-                print(f"Error loading data for {bank} {str(e)}")
+        try:
+            if arrow_path is not None:
+                df = read_snapshot(arrow_path, bank, columns)
+                data[bank] = df if not df.empty else None
+            elif ledger is not None:
+                df = ledger.query(bank=bank, columns=columns, **filters)
+                data[bank] = df if not df.empty else None
+            else:
+                # filters may need columns the projection leaves out; they are dropped after filtering
+                read_columns = columns
+                if columns is not None:
+                    needed = [FILTER_COLUMNS[name] for name, value in filters.items() if value is not None]
+                    read_columns = list(columns) + [col for col in dict.fromkeys(needed) if col not in columns]
+                df = filter_frame(load_bank_data(reconciled_path, bank, fmt, read_columns), **filters)
+                data[bank] = df if df is None or columns is None else df[list(columns)]
+        except Exception as e:
+            print(f"Error loading data for {bank} {str(e)}")
+            continue
+        if data[bank] is not None:
+            print(f"Successfully loaded data for {bank}: {len(data[bank])} rows")
         else:
             print(f"No reconciled file found for {bank}")
     return data
-
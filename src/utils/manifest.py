@@ -0,0 +1,134 @@
+"""
+Build manifest for the incremental pipeline.
+
+The manifest records, for every artifact a stage produced, the signature of
+what it was built from: content hashes of its inputs, of the lookup JSONs it
+used and of the stage's code version. An artifact whose recorded signature
+still matches is up to date and is not rebuilt.
+
+Content hashes of input files are cached by (size, mtime), so unchanged raw
+extracts are not re-read on every run.
+"""
+import hashlib
+import json
+import os
+import time
+from glob import glob
+from typing import Dict, Iterable, Optional
+
+from src.clean.sources import open_extract, split_location
+
+MANIFEST_VERSION = 1
+HASH_BLOCK_SIZE = 1 << 20
+SRC_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def signature(*parts: str) -> str:
+    """Combine input hashes (and any identifying strings) into one signature."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def code_version(sources: Iterable[str], settings: Optional[dict] = None) -> str:
+    """
+    Hash the source files (and settings) a stage depends on.
+
+    Args:
+        sources: Files or packages, relative to `src/`
+        settings: Config values that change the stage output
+
+    Returns:
+        Hex digest identifying this version of the stage
+    """
+    digest = hashlib.sha256()
+    for source in sources:
+        path = os.path.join(SRC_ROOT, source)
+        files = sorted(glob(os.path.join(path, '**', '*.py'), recursive=True)) if os.path.isdir(path) else [path]
+        for file in files:
+            digest.update(os.path.relpath(file, SRC_ROOT).encode())
+            with open(file, 'rb') as f:
+                digest.update(f.read())
+    digest.update(json.dumps(settings, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+class Manifest:
+    """Artifact signatures of each stage, persisted as JSON."""
+
+    def __init__(self, path: str, data: Optional[dict] = None):
+        self.path = path
+        self.data = data or {'version': MANIFEST_VERSION, 'files': {}, 'stages': {}}
+        self._saved_at = 0.0
+
+    @classmethod
+    def load(cls, path: str) -> 'Manifest':
+        """Load a manifest, starting empty if missing or from another version."""
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                return cls(path, data)
+        return cls(path)
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self._saved_at = time.monotonic()
+
+    def checkpoint(self, min_interval_s: float = 1.0) -> None:
+        """Save progress made so far, at most once every `min_interval_s` seconds."""
+        if time.monotonic() - self._saved_at >= min_interval_s:
+            self.save()
+
+    def stage(self, name: str) -> Dict[str, str]:
+        """Recorded signatures of a stage's artifacts, keyed by artifact name."""
+        return self.data['stages'].setdefault(name, {})
+
+    def snapshot(self, name: str) -> Optional[dict]:
+        """Copy of an input recorded with `record_snapshot` (e.g. the lookup of the last build), or None."""
+        return self.data.get('snapshots', {}).get(name)
+
+    def record_snapshot(self, name: str, value: dict) -> None:
+        """Keep a copy of an input, to diff it against its next version."""
+        self.data.setdefault('snapshots', {})[name] = value
+
+    def file_hash(self, location: str) -> str:
+        """
+        Content hash of an input file (or zip member), cached by size and mtime.
+
+        Args:
+            location: File path or '<archive>.zip::<member>'
+
+        Returns:
+            Hex digest, or '' if the file does not exist
+        """
+        path, _ = split_location(location)
+        if not os.path.exists(path):
+            return ''
+        stat = os.stat(path)
+        cached = self.data['files'].get(location)
+        if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+            return cached['sha256']
+
+        digest = hashlib.sha256()
+        with open_extract(location) as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+        self.data['files'][location] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': digest.hexdigest(),
+        }
+        return digest.hexdigest()
+
+    def forget_files(self, keep: Iterable[str]) -> None:
+        """Drop cached hashes of files that are no longer inputs."""
+        keep = set(keep)
+        self.data['files'] = {loc: h for loc, h in self.data['files'].items() if loc in keep}
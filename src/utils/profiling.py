@@ -0,0 +1,290 @@
+"""
+Run profiling for the pipeline.
+
+`profiler` collects per-stage metrics (wall and CPU time, rows in/out,
+rows per second, bytes read/written and peak RSS) and per-(bank, month)
+metrics (wall and CPU time, rows in/out). Stages are reported through the
+CategoryLogger START/FINISH phases, and the run is written as a JSON report:
+
+    with profiler.stage("clean"):
+        cleaned = clean_data(config)
+    profiler.write_report("logs/")
+
+`profiler.profile_stage("clean", "logs/")` also dumps cProfile stats of that stage.
+
+Stage code records its partitions with `profiler.partition(...)`; outside an
+active stage nothing is kept. Bytes and CPU time include worker processes
+only once they have exited, and bytes count every read/write call of the
+main process (files, pipes and sockets). Peak RSS is the highest resident
+memory of the process and its live children sampled while the stage runs,
+so a stage is not charged for the memory of an earlier one.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import psutil
+
+from src.logger import CategoryLogger
+
+
+@dataclass
+class PartitionMetrics:
+    """Metrics of one stage on one (bank, month)."""
+    stage: str
+    bank: str
+    year_month: str
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    rows_in: int = 0
+    rows_out: int = 0
+
+    @property
+    def rows_per_s(self) -> float:
+        return self.rows_in / self.wall_s if self.wall_s else 0.0
+
+
+@dataclass
+class StageMetrics:
+    """Metrics of one pipeline stage."""
+    stage: str
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
+    bytes_read: int = 0
+    bytes_written: int = 0
+    peak_rss_mb: float = 0.0
+    partitions: List[PartitionMetrics] = field(default_factory=list)
+
+    @property
+    def rows_per_s(self) -> float:
+        return (self.rows_in or 0) / self.wall_s if self.wall_s else 0.0
+
+
+def cpu_time() -> float:
+    """CPU seconds of this process and of its exited children."""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+# Seconds between two RSS samples of a stage
+RSS_INTERVAL_S = 0.05
+
+
+def rss_mb(process: Optional[psutil.Process] = None) -> float:
+    """Resident memory of a process and of its live children (e.g. pool workers), in MB."""
+    process = process or psutil.Process()
+    rss = process.memory_info().rss
+    for child in process.children(recursive=True):
+        try:
+            rss += child.memory_info().rss
+        except psutil.Error:  # exited meanwhile
+            pass
+    return rss / 2**20
+
+
+class RssSampler:
+    """Samples `rss_mb` on a background thread; `peak_mb` is the highest sample since start."""
+
+    def __init__(self, interval_s: float = RSS_INTERVAL_S, reader: Optional[Callable[[], float]] = None):
+        """
+        Args:
+            interval_s: Seconds between two samples
+            reader: Returns the current RSS in MB; `rss_mb` of this process by default
+        """
+        self.interval_s = interval_s
+        self.peak_mb = 0.0
+        if reader is None:
+            process = psutil.Process()
+            reader = lambda: rss_mb(process)
+        self._reader = reader
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        self.peak_mb = max(self.peak_mb, self._reader())
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            self._sample()
+
+    def start(self) -> 'RssSampler':
+        self._sample()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> float:
+        """Stop sampling; returns the peak in MB."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._sample()
+        return self.peak_mb
+
+
+def io_bytes() -> Tuple[int, int]:
+    """(bytes read, bytes written) by this process so far."""
+    counters = psutil.Process().io_counters()
+    return (
+        getattr(counters, 'read_chars', counters.read_bytes),
+        getattr(counters, 'write_chars', counters.write_bytes),
+    )
+
+
+def timed(fn: Callable, *args, **kwargs) -> Tuple[Any, float, float]:
+    """Call fn, returning (result, wall seconds, CPU seconds); picklable for process pools."""
+    wall, cpu = time.perf_counter(), time.process_time()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - wall, time.process_time() - cpu
+
+
+class RunProfiler:
+    """Collects the metrics of a pipeline run."""
+
+    def __init__(self, rss_reader: Optional[Callable[[], float]] = None):
+        """
+        Args:
+            rss_reader: Passed on to the `RssSampler` of each stage; `rss_mb` of this process by default
+        """
+        self.rss_reader = rss_reader
+        self.logger = CategoryLogger("profile")
+        self.started_at = datetime.now()
+        self.stages: List[StageMetrics] = []
+        self._current: Optional[StageMetrics] = None
+        self._profiled: Optional[Tuple[str, str]] = None
+
+    def reset(self) -> None:
+        """Forget the stages measured so far (e.g. between benchmark runs)."""
+        self.started_at = datetime.now()
+        self.stages = []
+        self._current = None
+
+    def profile_stage(self, name: str, output_dir: str) -> None:
+        """Dump cProfile stats of stage `name` into output_dir when it runs."""
+        self._profiled = (name, output_dir)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageMetrics]:
+        """Measure a stage. Rows in/out default to the sums over its partitions."""
+        profile_to = None
+        if self._profiled and self._profiled[0] == name:
+            profile_to = os.path.join(
+                self._profiled[1], f"profile_{name}_{self.started_at:%Y%m%d-%H%M%S}.pstats"
+            )
+
+        metrics = StageMetrics(name)
+        self._current = metrics
+        self.logger.set_category(name)
+        self.logger.start(f"{name} stage")
+
+        sampler = RssSampler(reader=self.rss_reader).start()
+        read0, written0 = io_bytes()
+        wall0, cpu0 = time.perf_counter(), cpu_time()
+        profile = cProfile.Profile() if profile_to else None
+        if profile is not None:
+            profile.enable()
+        try:
+            yield metrics
+        finally:
+            if profile is not None:
+                profile.disable()
+                self._dump_profile(profile, profile_to)
+            read1, written1 = io_bytes()
+            metrics.wall_s = time.perf_counter() - wall0
+            metrics.cpu_s = cpu_time() - cpu0
+            metrics.bytes_read = read1 - read0
+            metrics.bytes_written = written1 - written0
+            metrics.peak_rss_mb = sampler.stop()
+            if metrics.partitions:
+                if metrics.rows_in is None:
+                    metrics.rows_in = sum(p.rows_in for p in metrics.partitions)
+                if metrics.rows_out is None:
+                    metrics.rows_out = sum(p.rows_out for p in metrics.partitions)
+            self.stages.append(metrics)
+            self._current = None
+            self.logger.finish(self.summary(metrics))
+
+    def record(self, name: str, bank: str, year_month: str, wall_s: float, cpu_s: float,
+               rows_in: int, rows_out: int) -> None:
+        """Add the metrics of a (bank, month) measured elsewhere (e.g. in a worker process)."""
+        if self._current is not None:
+            self._current.partitions.append(
+                PartitionMetrics(name, bank, year_month, wall_s, cpu_s, rows_in, rows_out)
+            )
+
+    @contextmanager
+    def partition(self, name: str, bank: str, year_month: str, rows_in: int = 0) -> Iterator[PartitionMetrics]:
+        """Measure one (bank, month) of a stage; set `rows_out` on the yielded record."""
+        metrics = PartitionMetrics(name, bank, year_month, rows_in=rows_in)
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        try:
+            yield metrics
+        finally:
+            metrics.wall_s = time.perf_counter() - wall0
+            metrics.cpu_s = time.process_time() - cpu0
+            if self._current is not None:
+                self._current.partitions.append(metrics)
+
+    @staticmethod
+    def summary(metrics: StageMetrics) -> str:
+        rows = ""
+        if metrics.rows_in is not None:
+            rows = f", rows {metrics.rows_in} -> {metrics.rows_out} ({metrics.rows_per_s:,.0f} rows/s)"
+        return (
+            f"{metrics.stage} stage: wall {metrics.wall_s:.2f}s, cpu {metrics.cpu_s:.2f}s{rows}, "
+            f"read {metrics.bytes_read / 2**20:.1f} MB, written {metrics.bytes_written / 2**20:.1f} MB, "
+            f"peak RSS {metrics.peak_rss_mb:.0f} MB"
+        )
+
+    def report(self) -> Dict[str, Any]:
+        """Machine-readable report of the run."""
+        stages = []
+        for metrics in self.stages:
+            stage = asdict(metrics)
+            stage['rows_per_s'] = metrics.rows_per_s
+            stage['partitions'] = [dict(asdict(p), rows_per_s=p.rows_per_s) for p in metrics.partitions]
+            stages.append(stage)
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'wall_s': sum(m.wall_s for m in self.stages),
+            'cpu_s': sum(m.cpu_s for m in self.stages),
+            'peak_rss_mb': max((m.peak_rss_mb for m in self.stages), default=0.0),
+            'stages': stages,
+        }
+
+    def write_report(self, logs_dir: str, extra: Optional[Dict[str, Any]] = None,
+                     path: Optional[str] = None) -> str:
+        """Write the report as `run_report_<timestamp>.json` (or to `path`); returns its path."""
+        if path is None:
+            path = os.path.join(logs_dir, f"run_report_{self.started_at:%Y%m%d-%H%M%S}.json")
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        report = self.report()
+        report.update(extra or {})
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        self.logger.set_category("profile")
+        self.logger.info(f"Run report written to {path}")
+        return path
+
+    def _dump_profile(self, profile: cProfile.Profile, path: str) -> None:
+        """Dump pstats data and a text summary (top functions by cumulative time)."""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        profile.dump_stats(path)
+        text = io.StringIO()
+        pstats.Stats(profile, stream=text).sort_stats('cumulative').print_stats(30)
+        with open(os.path.splitext(path)[0] + '.txt', 'w') as f:
+            f.write(text.getvalue())
+        self.logger.info(f"cProfile stats written to {path}")
+
+
+profiler = RunProfiler()
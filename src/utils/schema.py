@@ -0,0 +1,114 @@
+"""
+Schema registry for stage CSVs.
+Built from `data_processing.standard_columns` in config.yaml, it tells
+the CSV reader the final dtype, date format and NA handling of every
+column, so each column is materialized once in its final type.
+
+Low-cardinality columns are pandas categoricals and free text is held in
+Arrow-backed strings; `apply_schema` restores these dtypes on frames built
+in memory (e.g. after a concat), so they survive from clean to dashboards.
+"""
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from src.utils.config import load_config
+
+
+config = load_config()
+STANDARD_COLUMNS: List[str] = config['data_processing']['standard_columns']
+
+DATE_COLUMNS = ['date']
+DATE_FORMAT = 'ISO8601'
+
+try:
+    import pyarrow
+    TEXT_DTYPE = 'string[pyarrow]'
+except ImportError:
+    TEXT_DTYPE = 'string'
+
+CATEGORY_DTYPE = 'category'
+NUMERIC_DTYPES = ('float64',)
+
+# dtype of each known column; standard columns not listed here are read as text
+COLUMN_DTYPES: Dict[str, str] = {
+    'income': 'float64',
+    'outcome': 'float64',
+    'balance': 'float64',
+    'bank': CATEGORY_DTYPE,
+    'category': CATEGORY_DTYPE,
+    'type': CATEGORY_DTYPE,
+    'participant': CATEGORY_DTYPE,
+}
+
+# value used for a missing field, per column; text columns default to ''
+FILL_VALUES: Dict[str, Any] = {
+    'participant': 'unknown',
+}
+
+
+def column_dtype(column: str) -> str:
+    return COLUMN_DTYPES.get(column, TEXT_DTYPE)
+
+
+def build_schema(columns: List[str] = None) -> Dict[str, str]:
+    """Map each column (standard columns by default) to its dtype."""
+    columns = STANDARD_COLUMNS if columns is None else columns
+    return {col: column_dtype(col) for col in columns if col not in DATE_COLUMNS}
+
+
+SCHEMA = build_schema()
+
+
+def read_csv_kwargs() -> Dict[str, Any]:
+    """
+    Keyword arguments for `pd.read_csv` that parse stage CSVs at read time.
+
+    Text columns keep empty fields as '' instead of NaN; numeric columns
+    and columns with a fill value still treat empty fields as missing.
+    """
+    na_columns = [col for col, dtype in SCHEMA.items() if dtype in NUMERIC_DTYPES] + list(FILL_VALUES)
+    return {
+        'dtype': SCHEMA,
+        'parse_dates': DATE_COLUMNS,
+        'date_format': DATE_FORMAT,
+        'keep_default_na': False,
+        'na_values': {col: [''] for col in na_columns},
+    }
+
+
+def fill_missing(df: pd.DataFrame) -> pd.DataFrame:
+    """Fill missing values of columns with a fill value, categoricals included."""
+    for col, value in FILL_VALUES.items():
+        if col not in df.columns:
+            continue
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+            series = series.cat.add_categories([value])
+        df[col] = series.fillna(value)
+    return df
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Coerce an in-memory frame to the schema dtypes.
+    Empty or missing text becomes '' (or the column's fill value), matching
+    what `read_csv_kwargs` produces when the frame is read back from CSV.
+    """
+    df = df.copy()
+    for col in DATE_COLUMNS:
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col], format=DATE_FORMAT)
+
+    for col, dtype in SCHEMA.items():
+        if col not in df.columns:
+            continue
+        if dtype in NUMERIC_DTYPES:
+            df[col] = df[col].astype(dtype)
+            continue
+        fill = FILL_VALUES.get(col, '')
+        series = df[col].astype(object).fillna(fill)
+        if col in FILL_VALUES:
+            series = series.replace('', fill)
+        df[col] = series.astype(dtype)
+    return df
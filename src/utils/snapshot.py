@@ -0,0 +1,125 @@
+"""
+Arrow IPC (Feather v2) snapshot of the reconciled ledger.
+
+The reconcile stage writes every bank's reconciled transactions into one
+uncompressed Arrow file, grouped by bank, with each bank's row range kept in
+the schema metadata. Dashboards memory-map the file instead of parsing CSVs:
+the mapped table is cached per process, so every Bokeh session served by the
+same process reads the same pages, and a bank is a zero-copy slice of it.
+"""
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from src.utils.config import load_config
+from src.utils.schema import SCHEMA, TEXT_DTYPE, apply_schema, column_dtype
+
+BANK_OFFSETS_KEY = b'bank_offsets'
+
+_tables: Dict[str, Tuple[int, object]] = {}
+_lock = threading.Lock()
+
+
+def snapshot_path(config: Optional[dict] = None) -> Optional[str]:
+    """Path of the snapshot file inside the reconciled folder, or None if disabled."""
+    config = load_config() if config is None else config
+    filename = config.get('storage', {}).get('snapshot')
+    if not filename:
+        return None
+    return os.path.join(config['paths']['data_reconciled'], filename)
+
+
+def write_snapshot(frames: Dict[str, pd.DataFrame], path: str) -> None:
+    """
+    Write the reconciled frames of every bank to one Arrow IPC file.
+
+    Args:
+        frames: Reconciled DataFrame of each bank
+        path: Snapshot file path; replaced atomically
+    """
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    offsets, start = {}, 0
+    for bank, df in frames.items():
+        offsets[bank] = [start, len(df)]
+        start += len(df)
+
+    # apply_schema restores categoricals whose categories differ between banks
+    df = apply_schema(pd.concat(list(frames.values()), ignore_index=True)) if frames else pd.DataFrame()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[BANK_OFFSETS_KEY] = json.dumps(offsets).encode()
+    # One record batch keeps every column contiguous, so reads stay zero-copy
+    table = table.replace_schema_metadata(metadata).combine_chunks()
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        with ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=max(table.num_rows, 1))
+    os.replace(tmp_path, path)
+
+
+def open_snapshot(path: str):
+    """
+    Memory-map a snapshot, reusing the mapping already open in this process.
+    The mapping is refreshed when the file changes (e.g. after a pipeline run).
+    """
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    mtime = os.stat(path).st_mtime_ns
+    with _lock:
+        cached = _tables.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        table = ipc.open_file(pa.memory_map(path, 'r')).read_all()
+        _tables[path] = (mtime, table)
+        return table
+
+
+def snapshot_banks(path: str) -> List[str]:
+    """Banks present in a snapshot."""
+    return list(_bank_offsets(open_snapshot(path)))
+
+
+def _bank_offsets(table) -> Dict[str, List[int]]:
+    return json.loads(table.schema.metadata[BANK_OFFSETS_KEY])
+
+
+def read_snapshot(path: str, bank: Optional[str] = None,
+                  columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Read a bank (or every bank) from a snapshot.
+
+    Args:
+        path: Snapshot file path
+        bank: Bank to read; all banks by default
+        columns: Columns to return; all columns by default
+
+    Returns:
+        DataFrame with schema dtypes (categoricals list only the values read, like a
+        stage CSV read back); text columns stay backed by the mapped Arrow buffers
+    """
+    import pyarrow as pa
+
+    table = open_snapshot(path)
+    if bank is not None:
+        offset, length = _bank_offsets(table).get(bank, (0, 0))
+        table = table.slice(offset, length)
+    if columns is not None:
+        table = table.select(columns)
+
+    text_dtype = pd.StringDtype('pyarrow')
+    df = table.to_pandas(
+        types_mapper={pa.string(): text_dtype, pa.large_string(): text_dtype}.get
+    )
+    # Text columns already have their schema dtype; converting them would copy the mapped buffers
+    converted = [col for col in df.columns if col in SCHEMA and column_dtype(col) != TEXT_DTYPE]
+    for col, series in apply_schema(df[converted]).items():
+        df[col] = series
+    return df
@@ -0,0 +1,224 @@
+"""
+Storage backend for the cleaned, categorized and reconciled stages.
+
+Every stage stores one partition per (bank, year-month):
+
+- csv:     `<dir>/<bank>_<YYYY-MM>.csv`
+- parquet: `<dir>/bank=<bank>/year_month=<YYYY-MM>/part-<nnnnn>.parquet`
+
+Parquet stages are read as a single hive-partitioned dataset, with column
+projection and predicate pushdown (e.g. `filters=[('bank', '=', 'nubank')]`).
+CSV stays available as an export format through `export_csv`.
+"""
+import os
+import shutil
+from collections import defaultdict
+from glob import glob
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from src.utils.config import load_config
+from src.utils.schema import STANDARD_COLUMNS, apply_schema
+
+CSV = 'csv'
+PARQUET = 'parquet'
+PARTITION_COLUMNS = ['bank', 'year_month']
+
+# Which stage folders a pipeline run persists
+CHECKPOINT_ALL = 'all'
+CHECKPOINT_FINAL = 'final'
+CHECKPOINT_NONE = 'none'
+CHECKPOINTS = (CHECKPOINT_ALL, CHECKPOINT_FINAL, CHECKPOINT_NONE)
+
+
+def storage_format(config: Optional[dict] = None) -> str:
+    """Configured storage format for stage folders ('csv' by default)."""
+    config = load_config() if config is None else config
+    return config.get('storage', {}).get('format', CSV)
+
+
+def checkpoint_mode(config: Optional[dict] = None) -> str:
+    """
+    Configured checkpoints ('all' by default): every stage folder, the final
+    (reconciled) one only, or none; stages always hand frames over in memory.
+    """
+    config = load_config() if config is None else config
+    mode = config.get('storage', {}).get('checkpoints', CHECKPOINT_ALL)
+    if mode not in CHECKPOINTS:
+        raise ValueError(f"Unknown checkpoint mode: {mode}. Options: {', '.join(CHECKPOINTS)}")
+    return mode
+
+
+def partition_key(bank: str, year_month: str) -> str:
+    """Name of a partition, e.g. 'nubank_2024-01'."""
+    return f"{bank}_{year_month}"
+
+
+def parse_partition_key(key: str) -> Tuple[str, str]:
+    """Split a partition name (or legacy csv filename) into (bank, year_month)."""
+    if key.endswith('.csv'):
+        key = key[:-len('.csv')]
+    bank, year_month = key.split('_')
+    return bank, year_month
+
+
+def flatten_partitions(frames: Dict[str, Dict[str, pd.DataFrame]]) -> Dict[str, pd.DataFrame]:
+    """{bank: {year_month: df}} -> {'bank_YYYY-MM': df}"""
+    return {
+        partition_key(bank, year_month): df
+        for bank, months in frames.items()
+        for year_month, df in months.items()
+    }
+
+
+def group_partitions(frames: Dict[str, pd.DataFrame]) -> Dict[str, Dict[str, pd.DataFrame]]:
+    """{'bank_YYYY-MM': df} -> {bank: {year_month: df}}, months sorted"""
+    grouped = defaultdict(dict)
+    for key in sorted(frames):
+        bank, year_month = parse_partition_key(key)
+        grouped[bank][year_month] = frames[key]
+    return dict(grouped)
+
+
+def partition_path(base_dir: str, bank: str, year_month: str, fmt: str) -> str:
+    """File (csv) or directory (parquet) holding a partition."""
+    if fmt == PARQUET:
+        return os.path.join(base_dir, f"bank={bank}", f"year_month={year_month}")
+    return os.path.join(base_dir, f"{partition_key(bank, year_month)}.csv")
+
+
+def write_partition(df: pd.DataFrame, base_dir: str, bank: str, year_month: str,
+                    fmt: str = CSV, part: int = 0) -> None:
+    """
+    Write one (bank, year-month) partition.
+    Part 0 replaces the partition; later parts append to it (used when streaming).
+    """
+    path = partition_path(base_dir, bank, year_month, fmt)
+    if fmt == PARQUET:
+        if part == 0 and os.path.isdir(path):
+            shutil.rmtree(path)
+        os.makedirs(path, exist_ok=True)
+        data = df.drop(columns=[c for c in PARTITION_COLUMNS if c in df.columns])
+        data.reset_index(drop=True).to_parquet(os.path.join(path, f"part-{part:05d}.parquet"), index=False)
+    else:
+        os.makedirs(base_dir, exist_ok=True)
+        df.to_csv(path, mode='w' if part == 0 else 'a', header=part == 0, index=False)
+
+
+def partition_exists(base_dir: str, bank: str, year_month: str, fmt: str = CSV) -> bool:
+    """Whether a (bank, year-month) partition has been written."""
+    return os.path.exists(partition_path(base_dir, bank, year_month, fmt))
+
+
+def delete_partition(base_dir: str, bank: str, year_month: str, fmt: str = CSV) -> None:
+    """Remove a (bank, year-month) partition if present."""
+    path = partition_path(base_dir, bank, year_month, fmt)
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def list_partitions(base_dir: str, fmt: str = CSV) -> Dict[str, List[str]]:
+    """
+    Collect all partitions of a stage folder.
+    Returns a dictionary with banks as keys and sorted lists of year-months as values.
+    """
+    partitions = defaultdict(list)
+    if not os.path.isdir(base_dir):
+        return {}
+
+    if fmt == PARQUET:
+        for path in glob(os.path.join(base_dir, 'bank=*', 'year_month=*')):
+            bank = os.path.basename(os.path.dirname(path)).split('=', 1)[1]
+            year_month = os.path.basename(path).split('=', 1)[1]
+            partitions[bank].append(year_month)
+    else:
+        for filename in os.listdir(base_dir):
+            if not filename.endswith('.csv'):
+                continue
+            # Assuming filename format: bank_YYYY-MM.csv
+            bank, year_month = parse_partition_key(filename)
+            partitions[bank].append(year_month)
+
+    return {bank: sorted(year_months) for bank, year_months in partitions.items()}
+
+
+def read_partitions(base_dir: str, columns: Optional[List[str]] = None,
+                    filters: Optional[list] = None) -> pd.DataFrame:
+    """
+    Read a parquet stage folder as one DataFrame.
+
+    Args:
+        base_dir: Stage folder with bank=/year_month= partitions
+        columns: Columns to load (projection); all columns by default
+        filters: Predicates in pyarrow DNF form, pushed down to partitions and row groups
+
+    Returns:
+        DataFrame with schema dtypes; `bank` is restored from the partition path
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    # Sorted paths keep rows in (bank, year-month, part) order
+    files = sorted(glob(os.path.join(base_dir, 'bank=*', 'year_month=*', '*.parquet')))
+    if not files:
+        return pd.DataFrame(columns=columns)
+
+    partitioning = ds.partitioning(
+        pa.schema([(col, pa.string()) for col in PARTITION_COLUMNS]), flavor='hive'
+    )
+    dataset = ds.dataset(files, format='parquet', partitioning=partitioning, partition_base_dir=base_dir)
+    expression = pq.filters_to_expression(filters) if filters else None
+    table = dataset.to_table(columns=columns, filter=expression)
+
+    df = table.to_pandas()
+    if columns is None:
+        # Partition columns come back last; restore the standard column order
+        df = _standard_order(df.drop(columns=['year_month']))
+    return apply_schema(df)
+
+
+def _standard_order(df: pd.DataFrame) -> pd.DataFrame:
+    """Standard columns first, in their configured order."""
+    ordered = [col for col in STANDARD_COLUMNS if col in df.columns]
+    return df[ordered + [col for col in df.columns if col not in ordered]]
+
+
+def read_partition(base_dir: str, bank: str, year_month: str, fmt: str = CSV,
+                   columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Read a single (bank, year-month) partition.
+    Parquet partitions are read from their own folder only; `bank` (and
+    `year_month`, if asked for) are restored from the partition.
+    """
+    if fmt == PARQUET:
+        import pyarrow.dataset as ds
+
+        files = sorted(glob(os.path.join(partition_path(base_dir, bank, year_month, fmt), '*.parquet')))
+        if not files:
+            return pd.DataFrame(columns=columns)
+        file_columns = None if columns is None else [col for col in columns if col not in PARTITION_COLUMNS]
+        df = ds.dataset(files, format='parquet').to_table(columns=file_columns).to_pandas()
+        if columns is None:
+            df['bank'] = bank
+            return apply_schema(_standard_order(df))
+        partition_values = {'bank': bank, 'year_month': year_month}
+        for col in PARTITION_COLUMNS:
+            if col in columns:
+                df[col] = partition_values[col]
+        return apply_schema(df[columns])
+    from src.utils.load_data import frame_csv
+    df = frame_csv(partition_path(base_dir, bank, year_month, fmt))
+    return df if columns is None else df[columns]
+
+
+def export_csv(base_dir: str, output_dir: str, fmt: str = PARQUET) -> None:
+    """Export every partition of a stage folder as `<bank>_<YYYY-MM>.csv` files."""
+    os.makedirs(output_dir, exist_ok=True)
+    for bank, year_months in list_partitions(base_dir, fmt).items():
+        for year_month in year_months:
+            df = read_partition(base_dir, bank, year_month, fmt)
+            write_partition(df, output_dir, bank, year_month, CSV)